@@ -0,0 +1,242 @@
+"""
+Corpus-level analytics for Azure AI Language Service
+Vectorized NumPy aggregates over a ResultStore: sentiment distribution and
+confidence per label, entity frequency by category and subcategory, top key
+phrases and languages, updated incrementally as new batches arrive.
+"""
+
+import numpy as np
+
+from result_store import SENTIMENT_LABELS
+
+# Confidence histograms use 0.001-wide bins; the service reports two decimals
+CONFIDENCE_RESOLUTION = 1000
+CONFIDENCE_BINS = CONFIDENCE_RESOLUTION + 1
+
+def group_indices(values):
+    """
+    Group positions by value without a per-item dict walk.
+
+    Args:
+        values (sequence): Hashable, sortable labels, e.g. entity categories
+
+    Returns:
+        dict: value -> array of positions, in order of first appearance
+    """
+    values = np.asarray(values)
+    if not len(values):
+        return {}
+    unique, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+    return {unique[i].item(): groups[i] for i in np.argsort(first)}
+
+def _add_counts(counts, codes, size):
+    """Add a bincount of codes to a count array, growing it to size."""
+    if len(counts) < size:
+        counts = np.concatenate([counts, np.zeros(size - len(counts), dtype=counts.dtype)])
+    if len(codes):
+        counts[:size] += np.bincount(codes, minlength=size)
+    return counts
+
+def _percentile(histogram, q):
+    """Nearest-rank percentile of a confidence histogram."""
+    total = histogram.sum()
+    if not total:
+        return None
+    rank = max(1, int(np.ceil(q / 100 * total)))
+    return float(np.searchsorted(np.cumsum(histogram), rank) / CONFIDENCE_RESOLUTION)
+
+def _ranked(counts, values, k=None):
+    """Turn a count array into [(value, count)] sorted by count, optionally top-k only."""
+    nonzero = np.flatnonzero(counts)
+    if k is not None and k < len(nonzero):
+        nonzero = nonzero[np.argpartition(counts[nonzero], -k)[-k:]]
+    nonzero = nonzero[np.argsort(-counts[nonzero], kind="stable")]
+    return [(values[code], int(counts[code])) for code in nonzero]
+
+class CorpusAggregator:
+    """
+    Running aggregates over a ResultStore.
+
+    Each update() folds in only the rows added to the store since the last
+    call, so the aggregator can follow a store that keeps growing while a
+    corpus streams through the service.
+
+        store = ResultStore()
+        aggregator = CorpusAggregator(store)
+        for batch in batches:
+            store.add("analyze_sentiment", analyze_batched("analyze_sentiment", batch))
+            aggregator.update()
+        print_report(aggregator.report())
+
+    Args:
+        store (ResultStore): Store to aggregate
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._seen = {name: 0 for name in store.tables}
+        labels = len(SENTIMENT_LABELS)
+        self.label_counts = np.zeros(labels, dtype=np.int64)
+        self.confidence_sums = np.zeros(labels)
+        self.confidence_histograms = np.zeros((labels, CONFIDENCE_BINS), dtype=np.int64)
+        self.language_counts = np.zeros(0, dtype=np.int64)
+        self.category_counts = {"entities": np.zeros(0, dtype=np.int64),
+                                "pii_entities": np.zeros(0, dtype=np.int64)}
+        self.subcategory_counts = {"entities": {}, "pii_entities": {}}
+        self.phrase_counts = np.zeros(0, dtype=np.int64)
+        self.error_count = 0
+
+    def _new_rows(self, name):
+        table = self.store[name]
+        start, end = self._seen[name], len(table)
+        self._seen[name] = end
+        return {column: table.column(column)[start:end] for column in table.columns}
+
+    def update(self):
+        """
+        Fold in rows added since the previous update.
+
+        Returns:
+            int: Number of rows consumed across all tables
+        """
+        consumed = 0
+        dictionaries = self.store.dictionaries
+
+        rows = self._new_rows("sentiment")
+        if len(rows["doc"]):
+            labels = rows["label"]
+            scores = np.stack([rows["positive"], rows["neutral"], rows["negative"]], axis=1)
+            # Confidence of the predicted label; "mixed" takes the stronger polar score
+            confidence = scores[np.arange(len(labels)), np.minimum(labels, 2)]
+            mixed = labels == SENTIMENT_LABELS.index("mixed")
+            confidence[mixed] = np.maximum(rows["positive"], rows["negative"])[mixed]
+            size = len(SENTIMENT_LABELS)
+            self.label_counts += np.bincount(labels, minlength=size)
+            self.confidence_sums += np.bincount(labels, weights=confidence, minlength=size)
+            bins = np.clip(np.rint(confidence * CONFIDENCE_RESOLUTION), 0, CONFIDENCE_RESOLUTION).astype(np.int64)
+            self.confidence_histograms += np.bincount(
+                labels.astype(np.int64) * CONFIDENCE_BINS + bins, minlength=size * CONFIDENCE_BINS
+            ).reshape(size, CONFIDENCE_BINS)
+            consumed += len(labels)
+
+        rows = self._new_rows("languages")
+        codes = rows["language"]
+        self.language_counts = _add_counts(self.language_counts, codes[codes >= 0],
+                                           len(dictionaries["language"]))
+        consumed += len(codes)
+
+        for name in ("entities", "pii_entities"):
+            rows = self._new_rows(name)
+            categories = rows["category"]
+            self.category_counts[name] = _add_counts(self.category_counts[name], categories,
+                                                     len(dictionaries["category"]))
+            if len(categories):
+                pairs = (categories.astype(np.int64) << 32) | (rows["subcategory"].astype(np.int64) + 1)
+                unique, counts = np.unique(pairs, return_counts=True)
+                subcategories = self.subcategory_counts[name]
+                for pair, count in zip(unique.tolist(), counts.tolist()):
+                    subcategories[pair] = subcategories.get(pair, 0) + count
+            consumed += len(categories)
+
+        rows = self._new_rows("key_phrases")
+        self.phrase_counts = _add_counts(self.phrase_counts, rows["phrase"], len(dictionaries["phrase"]))
+        consumed += len(rows["phrase"])
+
+        rows = self._new_rows("errors")
+        self.error_count += len(rows["doc"])
+        consumed += len(rows["doc"])
+
+        # Per-sentence rows are not aggregated, but mark them as seen
+        self._seen["sentences"] = len(self.store["sentences"])
+        return consumed
+
+    def sentiment_summary(self, percentiles=(50, 90, 99)):
+        """
+        Sentiment distribution and confidence of the predicted label.
+
+        Returns:
+            dict: label -> count, share, mean_confidence and p<q> for each percentile
+        """
+        total = int(self.label_counts.sum())
+        summary = {}
+        for code, label in enumerate(SENTIMENT_LABELS):
+            count = int(self.label_counts[code])
+            entry = {
+                "count": count,
+                "share": count / total if total else 0.0,
+                "mean_confidence": float(self.confidence_sums[code] / count) if count else None
+            }
+            for q in percentiles:
+                entry[f"p{q}"] = _percentile(self.confidence_histograms[code], q)
+            summary[label] = entry
+        return summary
+
+    def entity_frequency(self, table="entities"):
+        """
+        Entity counts by category and by (category, subcategory).
+
+        Args:
+            table (str): "entities" or "pii_entities"
+
+        Returns:
+            dict: by_category [(category, count)] and by_subcategory
+            [((category, subcategory), count)], most frequent first
+        """
+        values = self.store.dictionaries["category"].values
+        pairs = sorted(self.subcategory_counts[table].items(), key=lambda item: -item[1])
+        return {
+            "by_category": _ranked(self.category_counts[table], values),
+            "by_subcategory": [
+                ((values[pair >> 32], values[(pair & 0xFFFFFFFF) - 1] if pair & 0xFFFFFFFF else None), count)
+                for pair, count in pairs
+            ]
+        }
+
+    def top_key_phrases(self, k=10):
+        """The k most frequent key phrases as [(phrase, count)]."""
+        return _ranked(self.phrase_counts, self.store.dictionaries["phrase"].values, k)
+
+    def language_distribution(self):
+        """Detected languages as [(iso6391_name, count)], most frequent first."""
+        return _ranked(self.language_counts, self.store.dictionaries["language"].values)
+
+    def report(self, top_k=10):
+        """All aggregates in one JSON-serializable dict."""
+        return {
+            "documents": {
+                "sentiment": int(self.label_counts.sum()),
+                "errors": self.error_count
+            },
+            "sentiment": self.sentiment_summary(),
+            "entities": self.entity_frequency("entities"),
+            "pii_entities": self.entity_frequency("pii_entities"),
+            "key_phrases": self.top_key_phrases(top_k),
+            "languages": self.language_distribution()
+        }
+
+def aggregate(store):
+    """Aggregate everything currently in a store."""
+    aggregator = CorpusAggregator(store)
+    aggregator.update()
+    return aggregator
+
+def print_report(report):
+    """Print a report from CorpusAggregator.report()."""
+    print("\n📊 CORPUS SUMMARY:")
+    print("-" * 40)
+    for label, entry in report["sentiment"].items():
+        if entry["count"]:
+            print(f"   {label.upper():<9} {entry['count']:>8} ({entry['share']:.0%})  "
+                  f"mean {entry['mean_confidence']:.2f}  p50 {entry['p50']:.2f}  p90 {entry['p90']:.2f}")
+    for category, count in report["entities"]["by_category"]:
+        print(f"   🏷️ {category}: {count}")
+    for category, count in report["pii_entities"]["by_category"]:
+        print(f"   🔒 {category}: {count}")
+    for phrase, count in report["key_phrases"]:
+        print(f"   • {phrase} ({count})")
+    for language, count in report["languages"]:
+        print(f"   🌍 {language}: {count}")
+    if report["documents"]["errors"]:
+        print(f"   ❌ Errors: {report['documents']['errors']}")
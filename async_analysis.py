@@ -0,0 +1,316 @@
+"""
+Concurrent analysis for Azure AI Language Service
+Dispatches batches through the SDK's aio client with a bounded number of
+in-flight requests, plus a blocking facade for synchronous callers.
+"""
+
+import asyncio
+from functools import partial
+from itertools import islice
+
+from batching import DISPATCH_WINDOW, WindowPlan
+from config import (
+    MAX_DOCUMENTS_PER_REQUEST,
+    MAX_REQUEST_CHARACTERS,
+    REQUEST_TIMEOUT,
+    get_language_resources,
+    get_settings
+)
+from dedup import get_dedup_policy
+from language_routing import get_language_router
+from gazetteer import get_entity_gazetteer
+from local_language import get_local_detector
+from payload import get_payload_minimizer
+from rate_limiter import get_request_scheduler
+from result_cache import get_result_cache
+from sharding import ShardedDispatcher
+from streaming import StreamedResult
+
+class AsyncAnalyzer:
+    """
+    Async analysis client that runs many batches concurrently.
+    
+    Use as an async context manager so the underlying HTTP sessions are closed:
+    
+        async with AsyncAnalyzer(concurrency=16) as analyzer:
+            results = await analyzer.analyze_sentiment(documents)
+    
+    With no explicit endpoint, requests are sharded across every resource
+    from config.get_language_resources().
+    """
+
+    def __init__(self, endpoint=None, key=None, concurrency=None,
+                 resources=None, strategy="least_outstanding"):
+        if concurrency is None:
+            concurrency = get_settings()['MAX_CONCURRENT_REQUESTS']
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if resources is None:
+            resources = [(endpoint, key, 1.0)] if endpoint and key else get_language_resources()
+        self.resources = resources
+        self.endpoint = resources[0][0]
+        self.concurrency = concurrency
+        self.strategy = strategy
+        self.dispatcher = None
+        self._clients = []
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _create_client(self, endpoint, key):
+        import aiohttp
+        from azure.ai.textanalytics.aio import TextAnalyticsClient
+        from azure.core.credentials import AzureKeyCredential
+        from azure.core.pipeline.transport import AioHttpTransport
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            force_close=not get_settings()['CONNECTION_KEEP_ALIVE']
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        transport = AioHttpTransport(
+            session=session,
+            session_owner=True,
+            connection_timeout=REQUEST_TIMEOUT,
+            read_timeout=REQUEST_TIMEOUT
+        )
+        return TextAnalyticsClient(
+            endpoint=endpoint,
+            credential=AzureKeyCredential(key),
+            transport=transport,
+            retry_total=0
+        )
+
+    async def open(self):
+        """Create the aio clients; must be called from a running event loop."""
+        if self._clients:
+            return
+        self._clients = [self._create_client(endpoint, key) for endpoint, key, _ in self.resources]
+        if len(self._clients) > 1:
+            self.dispatcher = ShardedDispatcher(
+                [(endpoint, client, weight)
+                 for (endpoint, _, weight), client in zip(self.resources, self._clients)],
+                strategy=self.strategy
+            )
+
+    async def close(self):
+        """Close the aio clients and their HTTP sessions."""
+        clients, self._clients = self._clients, []
+        self.dispatcher = None
+        for client in clients:
+            await client.close()
+
+    async def run(self, operation, documents, max_documents=None,
+                  max_characters=MAX_REQUEST_CHARACTERS, cache=None, dedup=None,
+                  dedup_stats=None, scheduler=None, local_detector=None, router=None,
+                  gazetteer=None, minimizer=None, **kwargs):
+        """
+        Run a client operation over any number of documents concurrently.
+        
+        Cached results are served locally and repeated texts are collapsed;
+        the remaining batches are sent with at most `concurrency` requests in
+        flight at any time.
+        
+        Args:
+            operation (str): Client method name, e.g. "analyze_sentiment"
+            documents (iterable): Documents to analyze
+            max_documents (int): Override the per-operation document limit
+            max_characters (int): Maximum total characters per request
+            cache (ResultCache): Result cache, defaults to the shared cache; False disables it
+            dedup (DedupPolicy): Deduplication policy, defaults to config; False disables it
+            dedup_stats (DedupStats): Accumulates calls and characters saved by deduplication
+            scheduler (RequestScheduler): Rate limiter and retries for a single resource
+            local_detector (LocalLanguageDetector): Answers confident detect_language
+                cases in-process, defaults to config; False disables it
+            router (LanguageRouter): Sends per-language batches with explicit
+                hints, defaults to config; False disables it
+            gazetteer (EntityGazetteer): Tags known entities locally for
+                recognize_entities, defaults to config; False disables it
+            minimizer (PayloadMinimizer): Minimizes texts before they are sent,
+                defaults to config; False disables it
+            **kwargs: Passed through to the client operation
+            
+        Returns:
+            list: Result or DocumentError objects, in input order
+            
+        Raises:
+            ValueError: If the operation is not supported
+        """
+        if operation not in MAX_DOCUMENTS_PER_REQUEST:
+            raise ValueError(f"Unsupported operation: {operation}")
+        await self.open()
+        if cache is None:
+            cache = get_result_cache()
+        if dedup is None:
+            dedup = get_dedup_policy()
+        if local_detector is None:
+            local_detector = get_local_detector()
+        if router is None:
+            router = get_language_router()
+        if gazetteer is None:
+            gazetteer = get_entity_gazetteer()
+        if minimizer is None:
+            minimizer = get_payload_minimizer()
+        send = self._sender(operation, scheduler)
+        limit = max_documents or MAX_DOCUMENTS_PER_REQUEST[operation]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        # Cache lookups and remote language routing block, so plan off the event loop
+        plan = await asyncio.get_running_loop().run_in_executor(
+            None, WindowPlan, operation, list(enumerate(documents)), cache or None,
+            dedup or None, kwargs, local_detector or None, router or None,
+            gazetteer or None, minimizer or None
+        )
+
+        async def dispatch(batch):
+            try:
+                response = await send(documents=[prepared for _, prepared in batch], **kwargs)
+            finally:
+                semaphore.release()
+            plan.complete(batch, response)
+
+        tasks = []
+        try:
+            for batch in plan.batches(limit, max_characters):
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(dispatch(batch)))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        if dedup_stats is not None:
+            plan.record_stats(dedup_stats, limit, max_characters, len(tasks))
+        return plan.results
+
+    def _sender(self, operation, scheduler):
+        if self.dispatcher is not None:
+            return partial(self.dispatcher.call_async, operation)
+        if scheduler is None:
+            scheduler = get_request_scheduler()
+        return partial(scheduler.call_async, getattr(self._clients[0], operation))
+
+    async def stream(self, operation, documents, max_documents=None,
+                     max_characters=MAX_REQUEST_CHARACTERS, window=DISPATCH_WINDOW,
+                     cache=None, dedup=None, scheduler=None, local_detector=None,
+                     router=None, gazetteer=None, minimizer=None, **kwargs):
+        """
+        Async iterator version of streaming.iter_streamed().
+        
+        Yields each document's result as soon as its sub-batch completes, in
+        completion order. Windows are only planned and sub-batches only sent
+        while the consumer keeps iterating, so at most `concurrency`
+        sub-batches of results are buffered:
+        
+            async with AsyncAnalyzer() as analyzer:
+                async for item in analyzer.stream("analyze_sentiment", documents,
+                                                  max_documents=2, show_opinion_mining=True):
+                    await websocket.send_json(to_serializable(item.result))
+        
+        Yields:
+            StreamedResult: (index, result) pairs, each input position exactly once
+        """
+        if operation not in MAX_DOCUMENTS_PER_REQUEST:
+            raise ValueError(f"Unsupported operation: {operation}")
+        await self.open()
+        if cache is None:
+            cache = get_result_cache()
+        if dedup is None:
+            dedup = get_dedup_policy()
+        if local_detector is None:
+            local_detector = get_local_detector()
+        if router is None:
+            router = get_language_router()
+        if gazetteer is None:
+            gazetteer = get_entity_gazetteer()
+        if minimizer is None:
+            minimizer = get_payload_minimizer()
+        send = self._sender(operation, scheduler)
+        limit = max_documents or MAX_DOCUMENTS_PER_REQUEST[operation]
+        loop = asyncio.get_running_loop()
+        in_flight = {}
+
+        async def drain():
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            resolved = []
+            for task in done:
+                plan, start, batch = in_flight.pop(task)
+                resolved.extend(StreamedResult(start + slot, plan.results[slot])
+                                for slot in plan.complete(batch, task.result()))
+            return resolved
+
+        try:
+            indexed = enumerate(documents)
+            while True:
+                batch_window = list(islice(indexed, window))
+                if not batch_window:
+                    break
+                start = batch_window[0][0]
+                plan = await loop.run_in_executor(
+                    None, WindowPlan, operation, batch_window, cache or None,
+                    dedup or None, kwargs, local_detector or None, router or None,
+                    gazetteer or None, minimizer or None
+                )
+                for slot, result in enumerate(plan.results):
+                    if result is not None:
+                        yield StreamedResult(start + slot, result)
+                for batch in plan.batches(limit, max_characters):
+                    while len(in_flight) >= self.concurrency:
+                        for item in await drain():
+                            yield item
+                    task = asyncio.ensure_future(send(documents=[prepared for _, prepared in batch], **kwargs))
+                    in_flight[task] = (plan, start, batch)
+            while in_flight:
+                for item in await drain():
+                    yield item
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def analyze_sentiment(self, documents, **kwargs):
+        """Analyze sentiment of documents concurrently."""
+        return await self.run("analyze_sentiment", documents, **kwargs)
+
+    async def extract_key_phrases(self, documents, **kwargs):
+        """Extract key phrases from documents concurrently."""
+        return await self.run("extract_key_phrases", documents, **kwargs)
+
+    async def recognize_entities(self, documents, **kwargs):
+        """Recognize named entities in documents concurrently."""
+        return await self.run("recognize_entities", documents, **kwargs)
+
+    async def recognize_pii_entities(self, documents, **kwargs):
+        """Recognize PII entities in documents concurrently."""
+        return await self.run("recognize_pii_entities", documents, **kwargs)
+
+    async def detect_language(self, documents, **kwargs):
+        """Detect the language of documents concurrently."""
+        return await self.run("detect_language", documents, **kwargs)
+
+def analyze_concurrent(operation, documents, concurrency=None,
+                       endpoint=None, key=None, resources=None, **kwargs):
+    """
+    Blocking facade over AsyncAnalyzer for synchronous callers.
+    
+    Args:
+        operation (str): Client method name, e.g. "analyze_sentiment"
+        documents (iterable): Documents to analyze
+        concurrency (int): Maximum number of in-flight requests, defaults to config
+        endpoint (str): Service endpoint, defaults to AZURE_LANGUAGE_ENDPOINT
+        key (str): Service key, defaults to AZURE_LANGUAGE_KEY
+        resources (list): (endpoint, key, weight) tuples to shard across instead
+        **kwargs: Passed through to AsyncAnalyzer.run
+        
+    Returns:
+        list: Result or DocumentError objects, in input order
+    """
+    async def _run():
+        async with AsyncAnalyzer(endpoint, key, concurrency, resources) as analyzer:
+            return await analyzer.run(operation, documents, **kwargs)
+
+    return asyncio.run(_run())
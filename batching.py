@@ -0,0 +1,349 @@
+"""
+Document batching for Azure AI Language Service
+Packs arbitrary document streams into the largest batches the service accepts
+and returns results in the original input order.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+from config import (
+    MAX_DOCUMENTS_PER_REQUEST,
+    MAX_REQUEST_CHARACTERS,
+    get_text_analytics_client
+)
+from dedup import get_dedup_policy
+from gazetteer import get_entity_gazetteer
+from language_routing import get_language_router, with_language
+from local_language import get_local_detector
+from payload import get_payload_minimizer, with_text
+from rate_limiter import get_request_scheduler
+from result_cache import document_language, get_result_cache, relabel_result
+from sharding import ShardedDispatcher, get_dispatcher
+
+# Number of input documents resolved (cache lookups, batching) at a time
+DISPATCH_WINDOW = 1000
+
+def document_text(document):
+    """
+    Get the text of a document in any input shape the SDK accepts.
+    
+    Args:
+        document: str, dict with a "text" key, or TextDocumentInput/DetectLanguageInput
+        
+    Returns:
+        str: Document text
+    """
+    if isinstance(document, str):
+        return document
+    if isinstance(document, dict):
+        return document.get("text", "")
+    return getattr(document, "text", "")
+
+def iter_batches(documents, max_documents, max_characters=MAX_REQUEST_CHARACTERS):
+    """
+    Pack documents into batches bounded by document count and total characters.
+    
+    Batches are filled greedily, so each one is as large as the limits allow.
+    A single document larger than max_characters is sent alone and left for
+    the service to report as a per-document error.
+    
+    Args:
+        documents (iterable): Documents to pack, consumed lazily
+        max_documents (int): Maximum number of documents per batch
+        max_characters (int): Maximum total characters per batch
+        
+    Yields:
+        list: Batches of (input_index, document) pairs
+    """
+    batch = []
+    batch_characters = 0
+    for index, document in enumerate(documents):
+        size = len(document_text(document))
+        if batch and (len(batch) >= max_documents or batch_characters + size > max_characters):
+            yield batch
+            batch = []
+            batch_characters = 0
+        batch.append((index, document))
+        batch_characters += size
+    if batch:
+        yield batch
+
+def count_batches(sizes, max_documents, max_characters=MAX_REQUEST_CHARACTERS):
+    """Count the batches iter_batches() would produce for documents of these sizes."""
+    batches = 0
+    batch_documents = 0
+    batch_characters = 0
+    for size in sizes:
+        if batch_documents and (batch_documents >= max_documents or batch_characters + size > max_characters):
+            batch_documents = 0
+            batch_characters = 0
+        if not batch_documents:
+            batches += 1
+        batch_documents += 1
+        batch_characters += size
+    return batches
+
+def prepare_document(index, document):
+    """Give plain strings and id-less dicts a globally unique id so results map back to the input."""
+    if isinstance(document, str):
+        return {"id": str(index), "text": document}
+    if isinstance(document, dict) and "id" not in document:
+        return dict(document, id=str(index))
+    return document
+
+def document_id(document):
+    """Get the id of a prepared document."""
+    if isinstance(document, dict):
+        return document["id"]
+    return document.id
+
+class WindowPlan:
+    """
+    Dispatch plan for one window of (index, document) pairs.
+    
+    Local language detection (for detect_language), gazetteer tagging (for
+    recognize_entities) and cache hits are resolved up front and repeated
+    texts are collapsed so each unique miss is sent once. With a minimizer,
+    unique misses are sent with minimized text. With a router, they get
+    explicit language hints and are batched per language. complete() fills
+    in the service results, with offsets mapped back to the raw text, and
+    fans them back out to every duplicate position.
+    """
+
+    def __init__(self, operation, window, cache, dedup, options, local_detector=None,
+                 router=None, gazetteer=None, minimizer=None):
+        self.operation = operation
+        self.cache = cache
+        self.options = options
+        self.minimizer = minimizer
+        self.offset_maps = {}
+        if operation != "recognize_entities":
+            gazetteer = None
+        # In merge mode gazetteer matches are added to every service result
+        self.merge_with = gazetteer if gazetteer is not None and gazetteer.mode == "merge" else None
+        self.results = [None] * len(window)
+        self.pending = []
+        self.duplicates = {}
+        self.missed_sizes = []
+
+        first_seen = {}
+        for slot, (index, document) in enumerate(window):
+            prepared = prepare_document(index, document)
+            text = document_text(document)
+            if local_detector is not None and operation == "detect_language":
+                detected = local_detector.detect(text, document_id(prepared))
+                if detected is not None:
+                    self.results[slot] = detected
+                    continue
+            if gazetteer is not None:
+                tagged = gazetteer.resolve(text, document_id(prepared))
+                if tagged is not None:
+                    self.results[slot] = tagged
+                    continue
+            if cache is not None:
+                cached = cache.lookup(operation, text, document, document_id(prepared), options)
+                if cached is not None:
+                    if self.merge_with is not None:
+                        cached = self.merge_with.merge(text, cached)
+                    self.results[slot] = cached
+                    continue
+
+            self.missed_sizes.append(len(text))
+            if dedup is not None:
+                key = dedup.key(text, document_language(document, options))
+                position = first_seen.get(key)
+                if position is not None:
+                    self.duplicates[position].append((slot, document_id(prepared)))
+                    continue
+                first_seen[key] = len(self.pending)
+            self.duplicates[len(self.pending)] = []
+            if minimizer is not None:
+                minimized, offset_map = minimizer.minimize(text, operation)
+                minimizer.stats.record(text, minimized)
+                if offset_map is not None:
+                    self.offset_maps[len(self.pending)] = offset_map
+                    prepared = with_text(prepared, minimized)
+            self.pending.append((slot, document, prepared))
+
+        self.languages = None
+        if router is not None and operation != "detect_language" and self.pending:
+            self.languages = router.route([document for _, document, _ in self.pending], options)
+            self.pending = [
+                (slot, document, with_language(prepared, language) if language else prepared)
+                for (slot, document, prepared), language in zip(self.pending, self.languages)
+            ]
+
+    def batches(self, limit, max_characters):
+        """Yield batches of (pending_position, prepared_document) to send."""
+        if self.languages is None:
+            yield from iter_batches((prepared for _, _, prepared in self.pending), limit, max_characters)
+            return
+        groups = {}
+        for position, language in enumerate(self.languages):
+            groups.setdefault(language, []).append(position)
+        for positions in groups.values():
+            group = (self.pending[position][2] for position in positions)
+            for batch in iter_batches(group, limit, max_characters):
+                yield [(positions[offset], prepared) for offset, prepared in batch]
+
+    def complete(self, batch, response):
+        """
+        Record the service response for a batch from batches().
+        
+        Returns:
+            list: Window slots resolved by this batch, duplicates included
+        """
+        resolved = []
+        # The SDK returns results in the same order as the submitted documents
+        for (position, _), result in zip(batch, response):
+            slot, document, _ = self.pending[position]
+            if position in self.offset_maps:
+                result = self.minimizer.restore(result, document_text(document), self.offset_maps[position])
+            if self.cache is not None:
+                self.cache.store(self.operation, document_text(document), document,
+                                 self.options, result)
+            if self.merge_with is not None:
+                result = self.merge_with.merge(document_text(document), result)
+            self.results[slot] = result
+            resolved.append(slot)
+            for duplicate_slot, duplicate_id in self.duplicates[position]:
+                self.results[duplicate_slot] = relabel_result(result, duplicate_id)
+                resolved.append(duplicate_slot)
+        return resolved
+
+    def record_stats(self, stats, limit, max_characters, calls):
+        """Add this window's deduplication savings to a DedupStats."""
+        stats.record(
+            documents=len(self.missed_sizes),
+            unique_documents=len(self.pending),
+            characters=sum(self.missed_sizes),
+            unique_characters=sum(len(document_text(document)) for _, document, _ in self.pending),
+            calls=calls,
+            calls_without_dedup=count_batches(self.missed_sizes, limit, max_characters)
+        )
+
+def operation_sender(operation, client=None, scheduler=None):
+    """
+    Get a callable that sends one request for a client operation.
+    
+    An explicit client (or ShardedDispatcher) is used as given. Otherwise
+    requests are spread over every configured resource when there are
+    several, or sent through the shared client when there is one.
+    
+    Args:
+        operation (str): Client method name, e.g. "analyze_sentiment"
+        client: TextAnalyticsClient or ShardedDispatcher, optional
+        scheduler (RequestScheduler): Rate limiter and retries for a single client
+        
+    Returns:
+        callable: Takes the operation's arguments and returns its response
+    """
+    if client is None:
+        client = get_dispatcher() or get_text_analytics_client()
+    if isinstance(client, ShardedDispatcher):
+        return partial(client.call, operation)
+    if scheduler is None:
+        scheduler = get_request_scheduler()
+    return partial(scheduler.call, getattr(client, operation))
+
+def _analyze_window(send, operation, window, limit, max_characters, concurrency, cache, dedup,
+                    dedup_stats, local_detector, router, gazetteer, minimizer, options):
+    """Resolve one window of (index, document) pairs from the cache and the service."""
+    plan = WindowPlan(operation, window, cache, dedup, options, local_detector, router, gazetteer,
+                      minimizer)
+    batches = list(plan.batches(limit, max_characters))
+    calls = len(batches)
+
+    def dispatch(batch):
+        return send(documents=[prepared for _, prepared in batch], **options)
+
+    if concurrency > 1 and calls > 1:
+        # The plan is completed on this thread; only the requests run in parallel
+        with ThreadPoolExecutor(max_workers=min(concurrency, calls)) as executor:
+            for batch, response in zip(batches, executor.map(dispatch, batches)):
+                plan.complete(batch, response)
+    else:
+        for batch in batches:
+            plan.complete(batch, dispatch(batch))
+    if dedup_stats is not None:
+        plan.record_stats(dedup_stats, limit, max_characters, calls)
+    return plan.results
+
+def iter_analyzed(operation, documents, client=None, max_documents=None,
+                  max_characters=MAX_REQUEST_CHARACTERS, concurrency=1, cache=None, dedup=None,
+                  dedup_stats=None, scheduler=None, local_detector=None, router=None,
+                  gazetteer=None, minimizer=None, **kwargs):
+    """
+    Run a client operation over any number of documents, batch by batch.
+    
+    Documents are resolved a window at a time: cached results are served
+    locally, repeated texts are collapsed, and only the unique misses are
+    packed into batches and sent. With concurrency above 1, a window's
+    batches are sent in parallel.
+    
+    Args:
+        operation (str): TextAnalyticsClient method name, e.g. "analyze_sentiment"
+        documents (iterable): Documents to analyze
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        max_documents (int): Override the per-operation document limit
+        max_characters (int): Maximum total characters per request
+        concurrency (int): Batches of one window in flight at once
+        cache (ResultCache): Result cache, defaults to the shared cache; False disables it
+        dedup (DedupPolicy): Deduplication policy, defaults to config; False disables it
+        dedup_stats (DedupStats): Accumulates calls and characters saved by deduplication
+        scheduler (RequestScheduler): Rate limiter and retries for an explicit client
+        local_detector (LocalLanguageDetector): Answers confident detect_language
+            cases in-process, defaults to config; False disables it
+        router (LanguageRouter): Sends per-language batches with explicit
+            hints, defaults to config; False disables it
+        gazetteer (EntityGazetteer): Tags known entities locally for
+            recognize_entities, defaults to config; False disables it
+        minimizer (PayloadMinimizer): Minimizes texts before they are sent,
+            defaults to config; False disables it
+        **kwargs: Passed through to the client operation
+        
+    Yields:
+        Result or DocumentError objects, in input order
+        
+    Raises:
+        ValueError: If the operation is not supported
+    """
+    if operation not in MAX_DOCUMENTS_PER_REQUEST:
+        raise ValueError(f"Unsupported operation: {operation}")
+    
+    if cache is None:
+        cache = get_result_cache()
+    if dedup is None:
+        dedup = get_dedup_policy()
+    if local_detector is None:
+        local_detector = get_local_detector()
+    if router is None:
+        router = get_language_router()
+    if gazetteer is None:
+        gazetteer = get_entity_gazetteer()
+    if minimizer is None:
+        minimizer = get_payload_minimizer()
+    send = operation_sender(operation, client, scheduler)
+    limit = max_documents or MAX_DOCUMENTS_PER_REQUEST[operation]
+    
+    indexed = enumerate(documents)
+    while True:
+        window = list(islice(indexed, DISPATCH_WINDOW))
+        if not window:
+            break
+        for result in _analyze_window(send, operation, window, limit, max_characters, concurrency,
+                                      cache or None, dedup or None, dedup_stats,
+                                      local_detector or None, router or None,
+                                      gazetteer or None, minimizer or None, kwargs):
+            yield result
+
+def analyze_batched(operation, documents, client=None, **kwargs):
+    """
+    Run a client operation over any number of documents.
+    
+    Returns:
+        list: Result or DocumentError objects, in input order
+    """
+    return list(iter_analyzed(operation, documents, client=client, **kwargs))
@@ -0,0 +1,98 @@
+"""
+Benchmark: vectorized corpus aggregation vs. per-document Python loops
+Fills a ResultStore with synthetic sentiment, entity and key-phrase rows and
+times incremental CorpusAggregator updates against a dict-counting loop.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from analytics import CorpusAggregator
+from result_store import SENTIMENT_LABELS, ResultStore
+
+ROWS = 10_000_000
+BATCH = 1_000_000
+LOOP_ROWS = 1_000_000
+CATEGORIES = ("Person", "Organization", "Location", "DateTime", "Quantity", "Event", "Product")
+PHRASES = 50_000
+
+def fill(store, start, count, rng):
+    """Append synthetic rows straight into the columns, as add() would."""
+    sentiment = store["sentiment"].columns
+    sentiment["doc"].extend(np.arange(start, start + count))
+    sentiment["label"].extend(rng.integers(0, len(SENTIMENT_LABELS), count, dtype=np.int32))
+    positive = np.round(rng.random(count, dtype=np.float32), 2)
+    sentiment["positive"].extend(positive)
+    sentiment["neutral"].extend(np.zeros(count, dtype=np.float32))
+    sentiment["negative"].extend(1 - positive)
+
+    entities = store["entities"].columns
+    entities["doc"].extend(np.arange(start, start + count))
+    entities["category"].extend(rng.integers(0, len(CATEGORIES), count, dtype=np.int32))
+    entities["subcategory"].extend(rng.integers(-1, 2, count, dtype=np.int32))
+    for column in ("offset", "length"):
+        entities[column].extend(np.zeros(count, dtype=np.int32))
+    entities["confidence"].extend(np.full(count, 0.9, dtype=np.float32))
+
+    phrases = store["key_phrases"].columns
+    phrases["doc"].extend(np.arange(start, start + count))
+    phrases["phrase"].extend(rng.zipf(1.3, count).clip(1, PHRASES).astype(np.int32) - 1)
+
+def loop_aggregate(store, rows):
+    """The per-row dict counting the step scripts used to do."""
+    labels = Counter()
+    sums = Counter()
+    categories = Counter()
+    phrases = Counter()
+    sentiment = store["sentiment"]
+    for label, positive, negative in zip(sentiment.column("label", decode=True)[:rows].tolist(),
+                                         sentiment.column("positive")[:rows].tolist(),
+                                         sentiment.column("negative")[:rows].tolist()):
+        labels[label] += 1
+        sums[label] += positive if label == "positive" else negative
+    for category in store["entities"].column("category", decode=True)[:rows].tolist():
+        categories[category] += 1
+    for phrase in store["key_phrases"].column("phrase")[:rows].tolist():
+        phrases[phrase] += 1
+    return labels, sums, categories, phrases.most_common(10)
+
+def main():
+    rng = np.random.default_rng(0)
+    store = ResultStore()
+    for category in CATEGORIES:
+        store.dictionaries["category"].code(category)
+    for phrase in range(PHRASES):
+        store.dictionaries["phrase"].code(f"phrase {phrase}")
+
+    aggregator = CorpusAggregator(store)
+    update_time = 0.0
+    for start in range(0, ROWS, BATCH):
+        fill(store, start, BATCH, rng)
+        started = time.perf_counter()
+        aggregator.update()
+        update_time += time.perf_counter() - started
+
+    started = time.perf_counter()
+    report = aggregator.report()
+    report_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    loop_aggregate(store, LOOP_ROWS)
+    loop_time = (time.perf_counter() - started) * ROWS / LOOP_ROWS
+
+    print(f"Aggregating {ROWS:,} rows each of sentiment, entities and key phrases\n")
+    print(f"Incremental updates ({ROWS // BATCH} x {BATCH:,}): {update_time:.2f}s")
+    print(f"Report:                           {report_time * 1000:.1f} ms")
+    print(f"Python loop (extrapolated):       {loop_time:.2f}s  ({loop_time / update_time:.0f}x slower)")
+    positive = report["sentiment"]["positive"]
+    print(f"\npositive: {positive['count']:,} docs, mean {positive['mean_confidence']:.3f}, p90 {positive['p90']:.2f}")
+    print(f"top phrase: {report['key_phrases'][0]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: shared pooled client vs. one new client per call
+Runs against the local mock server, so no Azure credentials are needed.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from azure.ai.textanalytics import TextAnalyticsClient
+from azure.core.credentials import AzureKeyCredential
+
+from benchmarks.mock_server import MockLanguageServer
+from config import close_clients, get_text_analytics_client
+
+ITERATIONS = 200
+DOCUMENTS = ["Azure AI Language Service provides amazing natural language processing capabilities!"]
+
+def run_fresh_clients(endpoint):
+    for _ in range(ITERATIONS):
+        client = TextAnalyticsClient(endpoint=endpoint, credential=AzureKeyCredential("benchmark-key"))
+        client.analyze_sentiment(documents=DOCUMENTS)
+        client.close()
+
+def run_shared_client(endpoint):
+    for _ in range(ITERATIONS):
+        client = get_text_analytics_client(endpoint, "benchmark-key")
+        client.analyze_sentiment(documents=DOCUMENTS)
+
+def time_it(label, func, endpoint):
+    start = time.perf_counter()
+    func(endpoint)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<22} {elapsed:7.3f}s  ({ITERATIONS / elapsed:8.1f} calls/s)")
+    return elapsed
+
+if __name__ == "__main__":
+    with MockLanguageServer() as server:
+        print(f"📊 {ITERATIONS} sentiment calls against {server.endpoint}")
+        fresh = time_it("new client per call", run_fresh_clients, server.endpoint)
+        shared = time_it("shared pooled client", run_shared_client, server.endpoint)
+        close_clients()
+        print(f"\n⚡ Speedup: {fresh / shared:.2f}x")
@@ -0,0 +1,41 @@
+"""
+Benchmark: throughput of async batch dispatch at different concurrency limits
+Runs against the local mock server with simulated service latency.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from async_analysis import analyze_concurrent
+from batching import analyze_batched
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+
+LATENCY = 0.05
+DOCUMENTS = [f"Review {i}: Azure AI services make development so much easier." for i in range(400)]
+
+if __name__ == "__main__":
+    with MockLanguageServer(latency=LATENCY) as server:
+        print(f"📊 {len(DOCUMENTS)} documents, {LATENCY * 1000:.0f} ms simulated latency per request")
+
+        client = get_text_analytics_client(server.endpoint, "benchmark-key")
+        start = time.perf_counter()
+        analyze_batched("analyze_sentiment", DOCUMENTS, client=client, cache=False)
+        elapsed = time.perf_counter() - start
+        print(f"   {'sequential':<16} {elapsed:7.3f}s  ({len(DOCUMENTS) / elapsed:8.1f} docs/s)")
+
+        for concurrency in (1, 2, 4, 8, 16, 32):
+            start = time.perf_counter()
+            results = analyze_concurrent(
+                "analyze_sentiment", DOCUMENTS, concurrency=concurrency,
+                endpoint=server.endpoint, key="benchmark-key", cache=False
+            )
+            elapsed = time.perf_counter() - start
+            assert len(results) == len(DOCUMENTS)
+            label = f"concurrency={concurrency}"
+            print(f"   {label:<16} {elapsed:7.3f}s  ({len(DOCUMENTS) / elapsed:8.1f} docs/s)")
@@ -0,0 +1,110 @@
+"""
+Benchmark: local entity gazetteer vs. remote recognize_entities calls
+Learns a gazetteer from remote results on a training sample, then compares
+throughput, service requests and agreement with the service for every mode
+on a corpus that keeps mentioning the same names, against the mock server.
+
+Usage:
+    python benchmarks/bench_gazetteer.py --documents 2000 --novel 0.1 --latency 0.05
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from batching import analyze_batched
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+from gazetteer import MODES, EntityGazetteer, GazetteerBuilder
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+
+NAMES = ["Microsoft", "Satya Nadella", "Redmond", "Seattle", "OpenAI", "GitHub", "Azure",
+         "Contoso", "Jane Doe", "Fabrikam", "Washington", "Northwind Traders"]
+TEMPLATES = [
+    "Yesterday {0} announced a partnership with {1} to expand services.",
+    "Analysts said {0} and {1} would share an office near {2}.",
+    "Customers in {0} reported that the {1} dashboard was slow.",
+    "According to {0}, the new release from {1} shipped on time.",
+]
+
+def make_corpus(rng, documents, novel):
+    """Documents mentioning known names; a `novel` share also mentions a made-up one."""
+    corpus = []
+    for _ in range(documents):
+        names = rng.sample(NAMES, 3)
+        if rng.random() < novel:
+            names[rng.randrange(3)] = "".join(rng.choice("bcdfgklmnprstvz") + rng.choice("aeiou")
+                                              for _ in range(3)).capitalize()
+        corpus.append(rng.choice(TEMPLATES).format(*names))
+    return corpus
+
+def entity_set(results):
+    return {(index, entity.offset, entity.length, entity.category)
+            for index, result in enumerate(results) if not result.is_error
+            for entity in result.entities}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the entity gazetteer with remote calls")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--training", type=int, default=500, help="Documents learned from")
+    parser.add_argument("--novel", type=float, default=0.1, help="Share of documents with an unknown name")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock seconds per request")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    training = make_corpus(rng, args.training, 0.0)
+    corpus = make_corpus(rng, args.documents, args.novel)
+    uncached = {"cache": False, "dedup": False, "local_detector": False, "router": False}
+
+    with MockLanguageServer(latency=args.latency) as server, tempfile.TemporaryDirectory() as directory:
+        client = get_text_analytics_client(server.endpoint, "benchmark-key")
+        scheduler = RequestScheduler(AdaptiveRateLimiter(rate=0))
+
+        def run(gazetteer):
+            before = server.request_count
+            started = time.perf_counter()
+            results = analyze_batched("recognize_entities", corpus, client=client, scheduler=scheduler,
+                                      gazetteer=gazetteer, **uncached)
+            return results, time.perf_counter() - started, server.request_count - before
+
+        builder = GazetteerBuilder()
+        builder.add_results(analyze_batched("recognize_entities", training, client=client,
+                                            scheduler=scheduler, gazetteer=False, **uncached))
+        path = os.path.join(directory, "entities.gaz")
+        written = builder.save(path)
+        started = time.perf_counter()
+        EntityGazetteer(path).close()
+        print(f"📚 Learned {written} entities from {args.training} documents: "
+              f"{os.path.getsize(path):,} bytes, opened in {(time.perf_counter() - started) * 1e6:.0f} µs")
+        print(f"📊 {args.documents} documents, {args.novel:.0%} with an unknown name, "
+              f"{args.latency * 1000:.0f} ms mock latency\n")
+
+        remote, elapsed, requests = run(False)
+        expected = entity_set(remote)
+        print(f"   {'remote':<18} {args.documents / elapsed:9.0f} docs/s  {requests:>5} requests")
+        for mode in MODES:
+            with EntityGazetteer(path, mode=mode) as gazetteer:
+                results, elapsed, requests = run(gazetteer)
+            found = entity_set(results)
+            recall = len(found & expected) / len(expected)
+            precision = len(found & expected) / len(found) if found else 1.0
+            print(f"   {mode:<18} {args.documents / elapsed:9.0f} docs/s  {requests:>5} requests  "
+                  f"recall {recall:6.1%}  precision {precision:6.1%}")
+
+        characters = sum(len(text) for text in corpus)
+        with EntityGazetteer(path) as gazetteer:
+            started = time.perf_counter()
+            for text in corpus:
+                gazetteer.find(text)
+            elapsed = time.perf_counter() - started
+        print(f"\n⚡ Matching alone: {characters / elapsed / 1e6:.2f}M characters/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: cold-start import time of the analysis modules
+Each import runs in a fresh interpreter under `-X importtime`; pass --compare
+with a git revision to measure the same modules in that revision side by side.
+
+Usage:
+    python benchmarks/bench_import_time.py --compare HEAD~1
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MODULES = (
+    "config",
+    "batching",
+    "multi_analysis",
+    "step2_text_analysis",
+    "step3_entity_recognition",
+    "step4_advanced_analysis"
+)
+
+# Older revisions raise on import without credentials
+ENVIRONMENT = dict(os.environ, AZURE_LANGUAGE_ENDPOINT="http://127.0.0.1", AZURE_LANGUAGE_KEY="benchmark-key")
+
+def import_time(module, root):
+    """Cumulative microseconds reported by -X importtime for one cold import."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, env=ENVIRONMENT, capture_output=True, text=True, check=True
+    ).stderr
+    for line in reversed(output.splitlines()):
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == module:
+            return int(cumulative)
+    raise RuntimeError(f"No importtime line for {module}")
+
+def median_import_time(module, root, repeat):
+    return statistics.median(import_time(module, root) for _ in range(repeat))
+
+def checkout(revision, directory):
+    """Extract a git revision into directory without touching the working tree."""
+    archive = os.path.join(directory, "revision.tar")
+    subprocess.run(["git", "archive", "--output", archive, revision], cwd=ROOT, check=True)
+    with tarfile.open(archive) as handle:
+        handle.extractall(os.path.join(directory, "tree"))
+    return os.path.join(directory, "tree")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time per module")
+    parser.add_argument("--modules", default=",".join(MODULES))
+    parser.add_argument("--repeat", type=int, default=7, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--compare", help="Git revision to measure alongside the working tree")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = checkout(args.compare, directory) if args.compare else None
+        print(f"📊 Median cumulative import time over {args.repeat} cold starts (ms)\n")
+        header = f"{'module':<26} {'current':>9}"
+        if baseline:
+            header += f" {args.compare:>9} {'speedup':>8}"
+        print(header)
+        for module in args.modules.split(","):
+            current = median_import_time(module, ROOT, args.repeat) / 1000
+            line = f"{module:<26} {current:>9.1f}"
+            if baseline:
+                before = median_import_time(module, baseline, args.repeat) / 1000
+                line += f" {before:>9.1f} {before / current:>7.1f}x"
+            print(line)
+
+if __name__ == "__main__":
+    main()
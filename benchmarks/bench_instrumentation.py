@@ -0,0 +1,57 @@
+"""
+Benchmark: hot-path overhead of call instrumentation
+Times RequestScheduler.call around a no-op function with no sinks, the
+in-process histogram sink and the Prometheus sink, then shows the metrics a
+real run against the mock server produces.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from batching import analyze_batched
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+from instrumentation import HistogramSink, Instrumentation, PrometheusSink
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+
+CALLS = 200_000
+BATCH = [{"id": str(i), "text": "Azure AI services make development so much easier."} for i in range(10)]
+
+def analyze_sentiment(documents):
+    return documents
+
+def time_calls(sinks):
+    scheduler = RequestScheduler(AdaptiveRateLimiter(rate=0), instrumentation=Instrumentation(sinks))
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        scheduler.call(analyze_sentiment, documents=BATCH)
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+if __name__ == "__main__":
+    print(f"📊 {CALLS:,} scheduler calls around a no-op, 10-document batches\n")
+    baseline = time_calls([])
+    print(f"   {'no sinks':<12} {baseline:6.2f} µs/call")
+    for label, sink in (("histogram", HistogramSink()), ("prometheus", PrometheusSink())):
+        per_call = time_calls([sink])
+        print(f"   {label:<12} {per_call:6.2f} µs/call  (+{per_call - baseline:.2f} µs)")
+
+    sink = PrometheusSink()
+    instrumentation = Instrumentation([sink])
+    with MockLanguageServer(latency=0.01) as server:
+        client = get_text_analytics_client(server.endpoint, "benchmark-key")
+        scheduler = RequestScheduler(instrumentation=instrumentation)
+        documents = [f"Review {i}: " + "the service works well. " * (i % 120) for i in range(200)]
+        for operation in ("analyze_sentiment", "recognize_entities"):
+            analyze_batched(operation, documents, client=client, scheduler=scheduler, cache=False)
+
+    print("\n📈 Summary against the mock server:")
+    for operation, entry in sink.summary().items():
+        print(f"   {operation:<20} requests {entry['requests']:>3}  docs {entry['documents']:>4}  "
+              f"chars {entry['characters']:>7}  billable units {entry['billable_units']:>4}  "
+              f"p95 ≤ {entry['p95_latency'] * 1000:.0f} ms")
+    print("\n" + "\n".join(sink.render().splitlines()[:6]) + "\n   ...")
@@ -0,0 +1,90 @@
+"""
+Benchmark: local language pre-filter accuracy, coverage and speed
+Reports how many detect_language calls the local detector avoids and how
+accurate its answers are on a labeled sample.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from local_language import LocalLanguageDetector
+
+LABELED = [
+    ("en", "Hello, how are you today?"),
+    ("en", "Azure AI Language Service is amazing!"),
+    ("en", "I love using Azure AI services! They make development so much easier."),
+    ("en", "The weather is terrible today, I'm feeling quite disappointed."),
+    ("en", "Please send the invoice to the billing department by Friday."),
+    ("en", "My order arrived late and the box was damaged."),
+    ("en", "OK"),
+    ("es", "Hola, ¿cómo estás?"),
+    ("es", "El producto llegó tarde y la caja estaba dañada."),
+    ("es", "Me encanta este servicio, es muy fácil de usar."),
+    ("es", "¿Dónde está la estación de tren más cercana?"),
+    ("es", "Necesito cambiar la dirección de envío de mi pedido."),
+    ("fr", "Bonjour, comment allez-vous?"),
+    ("fr", "Le produit est arrivé en retard et la boîte était abîmée."),
+    ("fr", "J'adore ce service, il est très facile à utiliser."),
+    ("fr", "Où se trouve la gare la plus proche?"),
+    ("fr", "Je voudrais changer l'adresse de livraison de ma commande."),
+    ("de", "Guten Tag, wie geht es Ihnen?"),
+    ("de", "Das Produkt kam zu spät und die Verpackung war beschädigt."),
+    ("de", "Ich liebe diesen Dienst, er ist sehr einfach zu benutzen."),
+    ("de", "Wo ist der nächste Bahnhof?"),
+    ("de", "Ich möchte die Lieferadresse meiner Bestellung ändern."),
+    ("it", "Ciao, come stai?"),
+    ("it", "Il prodotto è arrivato in ritardo e la scatola era danneggiata."),
+    ("it", "Adoro questo servizio, è molto facile da usare."),
+    ("it", "Dov'è la stazione ferroviaria più vicina?"),
+    ("it", "Vorrei cambiare l'indirizzo di spedizione del mio ordine."),
+    ("pt", "Olá, como vai você?"),
+    ("pt", "O produto chegou atrasado e a caixa estava danificada."),
+    ("pt", "Eu adoro este serviço, é muito fácil de usar."),
+    ("pt", "Onde fica a estação de trem mais próxima?"),
+    ("pt", "Gostaria de alterar o endereço de entrega do meu pedido."),
+    ("ja", "こんにちは、元気ですか？"),
+    ("ja", "商品の到着が遅れ、箱が破損していました。"),
+    ("ko", "안녕하세요, 어떻게 지내세요?"),
+    ("ko", "제품이 늦게 도착했고 상자가 손상되었습니다."),
+    ("zh", "你好，你今天怎么样？"),
+    ("zh", "产品迟到了，盒子也坏了。"),
+    ("ar", "مرحبا، كيف حالك؟"),
+    ("ar", "وصل المنتج متأخرا وكان الصندوق تالفا."),
+    ("hi", "नमस्ते, आप कैसे हैं?"),
+    ("hi", "उत्पाद देर से पहुंचा और डिब्बा क्षतिग्रस्त था।"),
+    ("ru", "Привет, как дела?"),
+    ("ru", "Товар пришёл с опозданием, и коробка была повреждена."),
+]
+
+if __name__ == "__main__":
+    for cutoff in (0.6, 0.7, 0.8, 0.9):
+        detector = LocalLanguageDetector(confidence=cutoff)
+        answered = correct = 0
+        wrong = []
+        for expected, text in LABELED:
+            result = detector.detect(text)
+            if result is None:
+                continue
+            answered += 1
+            if result.primary_language.iso6391_name == expected:
+                correct += 1
+            else:
+                wrong.append(f"{text!r} → {result.primary_language.iso6391_name}")
+        accuracy = correct / answered if answered else 0.0
+        print(f"📊 cutoff {cutoff:.1f}: answered locally {answered}/{len(LABELED)} "
+              f"({answered / len(LABELED):.0%} of calls avoided), accuracy {accuracy:.1%}")
+        for line in wrong:
+            print(f"   ❌ {line}")
+
+    detector = LocalLanguageDetector()
+    texts = [text for _, text in LABELED] * 200
+    start = time.perf_counter()
+    for text in texts:
+        detector.detect(text)
+    elapsed = time.perf_counter() - start
+    print(f"\n⚡ {elapsed / len(texts) * 1e6:.1f} µs per document")
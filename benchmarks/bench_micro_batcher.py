@@ -0,0 +1,92 @@
+"""
+Benchmark: per-request calls vs. the request-coalescing micro-batcher
+Many concurrent callers each analyze one short text, as a web service would,
+against the local mock server with simulated latency.
+
+Usage:
+    python benchmarks/bench_micro_batcher.py --callers 64 --calls 2000 --max-wait-ms 10
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from batching import analyze_batched
+from benchmarks.bench_suite import percentile
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+from micro_batcher import MicroBatcher
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+
+def run_callers(callers, calls, analyze):
+    """Run calls single-document analyses from callers threads; return per-call latencies."""
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(calls))
+
+    def caller():
+        for i in counter:
+            started = time.perf_counter()
+            result = analyze(f"Request {i}: the checkout page is great but shipping was slow.")
+            assert not result.is_error
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=caller) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+def report(label, latencies, elapsed, requests):
+    print(f"   {label:<14} {len(latencies) / elapsed:8.1f} calls/s  {requests:>6} requests  "
+          f"p50 {percentile(latencies, 50) * 1000:6.1f} ms  p99 {percentile(latencies, 99) * 1000:6.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-request calls with micro-batching")
+    parser.add_argument("--callers", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock seconds per request")
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--max-batch", type=int)
+    args = parser.parse_args(argv)
+
+    uncached = {"cache": False, "dedup": False, "router": False}
+    with MockLanguageServer(latency=args.latency) as server:
+        client = get_text_analytics_client(server.endpoint, "benchmark-key")
+        scheduler = RequestScheduler(AdaptiveRateLimiter(rate=0))
+        print(f"📊 {args.calls} single-document calls from {args.callers} callers, "
+              f"{args.latency * 1000:.0f} ms mock latency\n")
+
+        before = server.request_count
+        started = time.perf_counter()
+        latencies = run_callers(args.callers, args.calls, lambda text: analyze_batched(
+            "analyze_sentiment", [text], client=client, scheduler=scheduler, **uncached)[0])
+        direct_requests = server.request_count - before
+        report("per request", latencies, time.perf_counter() - started, direct_requests)
+
+        before = server.request_count
+        with MicroBatcher("analyze_sentiment", client=client, scheduler=scheduler,
+                          max_wait=args.max_wait_ms / 1000, max_batch=args.max_batch,
+                          **uncached) as batcher:
+            started = time.perf_counter()
+            latencies = run_callers(args.callers, args.calls, batcher.analyze)
+            elapsed = time.perf_counter() - started
+        batched_requests = server.request_count - before
+        report("micro-batched", latencies, elapsed, batched_requests)
+
+        stats = batcher.stats
+        print(f"\n⚡ {direct_requests / batched_requests:.1f}x fewer service calls; "
+              f"mean batch {stats['mean_batch_size']:.1f}, p95 {stats['p95_batch_size']}, "
+              f"max added wait {stats['max_wait'] * 1000:.1f} ms")
+        print("   Batch sizes: " + ", ".join(f"{size}×{count}" for size, count in stats["batch_sizes"].items()))
+
+if __name__ == "__main__":
+    main()
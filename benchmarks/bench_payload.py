@@ -0,0 +1,113 @@
+"""
+Benchmark: billable text records and payload bytes saved by minimization
+Measures the step2-step4 sample texts and a synthetic support-email corpus
+(indented, wrapped, with quoted replies, signatures and disclaimers) before
+and after whitespace normalization and boilerplate stripping, and checks
+against the mock server that entity offsets still point into the raw text.
+
+Usage:
+    python benchmarks/bench_payload.py --emails 2000
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import random
+import sys
+import textwrap
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from batching import analyze_batched
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+from payload import PayloadMinimizer
+
+SENTENCES = [
+    "My order from Contoso arrived two weeks late and the box was damaged.",
+    "I contacted support in Seattle three times without getting an answer.",
+    "The replacement part works, but the installation guide is confusing.",
+    "Please refund the shipping fee or send a voucher for the next order.",
+    "Jane Doe from the Redmond office promised a callback on Friday.",
+    "Overall the product is good, yet the delivery experience was poor.",
+]
+SIGNATURE = "--\nAlex Morgan\nSenior Buyer, Fabrikam Inc.\nPhone: (555) 010-2233\n"
+DISCLAIMER = ("This email and any attachments are confidential and intended solely for the addressee.\n"
+              "If you received it in error, please notify the sender and delete it.\n")
+
+def sample_texts():
+    """Indented triple-quoted sample texts from the step2-step4 demos."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "step[234]_*.py"))):
+        tree = ast.parse(open(path, encoding="utf-8").read())
+        docstrings = {id(node.body[0].value) for node in ast.walk(tree)
+                      if isinstance(node, (ast.Module, ast.FunctionDef)) and node.body
+                      and isinstance(node.body[0], ast.Expr)}
+        texts.extend(node.value for node in ast.walk(tree)
+                     if isinstance(node, ast.Constant) and isinstance(node.value, str)
+                     and id(node) not in docstrings and "\n " in node.value)
+    return texts
+
+def make_email(rng):
+    """A support email: wrapped body, quoted earlier message, signature and disclaimer."""
+    body = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(4, 14)))
+    quoted = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(0, 10)))
+    email = "Hello team,\n\n" + textwrap.indent(textwrap.fill(body, 72), "    ") + "\n\nThanks,\nAlex\n"
+    if quoted:
+        email += "\nOn Mon, 3 Jun 2024 at 09:12, Support <support@contoso.com> wrote:\n"
+        email += textwrap.indent(textwrap.fill(quoted, 70), "> ") + "\n"
+    return email + "\n" + SIGNATURE + "\n" + DISCLAIMER
+
+def measure(label, texts, minimizer):
+    started = time.perf_counter()
+    minimized = [minimizer.minimize(text, "recognize_entities")[0] for text in texts]
+    elapsed = time.perf_counter() - started
+    for text, small in zip(texts, minimized):
+        minimizer.stats.record(text, small)
+    stats = minimizer.stats
+    payload_before = len(json.dumps({"documents": [{"id": "0", "text": text} for text in texts]}))
+    payload_after = len(json.dumps({"documents": [{"id": "0", "text": text} for text in minimized]}))
+    print(f"   {label:<28} records {stats.records_before:>6} → {stats.records_after:<6} "
+          f"({stats.records_saved / stats.records_before:6.1%} saved)  "
+          f"characters {1 - stats.characters_after / stats.characters_before:6.1%} saved  "
+          f"JSON bytes {1 - payload_after / payload_before:6.1%} saved  "
+          f"{len(texts) / elapsed:9.0f} docs/s")
+
+def check_offsets(texts):
+    """Entities found on minimized text must map back to the same words in the raw text."""
+    with MockLanguageServer() as server:
+        client = get_text_analytics_client(server.endpoint, "benchmark-key")
+        results = analyze_batched("recognize_entities", texts, client=client, cache=False, dedup=False,
+                                  minimizer=PayloadMinimizer(strip_boilerplate=True))
+    checked = 0
+    for text, result in zip(texts, results):
+        for entity in result.entities:
+            assert text[entity.offset:entity.offset + entity.length].split() == entity.text.split()
+            checked += 1
+    return checked
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure savings from payload minimization")
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    samples = sample_texts()
+    emails = [make_email(rng) for _ in range(args.emails)]
+
+    print(f"📊 {len(samples)} demo sample texts, {len(emails)} support emails\n")
+    measure("samples, whitespace", samples, PayloadMinimizer(strip_boilerplate=False))
+    measure("emails, whitespace", emails, PayloadMinimizer(strip_boilerplate=False))
+    measure("emails, + boilerplate", emails, PayloadMinimizer(strip_boilerplate=True))
+
+    checked = check_offsets(samples + emails[:200])
+    print(f"\n✅ {checked} entity offsets mapped back onto the raw text")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: memory of the columnar result store vs. keeping SDK objects
+Materializes synthetic sentiment and entity results both ways and reports
+bytes per document, plus the time to build the store and export Parquet.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from azure.ai.textanalytics import (
+    AnalyzeSentimentResult,
+    CategorizedEntity,
+    RecognizeEntitiesResult,
+    SentenceSentiment,
+    SentimentConfidenceScores
+)
+
+from result_store import ResultStore
+
+DOCUMENTS = 50000
+BATCH = 1000
+CATEGORIES = ("Person", "Organization", "Location", "DateTime", "Quantity")
+
+def _scores(i):
+    positive = (i % 10) / 10
+    return SentimentConfidenceScores(positive=positive, neutral=0.0, negative=1 - positive)
+
+def make_batch(start, size):
+    sentiment = []
+    entities = []
+    for i in range(start, start + size):
+        sentences = [
+            SentenceSentiment(text=f"Sentence {j} of document {i}.", sentiment="positive",
+                              confidence_scores=_scores(i + j), offset=j * 30, length=30,
+                              mined_opinions=None)
+            for j in range(3)
+        ]
+        sentiment.append(AnalyzeSentimentResult(
+            id=str(i), sentiment="positive", warnings=[], statistics=None,
+            confidence_scores=_scores(i), sentences=sentences, is_error=False
+        ))
+        entities.append(RecognizeEntitiesResult(
+            id=str(i), warnings=[], statistics=None, is_error=False,
+            entities=[
+                CategorizedEntity(text=f"Entity {i % 500}", category=CATEGORIES[(i + k) % 5],
+                                  subcategory=None, offset=k * 20, length=8, confidence_score=0.9)
+                for k in range(4)
+            ]
+        ))
+    return sentiment, entities
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, current, elapsed
+
+def keep_objects():
+    kept = []
+    for start in range(0, DOCUMENTS, BATCH):
+        sentiment, entities = make_batch(start, BATCH)
+        kept.append((sentiment, entities))
+    return kept
+
+def keep_store():
+    store = ResultStore()
+    for start in range(0, DOCUMENTS, BATCH):
+        sentiment, entities = make_batch(start, BATCH)
+        store.add("analyze_sentiment", sentiment)
+        store.add("recognize_entities", entities)
+    return store
+
+def main():
+    print(f"Materializing sentiment + entities for {DOCUMENTS} documents\n")
+    objects, objects_bytes, objects_time = measure(keep_objects)
+    del objects
+    store, store_bytes, store_time = measure(keep_store)
+
+    print(f"{'mode':<12} {'MB held':>9} {'bytes/doc':>10} {'build s':>9}")
+    print(f"{'SDK objects':<12} {objects_bytes / 1e6:>9.1f} {objects_bytes / DOCUMENTS:>10.0f} {objects_time:>9.2f}")
+    print(f"{'ResultStore':<12} {store_bytes / 1e6:>9.1f} {store_bytes / DOCUMENTS:>10.0f} {store_time:>9.2f}")
+    print(f"\nMemory reduction: {objects_bytes / store_bytes:.1f}x  ({store!r})")
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow not installed; skipping Parquet export")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        paths = store.write_parquet(directory)
+        elapsed = time.perf_counter() - started
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"Parquet export: {len(paths)} tables, {size / 1e6:.1f} MB in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
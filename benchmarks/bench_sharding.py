@@ -0,0 +1,48 @@
+"""
+Benchmark: aggregate throughput when sharding across several resources
+Each mock resource enforces its own per-second quota, like a real pricing tier.
+"""
+
+import os
+import sys
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+# Size each resource's client-side limiter to its (simulated) pricing tier
+os.environ.setdefault("AZURE_LANGUAGE_TPS", "25")
+
+import asyncio
+
+from async_analysis import AsyncAnalyzer
+from benchmarks.mock_server import MockLanguageServer
+
+QUOTA_RPS = 25
+DOCUMENTS = [f"Order {i}: delivery was quick and the support team was helpful." for i in range(3000)]
+
+async def run(resources, concurrency):
+    async with AsyncAnalyzer(resources=resources, concurrency=concurrency) as analyzer:
+        results = await analyzer.run("analyze_sentiment", DOCUMENTS, cache=False, dedup=False)
+        health = analyzer.dispatcher.health if analyzer.dispatcher else []
+    return results, health
+
+if __name__ == "__main__":
+    print(f"📊 {len(DOCUMENTS)} documents, mock quota {QUOTA_RPS} requests/s per resource")
+    baseline = None
+    for count in (1, 2, 4):
+        with ExitStack() as stack:
+            servers = [stack.enter_context(MockLanguageServer(latency=0.02, max_rps=QUOTA_RPS, retry_after=0.2))
+                       for _ in range(count)]
+            resources = [(server.endpoint, "benchmark-key", 1.0) for server in servers]
+            start = time.perf_counter()
+            results, health = asyncio.run(run(resources, concurrency=8 * count))
+            elapsed = time.perf_counter() - start
+            throughput = len(DOCUMENTS) / elapsed
+            baseline = baseline or throughput
+            errors = sum(1 for result in results if result.is_error)
+            share = ", ".join(str(entry["successes"]) for entry in health) or "-"
+            print(f"   {count} resource(s): {elapsed:6.2f}s  {throughput:7.1f} docs/s  "
+                  f"({throughput / baseline:.2f}x)  429s: {sum(s.throttled_count for s in servers):<4} "
+                  f"errors: {errors}  calls per resource: {share}")
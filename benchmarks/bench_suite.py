@@ -0,0 +1,157 @@
+"""
+Benchmark suite: every operation in sequential, batched and concurrent modes
+Runs against the local mock server and reports docs/s, p50/p95/p99 request
+latency and peak Python memory, optionally saving the numbers as JSON so runs
+can be compared for regressions.
+
+Usage:
+    python benchmarks/bench_suite.py --documents 500 --latency 0.02 --failure-rate 0.01 --json baseline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from async_analysis import analyze_concurrent
+from batching import analyze_batched
+from benchmarks.mock_server import MockLanguageServer
+from config import get_text_analytics_client
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+
+OPERATIONS = (
+    "detect_language",
+    "analyze_sentiment",
+    "extract_key_phrases",
+    "recognize_entities",
+    "recognize_pii_entities"
+)
+MODES = ("sequential", "batched", "concurrent")
+
+TEMPLATES = (
+    "Customer {i} loved the new dashboard; Microsoft support in Seattle was excellent.",
+    "Ticket {i}: the export is broken again and I am disappointed with the response time.",
+    "Please contact Jane Doe at jane.doe{i}@example.com or (555) 010-{i:04d} about order {i}.",
+    "Order {i} shipped from Redmond on schedule and arrived in good condition.",
+)
+
+# Everything that would hide service round trips from the measurement
+UNCACHED = {"cache": False, "dedup": False, "local_detector": False, "router": False, "gazetteer": False}
+
+class TimingScheduler(RequestScheduler):
+    """RequestScheduler that records the latency of every call, retries included."""
+
+    def __init__(self, **kwargs):
+        super().__init__(AdaptiveRateLimiter(rate=0), **kwargs)
+        self.latencies = []
+
+    def call(self, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().call(func, *args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    async def call_async(self, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().call_async(func, *args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+def make_documents(count):
+    return [TEMPLATES[i % len(TEMPLATES)].format(i=i) for i in range(count)]
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+def run_mode(mode, operation, documents, server, concurrency, scheduler):
+    if mode == "concurrent":
+        return analyze_concurrent(operation, documents, concurrency=concurrency,
+                                  endpoint=server.endpoint, key="benchmark-key",
+                                  scheduler=scheduler, **UNCACHED)
+    client = get_text_analytics_client(server.endpoint, "benchmark-key")
+    max_documents = 1 if mode == "sequential" else None
+    return analyze_batched(operation, documents, client=client, scheduler=scheduler,
+                           max_documents=max_documents, **UNCACHED)
+
+def measure(mode, operation, documents, server, concurrency, backoff):
+    """Time one run, then repeat it under tracemalloc for peak memory."""
+    scheduler = TimingScheduler(backoff_base=backoff, backoff_max=backoff * 8)
+    requests_before = server.request_count
+    started = time.perf_counter()
+    results = run_mode(mode, operation, documents, server, concurrency, scheduler)
+    elapsed = time.perf_counter() - started
+    requests = server.request_count - requests_before
+
+    tracemalloc.start()
+    run_mode(mode, operation, documents, server, concurrency,
+             TimingScheduler(backoff_base=backoff, backoff_max=backoff * 8))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = scheduler.latencies
+    return {
+        "operation": operation,
+        "mode": mode,
+        "documents": len(documents),
+        "requests": requests,
+        "errors": sum(1 for result in results if result.is_error),
+        "retries": scheduler.retries,
+        "seconds": elapsed,
+        "docs_per_second": len(documents) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_memory_mb": peak / 1e6
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every operation against the mock service")
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--operations", default=",".join(OPERATIONS))
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock seconds per request")
+    parser.add_argument("--per-document-latency", type=float, default=0.0005)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float)
+    parser.add_argument("--backoff", type=float, default=0.05, help="First retry backoff in seconds")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    documents = make_documents(args.documents)
+    rows = []
+    with MockLanguageServer(latency=args.latency, per_document_latency=args.per_document_latency,
+                            jitter=args.jitter, failure_rate=args.failure_rate,
+                            max_rps=args.max_rps, retry_after=0.1) as server:
+        print(f"📊 {len(documents)} documents, {args.latency * 1000:.0f} ms ±{args.jitter:.0%} mock latency, "
+              f"{args.failure_rate:.1%} injected failures, concurrency {args.concurrency}\n")
+        print(f"{'operation':<24} {'mode':<11} {'docs/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'requests':>8} {'retries':>7} {'errors':>6} {'peak MB':>8}")
+        for operation in args.operations.split(","):
+            for mode in args.modes.split(","):
+                row = measure(mode, operation, documents, server, args.concurrency, args.backoff)
+                rows.append(row)
+                print(f"{operation:<24} {mode:<11} {row['docs_per_second']:>8.1f} {row['p50_ms']:>8.1f} "
+                      f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['requests']:>8} "
+                      f"{row['retries']:>7} {row['errors']:>6} {row['peak_memory_mb']:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump({"settings": vars(args), "results": rows}, handle, indent=2)
+        print(f"\n💾 Saved results to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: local extractive summarization on large corpora
+Reports throughput of the TF-IDF sentence ranker over a synthetic corpus and
+its cost per character as single documents double in length, which stays
+flat for a linear-time ranker.
+
+Usage:
+    python benchmarks/bench_summarization.py --documents 2000 --max-sentences 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from summarization import rank_sentences, summarize
+
+SUBJECTS = ["The service", "Our team", "The new release", "Customer support", "The dashboard",
+            "Sentiment analysis", "The billing system", "Azure AI Language", "The mobile app"]
+VERBS = ["improves", "reduces", "reports", "detects", "summarizes", "slows down", "extends", "replaces"]
+OBJECTS = ["response times", "key phrases", "monthly invoices", "named entities", "support tickets",
+           "language detection", "regional availability", "review throughput", "privacy compliance"]
+TAILS = ["for enterprise customers", "across every region", "after the latest update",
+         "during peak traffic", "without extra configuration", "in most languages"]
+
+def make_document(rng, sentences):
+    """Synthetic prose of a given number of sentences."""
+    return " ".join(
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(TAILS)}."
+        for _ in range(sentences)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=2000, help="Documents in the corpus run")
+    parser.add_argument("--sentences", type=int, default=40, help="Sentences per corpus document")
+    parser.add_argument("--max-sentences", type=int, default=20000,
+                        help="Length of the longest single document in the scaling run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    corpus = [make_document(rng, args.sentences) for _ in range(args.documents)]
+    characters = sum(len(text) for text in corpus)
+    start = time.perf_counter()
+    summaries = summarize(corpus, max_sentences=3, mode="local", key_phrases=False)
+    elapsed = time.perf_counter() - start
+    assert all(len(summary.sentences) == 3 for summary in summaries)
+    print(f"📚 {args.documents} documents, {characters / 1e6:.1f}M characters: {elapsed:.2f}s "
+          f"({args.documents / elapsed:.0f} docs/s, {characters / elapsed / 1e6:.2f}M chars/s)")
+
+    print("\n📈 Single-document scaling")
+    print(f"{'sentences':>10} {'characters':>12} {'seconds':>9} {'µs/char':>8}")
+    sentences = 250
+    while sentences <= args.max_sentences:
+        text = make_document(rng, sentences)
+        start = time.perf_counter()
+        rank_sentences(text, ["key phrases", "support tickets"])
+        elapsed = time.perf_counter() - start
+        print(f"{sentences:>10} {len(text):>12} {elapsed:>9.3f} {elapsed / len(text) * 1e6:>8.2f}")
+        sentences *= 2
+
+if __name__ == "__main__":
+    main()
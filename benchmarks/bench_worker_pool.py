@@ -0,0 +1,106 @@
+"""
+Benchmark: CPU scaling of the multiprocess worker pool
+Each shard is normalized, chunked, redacted locally, scored for sentiment
+against the mock server (running in its own process) and serialized to JSON,
+in-process and then with 1, 2, 4, ... worker processes.
+
+Usage:
+    python benchmarks/bench_worker_pool.py --documents 4000 --max-workers 8
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import unicodedata
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "benchmark-key")
+
+from batching import analyze_batched
+from chunking import split_document
+from config import get_text_analytics_client
+from corpus_pipeline import to_serializable
+from redaction import PiiRedactor
+from worker_pool import WorkerPool, iter_shards
+
+PORT = 8767
+PARAGRAPH = ("Customer {i} wrote:   the new dashboard is great, but the export failed twice.  "
+             "Call me at (555) 010-{i:04d} or mail jane.doe{i}@example.com; card 4111 1111 1111 1111. ")
+
+def make_documents(count, paragraphs):
+    return [" ".join(PARAGRAPH.format(i=i) for _ in range(paragraphs)) for i in range(count)]
+
+def process_shard(texts, client=None, scheduler=None):
+    """The CPU-side work of one shard plus one sentiment pass through the service."""
+    normalized = [re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip() for text in texts]
+    chunks = [len(split_document(text, 1000)) for text in normalized]
+    redacted = PiiRedactor(strategy="hash", local_only=True).redact(normalized)
+    sentiment = analyze_batched("analyze_sentiment", [text[:5000] for text in normalized],
+                                client=client, scheduler=scheduler, cache=False, dedup=False)
+    return [
+        json.dumps({"chunks": count, "redacted": document.text, "sentiment": to_serializable(result)})
+        for count, document, result in zip(chunks, redacted, sentiment)
+    ]
+
+def start_mock_server():
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), "mock_server.py"),
+                               "--port", str(PORT)], stdout=subprocess.DEVNULL)
+    endpoint = f"http://127.0.0.1:{PORT}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(endpoint, timeout=0.1)
+        except urllib.error.HTTPError:
+            return server, endpoint
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("Mock server did not start")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure worker pool scaling on CPU-heavy shards")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--paragraphs", type=int, default=20, help="Paragraphs per document")
+    parser.add_argument("--shard-size", type=int, default=50)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--prefetch", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    documents = make_documents(args.documents, args.paragraphs)
+    server, endpoint = start_mock_server()
+    try:
+        print(f"📊 {len(documents)} documents of ~{len(documents[0])} characters, "
+              f"shards of {args.shard_size}, {os.cpu_count()} CPUs\n")
+        client = get_text_analytics_client(endpoint, "benchmark-key")
+        started = time.perf_counter()
+        for shard in iter_shards(documents, args.shard_size):
+            process_shard(shard, client=client)
+        baseline = time.perf_counter() - started
+        print(f"   {'in-process':<12} {baseline:7.2f}s  ({len(documents) / baseline:8.1f} docs/s)")
+
+        workers = 1
+        while workers <= args.max_workers:
+            with WorkerPool(workers, args.prefetch, endpoint, "benchmark-key") as pool:
+                # Start every worker before timing
+                list(pool.imap(process_shard, [documents[:1]] * workers))
+                started = time.perf_counter()
+                outputs = sum(len(rows) for rows in pool.imap(process_shard, iter_shards(documents, args.shard_size)))
+                elapsed = time.perf_counter() - started
+            assert outputs == len(documents)
+            speedup = baseline / elapsed
+            label = f"workers={workers}"
+            print(f"   {label:<12} {elapsed:7.2f}s  ({len(documents) / elapsed:8.1f} docs/s)  "
+                  f"{speedup:5.2f}x  {speedup / workers:4.0%} efficiency")
+            workers *= 2
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Local stand-in for the Azure AI Language Service
+Serves deterministic fake results for the analyze-text endpoint and its
+multi-action jobs API, with configurable latency, throttling and failure
+injection, so the step scripts and benchmarks run without live credentials.
+
+Usage:
+    python benchmarks/mock_server.py --port 8765 --latency 0.05 --failure-rate 0.01
+    AZURE_LANGUAGE_ENDPOINT=http://127.0.0.1:8765 AZURE_LANGUAGE_KEY=any python step2_text_analysis.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODEL_VERSION = "2023-01-01"
+
+# Service limits per synchronous request, by task kind
+MAX_DOCUMENTS = {
+    "LanguageDetection": 1000,
+    "SentimentAnalysis": 10,
+    "KeyPhraseExtraction": 10,
+    "EntityRecognition": 5,
+    "PiiEntityRecognition": 5
+}
+MAX_JOB_DOCUMENTS = 25
+MAX_DOCUMENT_CHARACTERS = 5120
+
+POSITIVE_WORDS = set("love great amazing excellent easier happy good best excited wonderful fantastic".split())
+NEGATIVE_WORDS = set("terrible bad awful disappointed hate worst poor damaged late broken angry".split())
+
+LANGUAGES = {
+    "en": ("English", set("the and is are you how to of this that with".split())),
+    "es": ("Spanish", set("el la los es cómo estás que y de hola por".split())),
+    "fr": ("French", set("le les est vous comment et de bonjour nous pour".split())),
+    "de": ("German", set("der die das ist und wie es geht ihnen guten".split())),
+}
+SCRIPT_LANGUAGES = (
+    ("ja", "Japanese", re.compile(r"[぀-ヿ]")),
+    ("ko", "Korean", re.compile(r"[가-힯]")),
+    ("zh_chs", "Chinese_Simplified", re.compile(r"[一-鿿]")),
+    ("ru", "Russian", re.compile(r"[Ѐ-ӿ]")),
+    ("ar", "Arabic", re.compile(r"[؀-ۿ]")),
+    ("hi", "Hindi", re.compile(r"[ऀ-ॿ]")),
+)
+
+KNOWN_ENTITIES = {
+    "Microsoft": "Organization", "Microsoft Corporation": "Organization", "GitHub": "Organization",
+    "OpenAI": "Organization", "Azure": "Product", "Seattle": "Location", "Redmond": "Location",
+    "Washington": "Location"
+}
+ENTITY_CATEGORIES = ("Person", "Organization", "Location")
+SENTENCE_STARTERS = set("The This These Those It He She His Her They We I In On At A An And But Our My".split())
+
+PII_PATTERNS = (
+    ("USSocialSecurityNumber", re.compile(r"\b\d{3}-\d{2}-\d{4}\b")),
+    ("CreditCardNumber", re.compile(r"\b\d{4}(?:[ -]?\d{4}){3}\b")),
+    ("Email", re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")),
+    ("PhoneNumber", re.compile(r"(?:\(\d{3}\)|\b\d{3})[ .-]?\d{3}[ .-]\d{4}\b")),
+)
+
+_sentence = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+_capitalized = re.compile(r"\b[A-Z][a-z][A-Za-z]*(?:\s+[A-Z][a-z][A-Za-z]*)*")
+_year = re.compile(r"\b(?:1[89]|20)\d{2}\b")
+
+def _stable_hash(text):
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+def _sentiment_of(text):
+    words = re.findall(r"\w+", text.lower())
+    positive = sum(word in POSITIVE_WORDS for word in words)
+    negative = sum(word in NEGATIVE_WORDS for word in words)
+    if positive and negative:
+        return "mixed", {"positive": 0.45, "neutral": 0.1, "negative": 0.45}
+    if positive:
+        return "positive", {"positive": 0.9, "neutral": 0.05, "negative": 0.05}
+    if negative:
+        return "negative", {"positive": 0.05, "neutral": 0.05, "negative": 0.9}
+    return "neutral", {"positive": 0.1, "neutral": 0.8, "negative": 0.1}
+
+def _detect_language(doc):
+    text = doc["text"]
+    for iso, name, script in SCRIPT_LANGUAGES:
+        if script.search(text):
+            return _language_result(doc, iso, name, 1.0)
+    words = set(re.findall(r"\w+", text.lower()))
+    best = max(LANGUAGES, key=lambda iso: len(words & LANGUAGES[iso][1]))
+    hits = len(words & LANGUAGES[best][1])
+    return _language_result(doc, best, LANGUAGES[best][0], 1.0 if hits > 1 else 0.8 if hits else 0.5)
+
+def _language_result(doc, iso, name, confidence):
+    return {
+        "id": doc["id"],
+        "detectedLanguage": {"name": name, "iso6391Name": iso, "confidenceScore": confidence},
+        "warnings": []
+    }
+
+def _analyze_sentiment(doc):
+    text = doc["text"]
+    sentences = []
+    for match in _sentence.finditer(text):
+        if match.group().strip():
+            label, scores = _sentiment_of(match.group())
+            sentences.append({
+                "text": match.group(), "sentiment": label, "confidenceScores": scores,
+                "offset": match.start(), "length": len(match.group())
+            })
+    label, scores = _sentiment_of(text)
+    return {"id": doc["id"], "sentiment": label, "confidenceScores": scores,
+            "sentences": sentences, "warnings": []}
+
+def _extract_key_phrases(doc):
+    phrases = []
+    for word in doc["text"].split():
+        word = word.strip(".,;:!?\"'()")
+        if len(word) > 6 and word not in phrases:
+            phrases.append(word)
+    return {"id": doc["id"], "keyPhrases": phrases[:5], "warnings": []}
+
+def _entities(text):
+    entities = []
+    for match in _capitalized.finditer(text):
+        words = match.group().split()
+        start = match.start()
+        # Drop sentence-initial words that are not names
+        while words and words[0] in SENTENCE_STARTERS:
+            start += len(words[0])
+            start += len(text[start:]) - len(text[start:].lstrip())
+            words = words[1:]
+        if not words:
+            continue
+        name = " ".join(words)
+        category = KNOWN_ENTITIES.get(name) or ENTITY_CATEGORIES[_stable_hash(name) % len(ENTITY_CATEGORIES)]
+        entities.append({"text": text[start:match.end()], "category": category,
+                         "offset": start, "length": match.end() - start,
+                         "confidenceScore": 0.99 if name in KNOWN_ENTITIES else 0.8})
+    for match in _year.finditer(text):
+        entities.append({"text": match.group(), "category": "DateTime", "subcategory": "Date",
+                         "offset": match.start(), "length": len(match.group()), "confidenceScore": 0.8})
+    return sorted(entities, key=lambda entity: entity["offset"])
+
+def _recognize_entities(doc):
+    return {"id": doc["id"], "entities": _entities(doc["text"]), "warnings": []}
+
+def _recognize_pii_entities(doc):
+    text = doc["text"]
+    entities = [entity for entity in _entities(text) if entity["category"] == "Person"]
+    for category, pattern in PII_PATTERNS:
+        for match in pattern.finditer(text):
+            if not any(match.start() < e["offset"] + e["length"] and e["offset"] < match.end() for e in entities):
+                entities.append({"text": match.group(), "category": category, "offset": match.start(),
+                                 "length": len(match.group()), "confidenceScore": 0.95})
+    entities.sort(key=lambda entity: entity["offset"])
+    redacted = list(text)
+    for entity in entities:
+        redacted[entity["offset"]:entity["offset"] + entity["length"]] = "*" * entity["length"]
+    return {"id": doc["id"], "entities": entities, "redactedText": "".join(redacted), "warnings": []}
+
+def _extract_summary(doc, parameters):
+    """Rank sentences by how many entity-like words they hold, then by length."""
+    text = doc["text"]
+    sentences = []
+    for match in _sentence.finditer(text):
+        sentence = match.group().strip()
+        if sentence:
+            offset = match.start() + match.group().index(sentence)
+            weight = len(_capitalized.findall(sentence)) * 10 + len(sentence.split())
+            sentences.append({"text": sentence, "offset": offset, "length": len(sentence), "weight": weight})
+    best = max((sentence["weight"] for sentence in sentences), default=1) or 1
+    ranked = sorted(sentences, key=lambda sentence: -sentence["weight"])[:parameters.get("sentenceCount", 3)]
+    if parameters.get("sortBy", "Offset") == "Offset":
+        ranked.sort(key=lambda sentence: sentence["offset"])
+    for sentence in ranked:
+        sentence["rankScore"] = round(sentence.pop("weight") / best, 2)
+    return {"id": doc["id"], "sentences": ranked, "warnings": []}
+
+HANDLERS = {
+    "LanguageDetection": ("LanguageDetectionResults", _detect_language),
+    "SentimentAnalysis": ("SentimentAnalysisResults", _analyze_sentiment),
+    "KeyPhraseExtraction": ("KeyPhraseExtractionResults", _extract_key_phrases),
+    "EntityRecognition": ("EntityRecognitionResults", _recognize_entities),
+    "PiiEntityRecognition": ("PiiEntityRecognitionResults", _recognize_pii_entities),
+}
+
+# Task kinds only available as jobs; their handlers also take the task parameters
+JOB_HANDLERS = {
+    "ExtractiveSummarization": ("ExtractiveSummarizationResults", _extract_summary),
+}
+
+def _document_error(doc, message):
+    return {
+        "id": doc["id"],
+        "error": {
+            "code": "InvalidArgument",
+            "message": "Invalid document in request.",
+            "innererror": {"code": "InvalidDocument", "message": message}
+        }
+    }
+
+class MockLanguageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.split("?")[0].endswith("/analyze-text/jobs"):
+            self._submit_job(body)
+            return
+
+        kind = body.get("kind")
+        if kind not in HANDLERS:
+            self._send(400, {"error": {"code": "InvalidRequest", "message": f"Unsupported kind: {kind}"}})
+            return
+        documents = body.get("analysisInput", {}).get("documents", [])
+        if self._rejected(len(documents), MAX_DOCUMENTS[kind]):
+            return
+
+        result_kind, handler = HANDLERS[kind]
+        self.server.request_count += 1
+        self._send(200, {
+            "kind": result_kind,
+            "results": self._run(handler, documents)
+        })
+
+    def do_GET(self):
+        job_id = self.path.split("?")[0].rsplit("/", 1)[-1]
+        job = self.server.jobs.get(job_id)
+        if job is None:
+            self._send(404, {"error": {"code": "NotFound", "message": f"Unknown job: {job_id}"}})
+            return
+        self._send(200, job)
+
+    def _rejected(self, documents, max_documents):
+        """Answer throttled, failed and oversized requests; True if the request was answered."""
+        server = self.server
+        if server.should_throttle():
+            self._send(429, {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                       {"Retry-After": str(server.retry_after)})
+            return True
+        server.simulate_latency(documents)
+        if server.should_fail():
+            self._send(500, {"error": {"code": "InternalServerError", "message": "Injected failure."}})
+            return True
+        if server.enforce_limits and documents > max_documents:
+            self._send(400, {"error": {
+                "code": "InvalidArgument",
+                "message": f"Batch request contains too many records. Max {max_documents} records are permitted.",
+                "innererror": {"code": "InvalidDocumentBatch", "message": "Too many documents."}
+            }})
+            return True
+        return False
+
+    def _run(self, handler, documents):
+        results = {"documents": [], "errors": [], "modelVersion": MODEL_VERSION}
+        for doc in documents:
+            if self.server.enforce_limits and len(doc.get("text", "")) > MAX_DOCUMENT_CHARACTERS:
+                results["errors"].append(_document_error(
+                    doc, f"A document within the request was too large to be processed. "
+                         f"Limit document size to: {MAX_DOCUMENT_CHARACTERS} text elements."
+                ))
+            elif self.server.should_fail_document():
+                results["errors"].append(_document_error(doc, "Injected document failure."))
+            else:
+                results["documents"].append(handler(doc))
+        return results
+
+    def _submit_job(self, body):
+        documents = body.get("analysisInput", {}).get("documents", [])
+        if self._rejected(len(documents), MAX_JOB_DOCUMENTS):
+            return
+        timestamp = "2023-01-01T00:00:00Z"
+        items = []
+        for task in body.get("tasks", []):
+            if task["kind"] in JOB_HANDLERS:
+                result_kind, handler = JOB_HANDLERS[task["kind"]]
+                handler = partial(handler, parameters=task.get("parameters") or {})
+            else:
+                result_kind, handler = HANDLERS[task["kind"]]
+            items.append({
+                "kind": result_kind.replace("Results", "LROResults"),
+                "taskName": task.get("taskName"),
+                "lastUpdateDateTime": timestamp,
+                "status": "succeeded",
+                "results": self._run(handler, documents)
+            })
+
+        job_id = str(uuid.uuid4())
+        self.server.jobs[job_id] = {
+            "jobId": job_id,
+            "createdDateTime": timestamp,
+            "lastUpdatedDateTime": timestamp,
+            "status": "succeeded",
+            "errors": [],
+            "tasks": {"completed": len(items), "failed": 0, "inProgress": 0, "total": len(items), "items": items}
+        }
+        self.server.request_count += 1
+        host, port = self.server.server_address[:2]
+        location = f"http://{host}:{port}/language/analyze-text/jobs/{job_id}?api-version=2023-04-01"
+        self._send(202, {}, {"Operation-Location": location})
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+class MockLanguageServer(ThreadingHTTPServer):
+    """
+    Threaded mock server; use as a context manager to run it in the background.
+
+    Results are a deterministic function of the document text; injected
+    latency jitter and failures come from a seeded generator.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, 0 picks a free port
+        latency (float): Seconds to sleep before answering each request
+        max_rps (float): Answer 429 once more than this many requests arrive per second
+        throttle_every (int): Also answer every Nth request with 429
+        retry_after (float): Retry-After value sent with 429 responses
+        per_document_latency (float): Extra seconds per document in the request
+        jitter (float): Latency varies uniformly by this fraction either way
+        failure_rate (float): Fraction of requests answered with 500
+        document_error_rate (float): Fraction of documents returned as errors
+        enforce_limits (bool): Reject oversized batches and documents like the service
+        seed (int): Seed for jitter and failure injection
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, max_rps=None,
+                 throttle_every=0, retry_after=1, per_document_latency=0.0, jitter=0.0,
+                 failure_rate=0.0, document_error_rate=0.0, enforce_limits=True, seed=0):
+        super().__init__((host, port), MockLanguageHandler)
+        self.latency = latency
+        self.max_rps = max_rps
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.per_document_latency = per_document_latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.document_error_rate = document_error_rate
+        self.enforce_limits = enforce_limits
+        self.request_count = 0
+        self.throttled_count = 0
+        self.failed_count = 0
+        self._arrivals = 0
+        self._window = (0, 0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.jobs = {}
+        self._thread = None
+
+    def should_throttle(self):
+        """Decide whether the current request exceeds the simulated quota."""
+        with self._lock:
+            self._arrivals += 1
+            throttle = bool(self.throttle_every) and self._arrivals % self.throttle_every == 0
+            if self.max_rps:
+                second = int(time.monotonic())
+                window_second, count = self._window
+                count = count + 1 if window_second == second else 1
+                self._window = (second, count)
+                throttle = throttle or count > self.max_rps
+            if throttle:
+                self.throttled_count += 1
+            return throttle
+
+    def should_fail(self):
+        """Decide whether to inject a 500 for the current request."""
+        if not self.failure_rate:
+            return False
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+            self.failed_count += failed
+            return failed
+
+    def should_fail_document(self):
+        """Decide whether to inject a per-document error."""
+        if not self.document_error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.document_error_rate
+
+    def simulate_latency(self, documents):
+        """Sleep for the configured service latency of a request with this many documents."""
+        delay = self.latency + self.per_document_latency * documents
+        if delay and self.jitter:
+            with self._lock:
+                delay *= self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @property
+    def endpoint(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local mock Azure AI Language Service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--per-document-latency", type=float, default=0.0, help="Extra seconds per document")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter as a fraction")
+    parser.add_argument("--max-rps", type=float, help="Throttle above this many requests per second")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Throttle every Nth request")
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--document-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with MockLanguageServer(
+        args.host, args.port, latency=args.latency, max_rps=args.max_rps,
+        throttle_every=args.throttle_every, retry_after=args.retry_after,
+        per_document_latency=args.per_document_latency, jitter=args.jitter,
+        failure_rate=args.failure_rate, document_error_rate=args.document_error_rate, seed=args.seed
+    ) as server:
+        print(f"🧪 Mock Language Service listening on {server.endpoint}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Long-document chunking for Azure AI Language Service
+Splits documents over the per-document character limit on sentence
+boundaries, analyzes the chunks in parallel batches and merges the chunk
+results back into one result per document with offsets in original text.
+"""
+
+import copy
+import re
+from itertools import islice
+
+from batching import DISPATCH_WINDOW, analyze_batched, document_id, document_text, prepare_document
+from config import MAX_DOCUMENT_CHARACTERS, get_settings
+from payload import mask_entities
+from result_cache import document_language, relabel_result
+
+# Operations whose chunk results can be merged back into one document result
+CHUNKED_OPERATIONS = ("extract_key_phrases", "recognize_entities", "recognize_pii_entities")
+
+# Whitespace after sentence-ending punctuation, or a blank line
+_sentence_end = re.compile(r"(?<=[.!?。！？])\s+|\n\s*\n")
+
+def sentence_spans(text):
+    """
+    Split text into contiguous sentence spans.
+
+    Trailing whitespace stays with the sentence before it, so the spans
+    cover the whole text without gaps.
+
+    Returns:
+        list: (start, end) character offsets
+    """
+    spans = []
+    start = 0
+    for match in _sentence_end.finditer(text):
+        spans.append((start, match.end()))
+        start = match.end()
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+def _split_long_span(text, start, end, max_characters):
+    """Cut a sentence longer than max_characters at whitespace where possible."""
+    pieces = []
+    while end - start > max_characters:
+        cut = text.rfind(" ", start + 1, start + max_characters)
+        if cut <= start:
+            cut = start + max_characters
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+def split_document(text, max_characters=MAX_DOCUMENT_CHARACTERS, overlap=None):
+    """
+    Split a document into chunks of whole sentences.
+
+    Consecutive chunks repeat up to `overlap` characters of trailing
+    sentences so entities near a boundary are seen with their context.
+
+    Args:
+        text (str): Document text
+        max_characters (int): Maximum characters per chunk
+        overlap (int): Maximum characters shared by consecutive chunks, defaults to config
+
+    Returns:
+        list: (offset, chunk_text) pairs; a single chunk for short documents
+
+    Raises:
+        ValueError: If the overlap leaves no room for new text in each chunk
+    """
+    if len(text) <= max_characters:
+        return [(0, text)]
+    if overlap is None:
+        overlap = get_settings()['CHUNK_OVERLAP_CHARACTERS']
+    if overlap * 2 >= max_characters:
+        raise ValueError("overlap must be less than half of max_characters")
+
+    spans = []
+    for start, end in sentence_spans(text):
+        spans.extend(_split_long_span(text, start, end, max_characters))
+
+    chunks = []
+    first = 0
+    while True:
+        start = spans[first][0]
+        last = first
+        while last + 1 < len(spans) and spans[last + 1][1] - start <= max_characters:
+            last += 1
+        end = spans[last][1]
+        chunks.append((start, text[start:end]))
+        if last == len(spans) - 1:
+            return chunks
+        # Start the next chunk with the trailing sentences that fit in the overlap
+        following_end = spans[last + 1][1]
+        next_first = last + 1
+        while (next_first - 1 > first and end - spans[next_first - 1][0] <= overlap
+               and following_end - spans[next_first - 1][0] <= max_characters):
+            next_first -= 1
+        first = next_first
+
+def merge_entities(entities):
+    """
+    Merge entities found by overlapping chunks.
+
+    Overlapping entities of the same category are one entity seen twice,
+    possibly cut short at a chunk edge: the longer span (then the higher
+    confidence) is kept.
+
+    Args:
+        entities (iterable): Entities with offsets in the original document
+
+    Returns:
+        list: Entities ordered by offset
+    """
+    merged = []
+    last_by_category = {}
+    for entity in sorted(entities, key=lambda entity: (entity.offset, -entity.length)):
+        position = last_by_category.get(entity.category)
+        if position is not None:
+            previous = merged[position]
+            if entity.offset < previous.offset + previous.length:
+                if (entity.length, entity.confidence_score) > (previous.length, previous.confidence_score):
+                    merged[position] = entity
+                continue
+        last_by_category[entity.category] = len(merged)
+        merged.append(entity)
+    return merged
+
+def _shift(entity, offset):
+    entity = copy.copy(entity)
+    entity.offset += offset
+    return entity
+
+def merge_chunk_results(operation, document_id, text, chunks, results):
+    """
+    Combine the results of a document's chunks into one result.
+
+    Args:
+        operation (str): One of CHUNKED_OPERATIONS
+        document_id (str): Id of the original document
+        text (str): Original document text
+        chunks (list): (offset, chunk_text) pairs from split_document()
+        results (list): Service result for each chunk
+
+    Returns:
+        Result or DocumentError for the whole document; the first chunk
+        error fails the document
+    """
+    for result in results:
+        if result.is_error:
+            return relabel_result(result, document_id)
+    if len(results) == 1:
+        return relabel_result(results[0], document_id)
+
+    from azure.ai.textanalytics import (
+        ExtractKeyPhrasesResult,
+        RecognizeEntitiesResult,
+        RecognizePiiEntitiesResult
+    )
+    warnings = [warning for result in results for warning in result.warnings]
+    if operation == "extract_key_phrases":
+        seen = set()
+        key_phrases = []
+        for result in results:
+            for phrase in result.key_phrases:
+                if phrase.lower() not in seen:
+                    seen.add(phrase.lower())
+                    key_phrases.append(phrase)
+        return ExtractKeyPhrasesResult(id=document_id, key_phrases=key_phrases,
+                                       warnings=warnings, statistics=None, is_error=False)
+
+    entities = merge_entities(
+        _shift(entity, offset)
+        for (offset, _), result in zip(chunks, results) for entity in result.entities
+    )
+    if operation == "recognize_pii_entities":
+        return RecognizePiiEntitiesResult(id=document_id, entities=entities,
+                                          redacted_text=mask_entities(text, entities),
+                                          warnings=warnings, statistics=None, is_error=False)
+    return RecognizeEntitiesResult(id=document_id, entities=entities,
+                                   warnings=warnings, statistics=None, is_error=False)
+
+def _analyze_chunk_window(operation, window, max_characters, overlap, concurrency, client, options):
+    plans = []
+    chunk_documents = []
+    for index, document in window:
+        text = document_text(document)
+        chunks = split_document(text, max_characters, overlap)
+        language = document_language(document, {})
+        plans.append((document_id(prepare_document(index, document)), text, chunks, len(chunk_documents)))
+        for number, (_, chunk_text) in enumerate(chunks):
+            chunk = {"id": f"{index}.{number}", "text": chunk_text}
+            if language:
+                chunk["language"] = language
+            chunk_documents.append(chunk)
+
+    # All chunks go through one dispatch, so repeated chunks are deduplicated and
+    # looked up in the cache once before the batches are sent in parallel
+    chunk_results = analyze_batched(operation, chunk_documents, client=client,
+                                    concurrency=concurrency, **options)
+
+    return [
+        merge_chunk_results(operation, doc_id, text, chunks,
+                            chunk_results[first:first + len(chunks)])
+        for doc_id, text, chunks, first in plans
+    ]
+
+def iter_chunked(operation, documents, client=None, max_characters=MAX_DOCUMENT_CHARACTERS,
+                 overlap=None, concurrency=None, **kwargs):
+    """
+    Run an entity, PII or key-phrase operation over documents of any length.
+
+    Args:
+        operation (str): One of CHUNKED_OPERATIONS
+        documents (iterable): Documents to analyze
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        max_characters (int): Maximum characters per chunk
+        overlap (int): Characters shared by consecutive chunks, defaults to config
+        concurrency (int): Batches of chunks in flight at once, defaults to config
+        **kwargs: Passed through to analyze_batched
+
+    Yields:
+        One result per input document with offsets into the original text, in input order
+
+    Raises:
+        ValueError: If the operation cannot be chunked
+    """
+    if operation not in CHUNKED_OPERATIONS:
+        raise ValueError(f"Operation does not support chunking: {operation}")
+    if concurrency is None:
+        concurrency = get_settings()['MAX_CONCURRENT_REQUESTS']
+
+    indexed = enumerate(documents)
+    while True:
+        window = list(islice(indexed, DISPATCH_WINDOW))
+        if not window:
+            break
+        yield from _analyze_chunk_window(operation, window, max_characters, overlap,
+                                         concurrency, client, kwargs)
+
+def analyze_chunked(operation, documents, client=None, **kwargs):
+    """
+    Run an entity, PII or key-phrase operation over documents of any length.
+
+    Returns:
+        list: One result per input document, in input order
+    """
+    return list(iter_chunked(operation, documents, client=client, **kwargs))
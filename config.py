@@ -3,11 +3,20 @@ Configuration module for Azure AI Language Service
 Handles loading and validating environment variables for secure credential management.
 """
 
+import atexit
+import functools
+import hashlib
 import os
-from dotenv import load_dotenv
+import threading
 
-# Load environment variables from .env file
-load_dotenv()
+# Importing this module has no side effects: the .env file is read, and the
+# settings below are parsed, the first time something actually needs them.
+
+@functools.lru_cache(maxsize=None)
+def load_environment():
+    """Load environment variables from the .env file, once per process."""
+    from dotenv import load_dotenv
+    load_dotenv()
 
 def get_language_credentials():
     """
@@ -19,6 +28,7 @@ def get_language_credentials():
     Raises:
         ValueError: If required environment variables are missing
     """
+    load_environment()
     endpoint = os.getenv('AZURE_LANGUAGE_ENDPOINT')
     key = os.getenv('AZURE_LANGUAGE_KEY')
     
@@ -30,6 +40,41 @@ def get_language_credentials():
     
     return endpoint, key
 
+def get_language_resources():
+    """
+    Get every configured Language Service resource for sharded dispatch.
+    
+    AZURE_LANGUAGE_ENDPOINTS and AZURE_LANGUAGE_KEYS hold comma-separated
+    lists of the same length; AZURE_LANGUAGE_WEIGHTS optionally gives each
+    resource a relative weight. Without them the single
+    AZURE_LANGUAGE_ENDPOINT/AZURE_LANGUAGE_KEY pair is used.
+    
+    Returns:
+        list: (endpoint, key, weight) tuples
+        
+    Raises:
+        ValueError: If the lists are missing or have different lengths, or a weight is not positive
+    """
+    load_environment()
+    endpoints = os.getenv('AZURE_LANGUAGE_ENDPOINTS')
+    if not endpoints:
+        endpoint, key = get_language_credentials()
+        return [(endpoint, key, 1.0)]
+    
+    endpoints = [value.strip() for value in endpoints.split(',') if value.strip()]
+    keys = [value.strip() for value in os.getenv('AZURE_LANGUAGE_KEYS', '').split(',') if value.strip()]
+    if len(keys) != len(endpoints):
+        raise ValueError("AZURE_LANGUAGE_KEYS must list one key per entry in AZURE_LANGUAGE_ENDPOINTS")
+    
+    weights = os.getenv('AZURE_LANGUAGE_WEIGHTS')
+    weights = [float(value) for value in weights.split(',')] if weights else [1.0] * len(endpoints)
+    if len(weights) != len(endpoints):
+        raise ValueError("AZURE_LANGUAGE_WEIGHTS must list one weight per entry in AZURE_LANGUAGE_ENDPOINTS")
+    if any(weight <= 0 for weight in weights):
+        raise ValueError("AZURE_LANGUAGE_WEIGHTS must be positive; remove a resource to stop using it")
+    
+    return list(zip(endpoints, keys, weights))
+
 def validate_environment():
     """
     Validate that all required environment variables are set.
@@ -45,16 +90,136 @@ def validate_environment():
         print("💡 Please check your .env file and ensure all required variables are set.")
         return False
 
+# Settings read from the environment: name -> (variable, default, parser)
+_SETTINGS = {}
+
+def _setting(name, variable, default=None, parse=None):
+    _SETTINGS[name] = (variable, default, parse)
+
+def _unless_false(value):
+    return value.lower() != 'false'
+
+def _only_true(value):
+    return value.lower() == 'true'
+
+def _names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+@functools.lru_cache(maxsize=None)
+def get_settings():
+    """
+    Read every environment-driven setting, once per process.
+    
+    The constants below that are declared with _setting() are module
+    attributes like any other (`from config import RATE_LIMIT_TPS` works),
+    but they are only parsed, after loading .env, on first access.
+    
+    Returns:
+        dict: Setting name -> parsed value
+    """
+    load_environment()
+    settings = {}
+    for name, (variable, default, parse) in _SETTINGS.items():
+        value = os.getenv(variable, default)
+        settings[name] = parse(value) if parse and value is not None else value
+    return settings
+
 # Configuration constants
 DEFAULT_LANGUAGE = "en"
+# Calls made for one request at most, the first attempt included
 MAX_RETRY_ATTEMPTS = 3
 REQUEST_TIMEOUT = 30
 
+# Client-side rate limiting and retry backoff (seconds)
+# AZURE_LANGUAGE_TPS should match the pricing tier (per resource); 0 means adapt to throttling only
+_setting('RATE_LIMIT_TPS', 'AZURE_LANGUAGE_TPS', '0', float)
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+
+# Connection pool settings for the shared TextAnalyticsClient instances
+_setting('CONNECTION_POOL_SIZE', 'AZURE_LANGUAGE_POOL_SIZE', '10', int)
+_setting('CONNECTION_KEEP_ALIVE', 'AZURE_LANGUAGE_KEEP_ALIVE', 'true', _unless_false)
+
+# Maximum number of in-flight requests in async (concurrent) mode
+_setting('MAX_CONCURRENT_REQUESTS', 'AZURE_LANGUAGE_CONCURRENCY', '8', int)
+
+# Process pool for CPU-heavy corpus runs: worker processes (0 = one per CPU)
+# and shards queued per worker ahead of the one it is working on
+_setting('WORKER_PROCESSES', 'AZURE_LANGUAGE_WORKERS', '0', int)
+_setting('WORKER_PREFETCH', 'AZURE_LANGUAGE_WORKER_PREFETCH', '2', int)
+
+# Micro-batching of concurrent single-document calls: longest a call waits for
+# company (milliseconds) and most documents per batch (0 = the operation's limit)
+_setting('MICRO_BATCH_MAX_WAIT_MS', 'AZURE_LANGUAGE_MICRO_BATCH_WAIT_MS', '10', float)
+_setting('MICRO_BATCH_MAX_SIZE', 'AZURE_LANGUAGE_MICRO_BATCH_SIZE', '0', int)
+
+# Result cache settings (set AZURE_LANGUAGE_CACHE_PATH to persist results across runs)
+_setting('RESULT_CACHE_ENABLED', 'AZURE_LANGUAGE_CACHE', 'true', _unless_false)
+_setting('RESULT_CACHE_SIZE', 'AZURE_LANGUAGE_CACHE_SIZE', '10000', int)
+_setting('RESULT_CACHE_TTL', 'AZURE_LANGUAGE_CACHE_TTL', '86400', float)
+_setting('RESULT_CACHE_PATH', 'AZURE_LANGUAGE_CACHE_PATH')
+
+# Deduplication of identical documents before dispatch
+# Whitespace policy: "exact", "strip" (ends only) or "collapse" (all runs)
+_setting('DEDUP_ENABLED', 'AZURE_LANGUAGE_DEDUP', 'true', _unless_false)
+_setting('DEDUP_WHITESPACE', 'AZURE_LANGUAGE_DEDUP_WHITESPACE', 'exact')
+_setting('DEDUP_IGNORE_CASE', 'AZURE_LANGUAGE_DEDUP_IGNORE_CASE', 'false', _only_true)
+
+# Circuit breaking for sharded multi-resource dispatch
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+
+# Service limits for synchronous requests
+# https://learn.microsoft.com/azure/ai-services/language-service/concepts/data-limits
+MAX_DOCUMENTS_PER_REQUEST = {
+    "detect_language": 1000,
+    "analyze_sentiment": 10,
+    "extract_key_phrases": 10,
+    "recognize_entities": 5,
+    "recognize_pii_entities": 5,
+    "recognize_linked_entities": 5
+}
+MAX_DOCUMENTS_PER_ACTIONS_JOB = 25
+MAX_DOCUMENT_CHARACTERS = 5120
+MAX_REQUEST_CHARACTERS = 125000
+
+# Long documents are split into chunks of at most MAX_DOCUMENT_CHARACTERS that share this much context
+_setting('CHUNK_OVERLAP_CHARACTERS', 'AZURE_LANGUAGE_CHUNK_OVERLAP', '200', int)
+
 # Supported languages for language detection
 SUPPORTED_LANGUAGES = [
     "en", "es", "fr", "de", "it", "pt", "ja", "ko", "zh", "ar", "hi", "ru"
 ]
 
+# Optional in-process language detection ahead of detect_language calls
+_setting('LOCAL_DETECTION_ENABLED', 'AZURE_LANGUAGE_LOCAL_DETECTION', 'false', _only_true)
+_setting('LOCAL_DETECTION_CONFIDENCE', 'AZURE_LANGUAGE_LOCAL_DETECTION_CONFIDENCE', '0.8', float)
+
+# Route sentiment/key-phrase/entity/PII batches by language with explicit hints
+_setting('LANGUAGE_ROUTING_ENABLED', 'AZURE_LANGUAGE_ROUTING', 'false', _only_true)
+_setting('LANGUAGE_ROUTING_REMOTE', 'AZURE_LANGUAGE_ROUTING_REMOTE', 'false', _only_true)
+
+# Local entity gazetteer file built by gazetteer.py, and how it combines with the
+# service: "local-only", "local-then-remote" or "merge"
+_setting('GAZETTEER_PATH', 'AZURE_LANGUAGE_GAZETTEER', '')
+_setting('GAZETTEER_MODE', 'AZURE_LANGUAGE_GAZETTEER_MODE', 'local-then-remote')
+
+# Collapse whitespace before sending (result offsets are mapped back to the raw
+# text); optionally strip quoted replies, signatures, disclaimers and footers too
+_setting('PAYLOAD_MINIMIZE', 'AZURE_LANGUAGE_MINIMIZE', 'false', _only_true)
+_setting('PAYLOAD_STRIP_BOILERPLATE', 'AZURE_LANGUAGE_STRIP_BOILERPLATE', 'false', _only_true)
+
+# PII redaction: "mask", "hash" or "placeholder"; "hash" requires a secret salt, which
+# keeps hashes from being reversed by lookup
+_setting('REDACTION_STRATEGY', 'AZURE_LANGUAGE_REDACTION_STRATEGY', 'mask')
+_setting('REDACTION_SALT', 'AZURE_LANGUAGE_REDACTION_SALT', '')
+
+# Extractive summarization: "auto" (service, local ranker as fallback), "service" or "local"
+_setting('SUMMARIZATION_MODE', 'AZURE_LANGUAGE_SUMMARIZATION', 'auto')
+
+# Comma-separated instrumentation sinks: histogram, prometheus, otel
+_setting('METRICS_SINKS', 'AZURE_LANGUAGE_METRICS', '', _names)
+
 def get_config_info():
     """
     Get configuration information for debugging.
@@ -63,6 +228,7 @@ def get_config_info():
         dict: Configuration information (without sensitive data)
     """
     endpoint, _ = get_language_credentials()
+    settings = get_settings()
     
     return {
         "endpoint": endpoint,
@@ -70,12 +236,107 @@ def get_config_info():
         "default_language": DEFAULT_LANGUAGE,
         "max_retry_attempts": MAX_RETRY_ATTEMPTS,
         "request_timeout": REQUEST_TIMEOUT,
-        "supported_languages": len(SUPPORTED_LANGUAGES)
+        "rate_limit_tps": settings['RATE_LIMIT_TPS'],
+        "connection_pool_size": settings['CONNECTION_POOL_SIZE'],
+        "connection_keep_alive": settings['CONNECTION_KEEP_ALIVE'],
+        "max_concurrent_requests": settings['MAX_CONCURRENT_REQUESTS'],
+        "worker_processes": settings['WORKER_PROCESSES'] or os.cpu_count(),
+        "micro_batch_max_wait_ms": settings['MICRO_BATCH_MAX_WAIT_MS'],
+        "result_cache_enabled": settings['RESULT_CACHE_ENABLED'],
+        "result_cache_persistent": bool(settings['RESULT_CACHE_PATH']),
+        "dedup_enabled": settings['DEDUP_ENABLED'],
+        "local_language_detection": settings['LOCAL_DETECTION_ENABLED'],
+        "language_routing": settings['LANGUAGE_ROUTING_ENABLED'],
+        "entity_gazetteer": settings['GAZETTEER_MODE'] if settings['GAZETTEER_PATH'] else None,
+        "payload_minimize": settings['PAYLOAD_MINIMIZE'],
+        "redaction_strategy": settings['REDACTION_STRATEGY'],
+        "summarization_mode": settings['SUMMARIZATION_MODE'],
+        "metrics_sinks": settings['METRICS_SINKS'],
+        "supported_languages": len(SUPPORTED_LANGUAGES),
+        "resources": len(get_language_resources())
     }
 
+# Shared client registry: one client per (endpoint, key) for the whole process
+_clients = {}
+_clients_lock = threading.Lock()
+_close_at_exit = False
+
+def _create_client(endpoint, key):
+    """Build a TextAnalyticsClient backed by a pooled, keep-alive HTTP session."""
+    import requests
+    from azure.ai.textanalytics import TextAnalyticsClient
+    from azure.core.credentials import AzureKeyCredential
+    from azure.core.pipeline.transport import RequestsTransport
+
+    settings = get_settings()
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=settings['CONNECTION_POOL_SIZE'],
+        pool_maxsize=settings['CONNECTION_POOL_SIZE']
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if settings['CONNECTION_KEEP_ALIVE'] else "close"
+
+    transport = RequestsTransport(
+        session=session,
+        session_owner=True,
+        connection_timeout=REQUEST_TIMEOUT,
+        read_timeout=REQUEST_TIMEOUT
+    )
+    # Retries are handled by rate_limiter.RequestScheduler, not the SDK pipeline
+    return TextAnalyticsClient(
+        endpoint=endpoint,
+        credential=AzureKeyCredential(key),
+        transport=transport,
+        retry_total=0
+    )
+
+def get_text_analytics_client(endpoint=None, key=None):
+    """
+    Get the shared TextAnalyticsClient for an endpoint and key.
+    
+    Clients are created once per (endpoint, key) pair and reused by every
+    caller in the process, so the HTTP connection pool and TLS sessions are
+    shared instead of being rebuilt for each analysis call.
+    
+    Args:
+        endpoint (str): Service endpoint, defaults to AZURE_LANGUAGE_ENDPOINT
+        key (str): Service key, defaults to AZURE_LANGUAGE_KEY
+        
+    Returns:
+        TextAnalyticsClient: Shared client instance
+    """
+    if endpoint is None or key is None:
+        endpoint, key = get_language_credentials()
+    
+    global _close_at_exit
+    registry_key = (endpoint, hashlib.sha256(key.encode("utf-8")).hexdigest())
+    with _clients_lock:
+        client = _clients.get(registry_key)
+        if client is None:
+            if not _close_at_exit:
+                atexit.register(close_clients)
+                _close_at_exit = True
+            client = _create_client(endpoint, key)
+            _clients[registry_key] = client
+    return client
+
+def close_clients():
+    """Close every shared client and release its connection pool."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
 # Legacy support for older config format
 class LanguageConfig:
     def __init__(self):
+        load_environment()
         # Azure AI Language Service endpoint and key
         self.endpoint = os.getenv('AZURE_LANGUAGE_ENDPOINT')
         self.key = os.getenv('AZURE_LANGUAGE_KEY')
@@ -91,5 +352,15 @@ class LanguageConfig:
             'key': self.key
         }
 
-# Create a global config instance
-config = LanguageConfig()
+def __getattr__(name):
+    """Resolve environment-driven settings and the legacy config instance on first access."""
+    if name in _SETTINGS:
+        return get_settings()[name]
+    if name == "config":
+        # Created on first use so that importing this module never raises
+        value = globals()["config"] = LanguageConfig()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_SETTINGS) | {"config"})
@@ -0,0 +1,457 @@
+"""
+Streaming Corpus Pipeline for Azure AI Language Service
+Streams documents from JSONL, JSON, CSV, TSV or plain-text files through the chosen
+analysis operations and writes results incrementally, with checkpoint/resume.
+
+Usage:
+    python corpus_pipeline.py reviews.jsonl --operations sentiment,entities \
+        --output results.jsonl --checkpoint results.ckpt
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from functools import partial
+from itertools import islice
+
+from batching import DISPATCH_WINDOW, analyze_batched, operation_sender
+from chunking import CHUNKED_OPERATIONS, analyze_chunked
+from manifest import AnalysisManifest, IncrementalStats, content_hash, current_model_version
+from worker_pool import WorkerPool, iter_shards
+
+# Operation name on the command line -> client operation
+OPERATIONS = {
+    "sentiment": "analyze_sentiment",
+    "key_phrases": "extract_key_phrases",
+    "entities": "recognize_entities",
+    "pii": "recognize_pii_entities",
+    "language": "detect_language"
+}
+
+# analyze_batched/analyze_chunked keywords that change how documents are sent, not their results
+DISPATCH_OPTIONS = (
+    "client", "scheduler", "cache", "dedup", "dedup_stats", "local_detector", "router", "gazetteer",
+    "minimizer", "max_documents", "max_characters", "overlap", "concurrency"
+)
+
+def _make_record(number, text, record_id=None, language=None):
+    return {
+        "number": number,
+        "id": str(record_id) if record_id not in (None, "") else str(number),
+        "text": text,
+        "language": language or None
+    }
+
+def read_jsonl(path, text_field="text", id_field="id", language_field="language", skip=0):
+    """
+    Stream records from a JSONL file, one JSON object (or string) per line.
+
+    Args:
+        path (str): Input file
+        text_field (str): Key holding the document text
+        id_field (str): Key holding the document id
+        language_field (str): Key holding an optional language hint
+        skip (int): Number of leading records to skip without parsing
+
+    Yields:
+        dict: Records with number, id, text and language
+    """
+    with open(path, encoding="utf-8") as handle:
+        lines = (line for line in handle if line.strip())
+        for number, line in enumerate(islice(lines, skip, None), start=skip):
+            item = json.loads(line)
+            if isinstance(item, str):
+                yield _make_record(number, item)
+            else:
+                yield _make_record(number, item.get(text_field, ""), item.get(id_field),
+                                   item.get(language_field))
+
+def read_json(path, text_field="text", id_field="id", language_field="language", skip=0):
+    """
+    Read records from a JSON file holding an array of objects (or strings).
+
+    Unlike the other readers this loads the whole array before the first
+    record is yielded, so convert large corpora to JSONL.
+    """
+    with open(path, encoding="utf-8") as handle:
+        items = json.load(handle)
+    if not isinstance(items, list):
+        raise ValueError(f"{path} must hold a JSON array of documents")
+    for number, item in enumerate(items[skip:], start=skip):
+        if isinstance(item, str):
+            yield _make_record(number, item)
+        else:
+            yield _make_record(number, item.get(text_field, ""), item.get(id_field),
+                               item.get(language_field))
+
+def read_csv(path, text_field="text", id_field="id", language_field="language", skip=0, delimiter=","):
+    """Stream records from a CSV file with a header row."""
+    with open(path, encoding="utf-8", newline="") as handle:
+        rows = csv.DictReader(handle, delimiter=delimiter)
+        for number, row in enumerate(islice(rows, skip, None), start=skip):
+            yield _make_record(number, row.get(text_field) or "", row.get(id_field),
+                               row.get(language_field))
+
+def read_text(path, skip=0, **_):
+    """Stream records from a plain-text file, one document per non-empty line."""
+    with open(path, encoding="utf-8") as handle:
+        lines = (line.rstrip("\n") for line in handle if line.strip())
+        for number, line in enumerate(islice(lines, skip, None), start=skip):
+            yield _make_record(number, line)
+
+READERS = {
+    "jsonl": read_jsonl,
+    "json": read_json,
+    "csv": read_csv,
+    "tsv": partial(read_csv, delimiter="\t"),
+    "txt": read_text
+}
+
+def detect_format(path):
+    """Guess the input format from the file extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension in ("json", "csv", "tsv"):
+        return extension
+    return "txt"
+
+def to_serializable(value):
+    """Convert SDK result objects into JSON-serializable structures."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [to_serializable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_serializable(item) for key, item in value.items()}
+    if hasattr(value, "__dict__"):
+        return {
+            key: to_serializable(item)
+            for key, item in vars(value).items() if not key.startswith("_")
+        }
+    return str(value)
+
+def _document_for(record, operation):
+    document = {"id": str(record["number"]), "text": record["text"]}
+    # detect_language takes a country hint rather than a language hint
+    if record["language"] and operation != "detect_language":
+        document["language"] = record["language"]
+    return document
+
+def _analyze_incremental(operation, chunk, documents, manifest, model_version, stats, kwargs):
+    """Serve unchanged documents from the manifest and dispatch the rest."""
+    analyze = analyze_chunked if operation in CHUNKED_OPERATIONS else analyze_batched
+    options = {key: value for key, value in kwargs.items() if key not in DISPATCH_OPTIONS}
+    digests = [content_hash(operation, document["text"], document, options) for document in documents]
+    stored = manifest.lookup(operation, [record["id"] for record in chunk])
+
+    results = [None] * len(chunk)
+    pending = []
+    new = changed = stale = 0
+    for position, (record, digest) in enumerate(zip(chunk, digests)):
+        entry = stored.get(record["id"])
+        if entry is None:
+            new += 1
+        elif entry[0] != digest:
+            changed += 1
+        elif entry[1] != model_version:
+            stale += 1
+        else:
+            results[position] = entry[2]
+            continue
+        pending.append(position)
+
+    if pending:
+        if model_version != "latest":
+            # Pin the resolved version so the result cache, keyed on the requested
+            # version, never serves results of another model for "latest"
+            kwargs = dict(kwargs, model_version=model_version)
+        fresh = analyze(operation, [documents[position] for position in pending], **kwargs)
+        entries = []
+        for position, result in zip(pending, fresh):
+            results[position] = to_serializable(result)
+            if not result.is_error:
+                entries.append((chunk[position]["id"], digests[position], model_version, results[position]))
+        manifest.update(operation, entries)
+    if stats is not None:
+        stats.record(len(chunk), len(chunk) - len(pending), new, changed, stale)
+    return results
+
+def analyze_records(records, operations, chunk_size=DISPATCH_WINDOW, manifest=None,
+                    incremental_stats=None, **kwargs):
+    """
+    Run operations over a record stream a chunk at a time.
+
+    Memory stays bounded by chunk_size no matter how large the input is.
+    Entity, PII and key-phrase operations go through the chunker, so
+    documents over the per-document limit are analyzed whole.
+
+    With a manifest, only documents whose id is new, whose content hash
+    changed or whose stored result came from another model version are
+    sent; the rest are served from the manifest. The model version is the
+    pinned model_version option, or what the service reports for "latest".
+
+    Args:
+        records (iterable): Records from one of the readers
+        operations (list): Operation names from OPERATIONS
+        chunk_size (int): Records analyzed together
+        manifest (AnalysisManifest): Results of previous runs, keyed by record id
+        incremental_stats (IncrementalStats): Accumulates reused and dispatched counts
+        **kwargs: Passed through to analyze_batched
+
+    Yields:
+        list: Output rows for each chunk, in input order
+    """
+    model_versions = {}
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        rows = [{"id": record["id"]} for record in chunk]
+        for name in operations:
+            operation = OPERATIONS[name]
+            documents = [_document_for(record, operation) for record in chunk]
+            if manifest is None:
+                analyze = analyze_chunked if operation in CHUNKED_OPERATIONS else analyze_batched
+                results = [to_serializable(result) for result in analyze(operation, documents, **kwargs)]
+            else:
+                if operation not in model_versions:
+                    requested = kwargs.get("model_version") or "latest"
+                    if requested == "latest":
+                        send = operation_sender(operation, kwargs.get("client"), kwargs.get("scheduler"))
+                        requested = current_model_version(operation, send) or requested
+                    model_versions[operation] = requested
+                results = _analyze_incremental(operation, chunk, documents, manifest,
+                                               model_versions[operation], incremental_stats, kwargs)
+            for row, result in zip(rows, results):
+                row[name] = result
+        yield rows
+
+def analyze_shard(records, operations, **kwargs):
+    """Analyze one shard of records in a worker process and return its output rows."""
+    return [row for rows in analyze_records(records, operations, len(records) or 1, **kwargs) for row in rows]
+
+class JsonlSink:
+    """Append-only JSONL writer whose state is the byte offset of the last flush."""
+
+    def __init__(self, path, state=None):
+        self.path = path
+        mode = "r+b" if state is not None and os.path.exists(path) else "wb"
+        self._handle = open(path, mode)
+        if state is not None and mode == "r+b":
+            # Drop anything written after the last checkpoint
+            self._handle.truncate(state)
+            self._handle.seek(state)
+
+    def write(self, rows):
+        for row in rows:
+            self._handle.write(json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def flush(self):
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        return self._handle.tell()
+
+    def close(self):
+        state = self.flush()
+        self._handle.close()
+        return state
+
+class ParquetSink:
+    """
+    Parquet writer producing one part file per checkpoint interval.
+
+    Operation results are stored as JSON strings, one column per operation.
+    The state is the number of completed part files in the output directory.
+    """
+
+    def __init__(self, path, state=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._parts = state or 0
+        # Remove parts written after the last checkpoint
+        for name in os.listdir(path):
+            if name.startswith("part-") and int(name[5:10]) >= self._parts:
+                os.remove(os.path.join(path, name))
+        self._writer = None
+
+    def write(self, rows):
+        if not rows:
+            return
+        columns = {key: [] for key in rows[0]}
+        for row in rows:
+            for key, values in columns.items():
+                value = row.get(key)
+                values.append(value if key == "id" else json.dumps(value, ensure_ascii=False))
+        table = self._pa.table(columns)
+        if self._writer is None:
+            part = os.path.join(self.path, f"part-{self._parts:05d}.parquet")
+            self._writer = self._pq.ParquetWriter(part, table.schema)
+        self._writer.write_table(table)
+
+    def flush(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._parts += 1
+        return self._parts
+
+    def close(self):
+        return self.flush()
+
+SINKS = {
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink
+}
+
+def load_checkpoint(path):
+    """Load a checkpoint file, or None if there is none."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+def save_checkpoint(path, records, sink_state):
+    """Atomically record how many input records have been written out."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump({"records": records, "sink_state": sink_state}, handle)
+    os.replace(temporary, path)
+
+def run_pipeline(input_path, output_path, operations, input_format=None, output_format=None,
+                 checkpoint_path=None, resume=False, chunk_size=DISPATCH_WINDOW,
+                 checkpoint_every=10, text_field="text", id_field="id",
+                 language_field="language", workers=1, prefetch=None, manifest_path=None,
+                 incremental_stats=None, **kwargs):
+    """
+    Stream an input corpus through the pipeline into an output file.
+
+    With workers other than 1, chunks are analyzed in a WorkerPool: each
+    worker process has its own client and does its own chunking and result
+    serialization, while this process reads, writes and checkpoints in
+    input order.
+
+    With manifest_path, the run is incremental: unchanged documents are
+    copied from the manifest into the output instead of being re-analyzed.
+
+    Args:
+        workers (int): Worker processes; 1 runs in-process, 0 uses config
+        prefetch (int): Chunks queued per worker, defaults to config
+        manifest_path (str): SQLite manifest for incremental runs
+        incremental_stats (IncrementalStats): Accumulates reused and dispatched counts
+
+    Returns:
+        int: Total number of records written, including resumed ones
+    """
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unsupported operations: {', '.join(unknown)}")
+
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or ("parquet" if output_path.endswith(".parquet") else "jsonl")
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    done = checkpoint["records"] if checkpoint else 0
+    sink = SINKS[output_format](output_path, checkpoint["sink_state"] if checkpoint else None)
+
+    records = READERS[input_format](
+        input_path, text_field=text_field, id_field=id_field,
+        language_field=language_field, skip=done
+    )
+    if manifest_path and workers != 1:
+        raise ValueError("Incremental runs use a single process")
+    pool = manifest = None
+    if manifest_path:
+        manifest = AnalysisManifest(manifest_path)
+        chunks = analyze_records(records, operations, chunk_size, manifest, incremental_stats, **kwargs)
+    elif workers == 1:
+        chunks = analyze_records(records, operations, chunk_size, **kwargs)
+    else:
+        pool = WorkerPool(workers, prefetch)
+        chunks = pool.imap(partial(analyze_shard, operations=operations, **kwargs),
+                           iter_shards(records, chunk_size))
+    try:
+        for chunk_number, rows in enumerate(chunks, 1):
+            sink.write(rows)
+            done += len(rows)
+            if checkpoint_path and chunk_number % checkpoint_every == 0:
+                save_checkpoint(checkpoint_path, done, sink.flush())
+    finally:
+        state = sink.close()
+        if pool is not None:
+            pool.close()
+        if manifest is not None:
+            manifest.close()
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, done, state)
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a corpus through Azure AI Language Service")
+    parser.add_argument("input", help="Input file (.jsonl, .csv or plain text)")
+    parser.add_argument("--output", required=True, help="Output .jsonl file or .parquet directory")
+    parser.add_argument("--operations", default="sentiment",
+                        help=f"Comma-separated operations: {', '.join(OPERATIONS)}")
+    parser.add_argument("--input-format", choices=sorted(READERS))
+    parser.add_argument("--output-format", choices=sorted(SINKS))
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--language-field", default="language")
+    parser.add_argument("--chunk-size", type=int, default=DISPATCH_WINDOW)
+    parser.add_argument("--checkpoint", help="Checkpoint file for resuming interrupted runs")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="Chunks between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Resume from --checkpoint")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for chunking and result processing (0 = one per CPU)")
+    parser.add_argument("--prefetch", type=int, help="Chunks queued per worker")
+    parser.add_argument("--manifest", help="Manifest file; only new or changed documents are sent")
+    parser.add_argument("--invalidate", action="store_true",
+                        help="Drop the manifest's stored results for --operations before running")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+
+    if args.invalidate and not args.manifest:
+        parser.error("--invalidate requires --manifest")
+
+    operations = [name.strip() for name in args.operations.split(",") if name.strip()]
+    if args.invalidate:
+        with AnalysisManifest(args.manifest) as manifest:
+            dropped = sum(manifest.invalidate(OPERATIONS[name]) for name in operations if name in OPERATIONS)
+        print(f"🗑️ Invalidated {dropped} stored results")
+    stats = IncrementalStats() if args.manifest else None
+    try:
+        total = run_pipeline(
+            args.input, args.output, operations,
+            input_format=args.input_format, output_format=args.output_format,
+            checkpoint_path=args.checkpoint, resume=args.resume,
+            chunk_size=args.chunk_size, checkpoint_every=args.checkpoint_every,
+            text_field=args.text_field, id_field=args.id_field,
+            language_field=args.language_field, workers=args.workers, prefetch=args.prefetch,
+            manifest_path=args.manifest, incremental_stats=stats
+        )
+    except Exception as e:
+        print(f"❌ Pipeline failed: {str(e)}")
+        if args.checkpoint:
+            print("💡 Re-run with --resume to continue from the last checkpoint")
+        return 1
+
+    print(f"✅ Wrote {total} records to {args.output}")
+    if stats is not None:
+        print(f"♻️ Reused {stats.reused} of {stats.documents} results; sent {stats.new} new, "
+              f"{stats.changed} changed and {stats.stale} from an older model version")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
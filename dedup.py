@@ -0,0 +1,109 @@
+"""
+Document deduplication for Azure AI Language Service
+Sends each unique text once and fans the result back out to every position
+where it occurred, reporting how many calls and characters were saved.
+"""
+
+import re
+import threading
+
+from config import get_settings
+
+WHITESPACE_POLICIES = ("exact", "strip", "collapse")
+
+_whitespace_run = re.compile(r"\s+")
+
+class DedupPolicy:
+    """
+    Text normalization used to decide whether two documents are duplicates.
+    
+    Only the normalized form is compared; the first occurrence is sent to the
+    service unchanged. Note that non-exact policies fan out the offsets of the
+    first occurrence, so use "exact" when entity offsets must be precise.
+    
+    Args:
+        whitespace (str): "exact", "strip" (ends only) or "collapse" (all runs), defaults to config
+        ignore_case (bool): Compare texts case-insensitively, defaults to config
+    """
+
+    def __init__(self, whitespace=None, ignore_case=None):
+        settings = get_settings()
+        if whitespace is None:
+            whitespace = settings['DEDUP_WHITESPACE']
+        if ignore_case is None:
+            ignore_case = settings['DEDUP_IGNORE_CASE']
+        if whitespace not in WHITESPACE_POLICIES:
+            raise ValueError(f"Unsupported whitespace policy: {whitespace}")
+        self.whitespace = whitespace
+        self.ignore_case = ignore_case
+
+    def normalize(self, text):
+        """Apply the whitespace and case policy to a text."""
+        if self.whitespace == "strip":
+            text = text.strip()
+        elif self.whitespace == "collapse":
+            text = _whitespace_run.sub(" ", text).strip()
+        if self.ignore_case:
+            text = text.casefold()
+        return text
+
+    def key(self, text, language=None):
+        """Key under which duplicate documents collapse; language hints must match."""
+        return (language, self.normalize(text))
+
+class DedupStats:
+    """Running totals of what deduplication saved."""
+
+    def __init__(self):
+        self.documents = 0
+        self.unique_documents = 0
+        self.characters = 0
+        self.unique_characters = 0
+        self.calls = 0
+        self.calls_without_dedup = 0
+        self._lock = threading.Lock()
+
+    def record(self, documents, unique_documents, characters, unique_characters,
+               calls, calls_without_dedup):
+        """Add the counts for one dispatched window."""
+        with self._lock:
+            self.documents += documents
+            self.unique_documents += unique_documents
+            self.characters += characters
+            self.unique_characters += unique_characters
+            self.calls += calls
+            self.calls_without_dedup += calls_without_dedup
+
+    @property
+    def documents_saved(self):
+        return self.documents - self.unique_documents
+
+    @property
+    def characters_saved(self):
+        return self.characters - self.unique_characters
+
+    @property
+    def calls_saved(self):
+        return self.calls_without_dedup - self.calls
+
+    def as_dict(self):
+        """Counters as a plain dictionary for logging."""
+        return {
+            "documents": self.documents,
+            "unique_documents": self.unique_documents,
+            "documents_saved": self.documents_saved,
+            "characters_saved": self.characters_saved,
+            "calls": self.calls,
+            "calls_saved": self.calls_saved
+        }
+
+def get_dedup_policy():
+    """
+    Get the deduplication policy configured in config.py.
+    
+    Returns:
+        DedupPolicy: Default policy, or None if deduplication is disabled
+    """
+    if not get_settings()['DEDUP_ENABLED']:
+        return None
+    return DedupPolicy()
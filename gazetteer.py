@@ -0,0 +1,428 @@
+"""
+Local entity gazetteer for Azure AI Language Service
+Learns known entities from past recognize_entities results into a compact,
+memory-mapped Aho-Corasick automaton that tags them in one pass over the text.
+
+Usage:
+    python gazetteer.py results.jsonl --output entities.gaz
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+from config import get_settings
+from local_language import LATIN_STOPWORDS
+
+MODES = ("local-only", "local-then-remote", "merge")
+
+# Categories whose mentions mean the same thing wherever they appear; dates,
+# quantities and the like depend on context and are left to the service
+GAZETTEER_CATEGORIES = ("Person", "PersonType", "Location", "Organization", "Event", "Product", "Skill")
+
+MAGIC = b"AZGZ"
+VERSION = 2
+# magic, version, states, edges, entries, label bytes, entry bytes; labels are
+# stored apart from the entries so tagging never has to parse the entry list
+HEADER = struct.Struct("<4sIIIIII")
+
+_STOPWORDS = frozenset(word for words in LATIN_STOPWORDS.values() for word in words)
+_word = re.compile(r"\w+")
+_sentence_start = re.compile(r"(?:^|[.!?:]\s+)[\"'(\[]*(\w)")
+
+def _entity_fields(entity):
+    """text, category, subcategory, confidence from a CategorizedEntity or its serialized form."""
+    if isinstance(entity, dict):
+        return (entity.get("text"), entity.get("category"), entity.get("subcategory"),
+                entity.get("confidence_score", entity.get("confidenceScore", 1.0)))
+    return entity.text, entity.category, entity.subcategory, entity.confidence_score
+
+class GazetteerBuilder:
+    """
+    Collects entity mentions and writes them out as a gazetteer file.
+
+    A text seen with several categories keeps the one it was given most
+    often.
+
+        builder = GazetteerBuilder()
+        builder.add_results(analyze_batched("recognize_entities", documents))
+        builder.save("entities.gaz")
+
+    Args:
+        categories (iterable): Entity categories to learn, None for all
+        min_confidence (float): Ignore mentions the service was less sure of
+        min_count (int): Mentions a text needs before it is written out
+    """
+
+    def __init__(self, categories=GAZETTEER_CATEGORIES, min_confidence=0.8, min_count=1):
+        self.categories = None if categories is None else frozenset(categories)
+        self.min_confidence = min_confidence
+        self.min_count = min_count
+        self._votes = {}
+
+    def add(self, text, category, subcategory=None, confidence=1.0, count=1):
+        """Record one (or count) mentions of an entity; returns whether it was kept."""
+        text = (text or "").strip()
+        if (len(text) < 2 or not any(character.isalpha() for character in text)
+                or confidence < self.min_confidence
+                or (self.categories is not None and category not in self.categories)):
+            return False
+        votes = self._votes.setdefault(text, {}).setdefault((category, subcategory), [0, 0.0])
+        votes[0] += count
+        votes[1] += confidence * count
+        return True
+
+    def add_results(self, results):
+        """
+        Record every entity of recognize_entities results.
+
+        Args:
+            results (iterable): RecognizeEntitiesResult objects or their
+                serialized dictionaries, as written by corpus_pipeline.py;
+                errors are skipped
+        """
+        for result in results:
+            if isinstance(result, dict):
+                if result.get("is_error") or "entities" not in result:
+                    continue
+                entities = result["entities"]
+            elif result.is_error:
+                continue
+            else:
+                entities = result.entities
+            for entity in entities:
+                self.add(*_entity_fields(entity))
+
+    def add_gazetteer(self, gazetteer):
+        """Carry over the entries of an existing gazetteer, with their counts."""
+        for text, category, subcategory, confidence, count in gazetteer.entries():
+            self.add(text, category, subcategory, confidence, count)
+
+    def __len__(self):
+        return len(self._votes)
+
+    def save(self, path):
+        """
+        Build the automaton and write it atomically.
+
+        Returns:
+            int: Number of entities written
+        """
+        labels, label_ids, entries = [], {}, []
+        for text, votes in sorted(self._votes.items()):
+            label, (count, total) = max(votes.items(), key=lambda item: item[1][0])
+            if count < self.min_count:
+                continue
+            if label not in label_ids:
+                label_ids[label] = len(labels)
+                labels.append(list(label))
+            entries.append([text, label_ids[label], round(total / count, 4), count])
+
+        # Trie: children per state, then fail links breadth first
+        children, output, confidence, depth = [{}], [-1], [0.0], [0]
+        for text, label, mean_confidence, _ in entries:
+            state = 0
+            for character in text:
+                code = ord(character)
+                child = children[state].get(code)
+                if child is None:
+                    child = children[state][code] = len(children)
+                    children.append({})
+                    output.append(-1)
+                    confidence.append(0.0)
+                    depth.append(depth[state] + 1)
+                state = child
+            output[state] = label
+            confidence[state] = mean_confidence
+
+        states = len(children)
+        fail, suffix = [0] * states, [-1] * states
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            for code, child in children[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and code not in children[fallback]:
+                    fallback = fail[fallback]
+                target = children[fallback].get(code, 0)
+                fail[child] = target if target != child else 0
+                suffix[child] = fail[child] if output[fail[child]] >= 0 else suffix[fail[child]]
+
+        edge_start, edge_char, edge_target = array("I", [0]), array("I"), array("I")
+        for state_children in children:
+            for code in sorted(state_children):
+                edge_char.append(code)
+                edge_target.append(state_children[code])
+            edge_start.append(len(edge_char))
+
+        label_bytes = json.dumps(labels, ensure_ascii=False).encode("utf-8")
+        entry_bytes = json.dumps(entries, ensure_ascii=False).encode("utf-8")
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(HEADER.pack(MAGIC, VERSION, states, len(edge_char), len(entries),
+                                     len(label_bytes), len(entry_bytes)))
+            for values in (edge_start, edge_char, edge_target, array("I", fail), array("i", output),
+                           array("i", suffix), array("I", depth), array("f", confidence)):
+                values.tofile(handle)
+            handle.write(label_bytes)
+            handle.write(entry_bytes)
+        os.replace(temporary, path)
+        return len(entries)
+
+class EntityGazetteer:
+    """
+    Memory-mapped gazetteer that tags known entities locally.
+
+    The automaton is read straight from the mapped file, so loading is
+    instant and worker processes share its pages. Matching is
+    case-sensitive and keeps the leftmost longest match at word boundaries.
+
+    Modes decide how it combines with the service in batching.iter_analyzed:
+    "local-only" answers every recognize_entities document locally;
+    "local-then-remote" answers documents without unknown names locally and
+    sends the rest; "merge" sends everything and adds gazetteer matches the
+    service did not return.
+
+    Args:
+        path (str): Gazetteer file written by GazetteerBuilder.save()
+        mode (str): "local-only", "local-then-remote" or "merge", defaults to config
+
+    Raises:
+        ValueError: If the file is not a gazetteer or the mode is not supported
+    """
+
+    def __init__(self, path, mode=None):
+        self.mode = mode or get_settings()['GAZETTEER_MODE']
+        if self.mode not in MODES:
+            raise ValueError(f"Unsupported gazetteer mode: {self.mode}")
+        self.path = path
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, states, edges, entries, label_bytes, entry_bytes = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a gazetteer file: {path}")
+
+        self._views = []
+        position = HEADER.size
+        for name, code, length in (("_edge_start", "I", states + 1), ("_edge_char", "I", edges),
+                                   ("_edge_target", "I", edges), ("_fail", "I", states),
+                                   ("_output", "i", states), ("_suffix", "i", states),
+                                   ("_depth", "I", states), ("_confidence", "f", states)):
+            view = memoryview(self._mmap)[position:position + 4 * length].cast(code)
+            self._views.append(view)
+            setattr(self, name, view)
+            position += 4 * length
+        self._label_span = (position, position + label_bytes)
+        self._entry_span = (position + label_bytes, position + label_bytes + entry_bytes)
+        self._labels = None
+        self._entries = entries
+        self.states = states
+
+    @property
+    def labels(self):
+        """(category, subcategory) per label id, read on first use."""
+        if self._labels is None:
+            start, end = self._label_span
+            self._labels = [tuple(label) for label in json.loads(self._mmap[start:end].decode("utf-8"))]
+        return self._labels
+
+    def entries(self):
+        """
+        Every stored entity.
+
+        Returns:
+            list: (text, category, subcategory, confidence, count) tuples
+        """
+        start, end = self._entry_span
+        labels = self.labels
+        return [(text, *labels[label], confidence, count)
+                for text, label, confidence, count in json.loads(self._mmap[start:end].decode("utf-8"))]
+
+    def __len__(self):
+        return self._entries
+
+    def __bool__(self):
+        # An empty gazetteer is still a configured one
+        return True
+
+    def find(self, text):
+        """
+        Find known entities in one pass over the text.
+
+        Returns:
+            list: (offset, length, state) per match, in text order, without overlaps
+        """
+        starts, chars, targets = self._edge_start, self._edge_char, self._edge_target
+        fail, output, suffix, depth = self._fail, self._output, self._suffix, self._depth
+        size = len(text)
+        candidates = []
+        state = 0
+        for end, character in enumerate(text, 1):
+            code = ord(character)
+            while True:
+                low, high = starts[state], starts[state + 1]
+                position = bisect_left(chars, code, low, high)
+                if position < high and chars[position] == code:
+                    state = targets[position]
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            hit = state if output[state] >= 0 else suffix[state]
+            while hit >= 0:
+                start = end - depth[hit]
+                if ((start == 0 or not text[start - 1].isalnum())
+                        and (end == size or not text[end].isalnum())):
+                    candidates.append((start, -depth[hit], hit))
+                hit = suffix[hit]
+
+        matches = []
+        covered = 0
+        for start, negative_length, hit in sorted(candidates):
+            if start >= covered:
+                matches.append((start, -negative_length, hit))
+                covered = start - negative_length
+        return matches
+
+    def _entities(self, text, matches):
+        from azure.ai.textanalytics import CategorizedEntity
+        labels = self.labels
+        return [
+            CategorizedEntity(text=text[offset:offset + length], category=labels[self._output[state]][0],
+                              subcategory=labels[self._output[state]][1], length=length, offset=offset,
+                              confidence_score=round(self._confidence[state], 2))
+            for offset, length, state in matches
+        ]
+
+    def tag(self, text, document_id="0"):
+        """Tag known entities; returns a RecognizeEntitiesResult."""
+        from azure.ai.textanalytics import RecognizeEntitiesResult
+        return RecognizeEntitiesResult(id=document_id, entities=self._entities(text, self.find(text)),
+                                       warnings=[], statistics=None, is_error=False)
+
+    def has_unknowns(self, text, matches=None):
+        """
+        Whether the text has capitalized words the gazetteer does not cover.
+
+        Sentence-initial words and stopwords do not count, so this flags
+        likely names rather than every capital letter.
+        """
+        if matches is None:
+            matches = self.find(text)
+        sentence_starts = {match.start(1) for match in _sentence_start.finditer(text)}
+        spans = iter(matches)
+        current = next(spans, None)
+        for word in _word.finditer(text):
+            start = word.start()
+            while current is not None and current[0] + current[1] <= start:
+                current = next(spans, None)
+            if current is not None and current[0] <= start:
+                continue
+            token = word.group()
+            if token[0].isupper() and start not in sentence_starts and token.lower() not in _STOPWORDS:
+                return True
+        return False
+
+    def resolve(self, text, document_id="0"):
+        """
+        Answer a recognize_entities document locally if the mode allows.
+
+        Returns:
+            RecognizeEntitiesResult: Local result, or None if the document should be sent
+        """
+        if self.mode == "merge":
+            return None
+        matches = self.find(text)
+        if self.mode == "local-then-remote" and self.has_unknowns(text, matches):
+            return None
+        from azure.ai.textanalytics import RecognizeEntitiesResult
+        return RecognizeEntitiesResult(id=document_id, entities=self._entities(text, matches),
+                                       warnings=[], statistics=None, is_error=False)
+
+    def merge(self, text, result):
+        """
+        Add gazetteer matches that do not overlap the service's entities.
+
+        Returns:
+            RecognizeEntitiesResult: A copy of the result; errors are returned unchanged
+        """
+        if result.is_error:
+            return result
+        taken = [(entity.offset, entity.offset + entity.length) for entity in result.entities]
+        extra = [
+            (offset, length, state) for offset, length, state in self.find(text)
+            if not any(start < offset + length and offset < end for start, end in taken)
+        ]
+        if not extra:
+            return result
+        import copy
+        merged = copy.copy(result)
+        merged.entities = sorted(result.entities + self._entities(text, extra),
+                                 key=lambda entity: entity.offset)
+        return merged
+
+    def close(self):
+        """Release the memory map."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_gazetteer = None
+
+def get_entity_gazetteer():
+    """
+    Get the gazetteer configured in config.py.
+
+    Returns:
+        EntityGazetteer: Shared gazetteer, or None if no gazetteer file is configured
+    """
+    global _default_gazetteer
+    path = get_settings()['GAZETTEER_PATH']
+    if not path:
+        return None
+    if _default_gazetteer is None:
+        _default_gazetteer = EntityGazetteer(path)
+    return _default_gazetteer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an entity gazetteer from corpus pipeline output")
+    parser.add_argument("inputs", nargs="+", help="JSONL output of corpus_pipeline.py with entities")
+    parser.add_argument("--output", required=True, help="Gazetteer file to write")
+    parser.add_argument("--update", action="store_true", help="Keep the entries already in --output")
+    parser.add_argument("--field", default="entities", help="Output column holding entity results")
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    parser.add_argument("--min-count", type=int, default=1)
+    parser.add_argument("--all-categories", action="store_true",
+                        help="Also learn context-dependent categories such as DateTime")
+    args = parser.parse_args(argv)
+
+    builder = GazetteerBuilder(None if args.all_categories else GAZETTEER_CATEGORIES,
+                               args.min_confidence, args.min_count)
+    if args.update and os.path.exists(args.output):
+        with EntityGazetteer(args.output, mode="merge") as existing:
+            builder.add_gazetteer(existing)
+    for path in args.inputs:
+        with open(path, encoding="utf-8") as handle:
+            builder.add_results(json.loads(line).get(args.field) or {} for line in handle if line.strip())
+    written = builder.save(args.output)
+    print(f"📚 Wrote {written} entities to {args.output} ({os.path.getsize(args.output):,} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
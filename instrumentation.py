@@ -0,0 +1,327 @@
+"""
+Call instrumentation for Azure AI Language Service
+Records wall time, queue wait, retries, batch size, characters and billable
+text records for every service call and fans them out to pluggable sinks:
+in-process histograms, Prometheus text format and OpenTelemetry spans.
+"""
+
+import bisect
+import math
+import threading
+
+from config import get_settings
+
+# One billable text record per started block of this many characters, per document
+CHARACTERS_PER_TEXT_RECORD = 1000
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+def _text_length(document):
+    if isinstance(document, str):
+        return len(document)
+    if isinstance(document, dict):
+        return len(document.get("text", ""))
+    return len(getattr(document, "text", "") or "")
+
+def billable_units(lengths):
+    """Text records billed for documents of these character lengths (at least one each)."""
+    return sum(max(1, math.ceil(length / CHARACTERS_PER_TEXT_RECORD)) for length in lengths)
+
+class CallRecord:
+    """
+    Measurements of one service call, retries included.
+
+    Attributes:
+        operation (str): Client method name
+        resource (str): Endpoint label of the scheduler that made the call, if any
+        started (float): Wall-clock start time (time.time())
+        wall_time (float): Seconds from entering the scheduler to the final outcome
+        queue_wait (float): Seconds spent waiting for the rate limiter
+        retries (int): Attempts after the first
+        documents (int): Documents in the batch
+        characters (int): Characters in the batch
+        billable_units (int): 1,000-character text records billed for the batch
+        error (str): Exception type name if the call failed, else None
+    """
+
+    __slots__ = ("operation", "resource", "started", "wall_time", "queue_wait", "retries",
+                 "documents", "characters", "billable_units", "error")
+
+    def __init__(self, operation, resource, started, wall_time, queue_wait, retries, batch, error):
+        lengths = [_text_length(document) for document in batch]
+        self.operation = operation
+        self.resource = resource
+        self.started = started
+        self.wall_time = wall_time
+        self.queue_wait = queue_wait
+        self.retries = retries
+        self.documents = len(lengths)
+        self.characters = sum(lengths)
+        self.billable_units = billable_units(lengths)
+        self.error = error
+
+    @property
+    def outcome(self):
+        return "error" if self.error else "success"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Histogram:
+    """Cumulative fixed-bucket histogram in the Prometheus style."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (inf past the last bucket)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+class HistogramSink:
+    """
+    In-process aggregation of call records per (operation, outcome).
+
+    Keeps latency, queue-wait and batch-size histograms plus counters for
+    requests, retries, documents, characters and billable units.
+    """
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        return {
+            "latency": Histogram(LATENCY_BUCKETS),
+            "queue_wait": Histogram(LATENCY_BUCKETS),
+            "batch_size": Histogram(BATCH_SIZE_BUCKETS),
+            "retries": 0,
+            "documents": 0,
+            "characters": 0,
+            "billable_units": 0
+        }
+
+    def record(self, call):
+        key = (call.operation, call.outcome)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._new_series()
+            series["latency"].observe(call.wall_time)
+            series["queue_wait"].observe(call.queue_wait)
+            series["batch_size"].observe(call.documents)
+            series["retries"] += call.retries
+            series["documents"] += call.documents
+            series["characters"] += call.characters
+            series["billable_units"] += call.billable_units
+
+    def summary(self):
+        """
+        Per-operation totals and latency percentiles.
+
+        Returns:
+            dict: operation -> requests, errors, retries, documents, characters,
+            billable_units, mean/p50/p95/p99 latency and mean queue wait
+        """
+        with self._lock:
+            summary = {}
+            for (operation, outcome), series in self._series.items():
+                entry = summary.setdefault(operation, {
+                    "requests": 0, "errors": 0, "retries": 0, "documents": 0,
+                    "characters": 0, "billable_units": 0
+                })
+                latency = series["latency"]
+                entry["requests"] += latency.count
+                if outcome == "error":
+                    entry["errors"] += latency.count
+                    continue
+                for name in ("retries", "documents", "characters", "billable_units"):
+                    entry[name] += series[name]
+                entry["mean_latency"] = latency.sum / latency.count
+                entry["mean_queue_wait"] = series["queue_wait"].sum / latency.count
+                for q in (50, 95, 99):
+                    entry[f"p{q}_latency"] = latency.percentile(q)
+            return summary
+
+class PrometheusSink(HistogramSink):
+    """
+    HistogramSink that renders the Prometheus text exposition format.
+
+    Scrape it with serve(), or write render() to a file for the node
+    exporter's textfile collector.
+    """
+
+    prefix = "azure_language"
+
+    def render(self):
+        """Current metrics in Prometheus text format."""
+        lines = []
+        with self._lock:
+            series = sorted(self._series.items())
+            for name, key, help_text in (
+                ("request_duration_seconds", "latency", "Service call wall time including retries"),
+                ("queue_wait_seconds", "queue_wait", "Time spent waiting for the rate limiter"),
+                ("batch_size_documents", "batch_size", "Documents per service call")
+            ):
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (operation, outcome), values in series:
+                    labels = f'operation="{operation}",outcome="{outcome}"'
+                    histogram = values[key]
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else repr(float(bound))
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+            for name, help_text in (
+                ("retries", "Retried attempts"),
+                ("documents", "Documents sent"),
+                ("characters", "Characters sent"),
+                ("billable_units", "Billable 1,000-character text records")
+            ):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for (operation, outcome), values in series:
+                    lines.append(f'{metric}{{operation="{operation}",outcome="{outcome}"}} {values[name]}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """
+        Serve /metrics from a background thread.
+
+        Only local scrapers can reach it by default; pass host="0.0.0.0" to
+        listen on every network interface.
+
+        Returns:
+            ThreadingHTTPServer: Call shutdown() to stop it
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                data = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+class OpenTelemetrySink:
+    """
+    Emits one OpenTelemetry span per service call.
+
+    Spans use the recorded start and end times, so they nest under whatever
+    span is current in the calling thread.
+
+    Args:
+        tracer: OpenTelemetry tracer, defaults to one named after this module
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("OpenTelemetry spans require opentelemetry-api: pip install opentelemetry-api")
+        self._status = trace.Status
+        self._status_code = trace.StatusCode
+        self.tracer = tracer or trace.get_tracer(__name__)
+
+    def record(self, call):
+        start = int(call.started * 1e9)
+        span = self.tracer.start_span(f"language.{call.operation}", start_time=start, attributes={
+            "language.operation": call.operation,
+            "language.resource": call.resource or "",
+            "language.queue_wait_s": call.queue_wait,
+            "language.retries": call.retries,
+            "language.documents": call.documents,
+            "language.characters": call.characters,
+            "language.billable_units": call.billable_units
+        })
+        if call.error:
+            span.set_status(self._status(self._status_code.ERROR, call.error))
+        span.end(end_time=start + int(call.wall_time * 1e9))
+
+SINKS = {
+    "histogram": HistogramSink,
+    "prometheus": PrometheusSink,
+    "otel": OpenTelemetrySink
+}
+
+class Instrumentation:
+    """
+    Registry of sinks that receive a CallRecord for every service call.
+
+    With no sinks attached nothing is measured beyond two clock reads per
+    call, so the hot path stays cheap.
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def add_sink(self, sink):
+        """Attach a sink (any object with a record(call) method) and return it."""
+        self.sinks = self.sinks + [sink]
+        return sink
+
+    def remove_sink(self, sink):
+        self.sinks = [existing for existing in self.sinks if existing is not sink]
+
+    def emit(self, operation, resource, started, wall_time, queue_wait, retries, batch, error=None):
+        """Build a CallRecord and hand it to every sink."""
+        sinks = self.sinks
+        if not sinks:
+            return
+        call = CallRecord(operation, resource, started, wall_time, queue_wait, retries, batch or (), error)
+        for sink in sinks:
+            sink.record(call)
+
+_default_instrumentation = None
+_default_instrumentation_lock = threading.Lock()
+
+def get_instrumentation():
+    """
+    Get the process-wide instrumentation with the sinks named in config.py.
+
+    Raises:
+        ValueError: If a configured sink name is not in SINKS
+    """
+    global _default_instrumentation
+    with _default_instrumentation_lock:
+        if _default_instrumentation is None:
+            names = get_settings()['METRICS_SINKS']
+            for name in names:
+                if name not in SINKS:
+                    raise ValueError(f"Unsupported metrics sink: {name} (choose from {', '.join(SINKS)})")
+            _default_instrumentation = Instrumentation(SINKS[name]() for name in names)
+    return _default_instrumentation
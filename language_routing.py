@@ -0,0 +1,99 @@
+"""
+Language-aware batch routing for Azure AI Language Service
+Gives every document an explicit language hint, from its declaration or from
+detection, so sentiment, key-phrase and entity batches are sent as
+homogeneous per-language requests instead of relying on the default language.
+"""
+
+from config import get_settings
+from local_language import LocalLanguageDetector
+from result_cache import document_language
+
+# detect_language returns a few codes that differ from the hints other operations accept
+DETECTED_TO_HINT = {
+    "zh_chs": "zh-hans",
+    "zh_cht": "zh-hant"
+}
+
+def with_language(document, language):
+    """Return a prepared document carrying an explicit language hint."""
+    if isinstance(document, dict):
+        return dict(document, language=language)
+    from azure.ai.textanalytics import TextDocumentInput
+    return TextDocumentInput(id=document.id, text=document.text, language=language)
+
+class LanguageRouter:
+    """
+    Assigns a language hint to each document.
+
+    Declared languages (a per-document "language" or the call's language
+    option) win. Otherwise the local detector is tried, and with
+    detect_remote=True the remaining documents are detected by the service
+    in large detect_language batches. Documents that stay undetermined are
+    sent without a hint.
+
+    Args:
+        detector (LocalLanguageDetector): In-process detector, defaults to a new one
+        detect_remote (bool): Ask the service about documents the detector cannot place, defaults to config
+        client: Client or ShardedDispatcher for remote detection, defaults to the configured resources
+    """
+
+    def __init__(self, detector=None, detect_remote=None, client=None):
+        if detect_remote is None:
+            detect_remote = get_settings()['LANGUAGE_ROUTING_REMOTE']
+        self.detector = detector or LocalLanguageDetector()
+        self.detect_remote = detect_remote
+        self.client = client
+
+    def route(self, documents, options):
+        """
+        Decide the language hint of each document.
+
+        Args:
+            documents (list): Documents in any input shape the SDK accepts
+            options (dict): Options of the operation being routed
+
+        Returns:
+            list: Language hint (or None) per document
+        """
+        from batching import analyze_batched, document_text
+
+        languages = []
+        undetermined = []
+        for position, document in enumerate(documents):
+            language = document_language(document, {}) or options.get("language")
+            if language is None:
+                language, confidence = self.detector.classify(document_text(document))
+                if confidence < self.detector.confidence:
+                    language = None
+                    undetermined.append(position)
+            languages.append(language)
+
+        if self.detect_remote and undetermined:
+            results = analyze_batched(
+                "detect_language",
+                [document_text(documents[position]) for position in undetermined],
+                client=self.client, local_detector=False
+            )
+            for position, result in zip(undetermined, results):
+                detected = None if result.is_error else result.primary_language.iso6391_name
+                # The service reports "(Unknown)" when it cannot tell either
+                if detected and not detected.startswith("("):
+                    languages[position] = DETECTED_TO_HINT.get(detected, detected)
+        return languages
+
+_default_router = None
+
+def get_language_router():
+    """
+    Get the language router configured in config.py.
+
+    Returns:
+        LanguageRouter: Shared router, or None if routing is disabled
+    """
+    global _default_router
+    if not get_settings()['LANGUAGE_ROUTING_ENABLED']:
+        return None
+    if _default_router is None:
+        _default_router = LanguageRouter()
+    return _default_router
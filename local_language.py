@@ -0,0 +1,231 @@
+"""
+Local language detection for Azure AI Language Service
+Answers high-confidence cases in-process from Unicode script ranges and
+character trigram profiles, limited to SUPPORTED_LANGUAGES, so only
+ambiguous texts are sent to the detect_language API.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from config import SUPPORTED_LANGUAGES, get_settings
+
+LANGUAGE_NAMES = {
+    "en": "English", "es": "Spanish", "fr": "French", "de": "German",
+    "it": "Italian", "pt": "Portuguese", "ja": "Japanese", "ko": "Korean",
+    "zh": "Chinese", "ar": "Arabic", "hi": "Hindi", "ru": "Russian"
+}
+
+# Script -> (language, letters that point to a different language using the same script)
+SCRIPT_LANGUAGES = {
+    "hangul": ("ko", ""),
+    "kana": ("ja", ""),
+    "arabic": ("ar", "پچژگکی"),       # Persian/Urdu letters
+    "devanagari": ("hi", ""),
+    "cyrillic": ("ru", "іїєґўјљњћџ")  # Ukrainian, Belarusian, Serbian, Macedonian
+}
+
+# Seed text for the Latin-script trigram profiles
+LATIN_SEED_TEXT = {
+    "en": (
+        "the quick service is available and it is the best way to analyze what people say about "
+        "your products. we think that this is one of the most important things for the team. "
+        "there are many customers who have been waiting for this feature and they will be happy "
+        "with the results. please let me know if you have any questions about the weather today "
+        "or anything else that you would like to share with us"
+    ),
+    "es": (
+        "el servicio está disponible y es la mejor manera de analizar lo que dice la gente sobre "
+        "sus productos. creemos que esto es una de las cosas más importantes para el equipo. "
+        "hay muchos clientes que han estado esperando esta función y estarán contentos con los "
+        "resultados. por favor dime si tienes alguna pregunta sobre el tiempo de hoy o cualquier "
+        "otra cosa que quieras compartir con nosotros. hola cómo estás, qué tal, gracias"
+    ),
+    "fr": (
+        "le service est disponible et c'est la meilleure façon d'analyser ce que les gens disent "
+        "de vos produits. nous pensons que c'est une des choses les plus importantes pour l'équipe. "
+        "il y a beaucoup de clients qui attendent cette fonctionnalité et ils seront contents des "
+        "résultats. dites-moi si vous avez des questions sur le temps qu'il fait aujourd'hui ou "
+        "sur autre chose que vous voulez partager avec nous. bonjour comment allez-vous, merci"
+    ),
+    "de": (
+        "der dienst ist verfügbar und es ist die beste möglichkeit zu analysieren, was die leute "
+        "über ihre produkte sagen. wir denken, dass dies eines der wichtigsten dinge für das team "
+        "ist. es gibt viele kunden, die auf diese funktion gewartet haben und sie werden mit den "
+        "ergebnissen zufrieden sein. bitte sagen sie mir, wenn sie fragen zum wetter heute oder "
+        "zu etwas anderem haben, das sie mit uns teilen möchten. guten tag, wie geht es ihnen"
+    ),
+    "it": (
+        "il servizio è disponibile ed è il modo migliore per analizzare quello che la gente dice "
+        "dei vostri prodotti. pensiamo che questa sia una delle cose più importanti per la squadra. "
+        "ci sono molti clienti che stavano aspettando questa funzione e saranno contenti dei "
+        "risultati. per favore fammi sapere se hai domande sul tempo di oggi o su qualsiasi altra "
+        "cosa che vorresti condividere con noi. ciao come stai, grazie mille, buongiorno"
+    ),
+    "pt": (
+        "o serviço está disponível e é a melhor maneira de analisar o que as pessoas dizem sobre "
+        "os seus produtos. nós achamos que isso é uma das coisas mais importantes para a equipe. "
+        "há muitos clientes que estavam esperando por esta função e eles vão ficar contentes com "
+        "os resultados. por favor me diga se você tem alguma pergunta sobre o tempo hoje ou "
+        "qualquer outra coisa que gostaria de compartilhar conosco. olá como vai você, obrigado"
+    )
+}
+
+# Frequent function words; a hit is strong evidence for short texts
+LATIN_STOPWORDS = {
+    "en": "the and is are was were of to in that it for you with on this have be not they what how".split(),
+    "es": "el la los las es son de que y en un una por con para no se del al cómo qué está estás".split(),
+    "fr": "le la les est sont de des que et en un une pour avec pas ce du au vous nous comment".split(),
+    "de": "der die das ist sind und zu den von mit nicht ein eine für auf ich sie wie es geht".split(),
+    "it": "il lo la gli le è sono di che e in un una per con non del della come sei stai".split(),
+    "pt": "o a os as é são de que e em um uma por com para não do da como você está".split()
+}
+
+_word = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+def _trigrams(text):
+    counts = Counter()
+    for word in _word.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[padded[i:i + 3]] += 1
+    return counts
+
+def _normalize_profile(counts):
+    norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+    return {gram: value / norm for gram, value in counts.items()}
+
+def _script_of(character):
+    code = ord(character)
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF:
+        return "kana"
+    if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return "han"
+    if 0x0600 <= code <= 0x06FF or 0x0750 <= code <= 0x077F:
+        return "arabic"
+    if 0x0900 <= code <= 0x097F:
+        return "devanagari"
+    if 0x0400 <= code <= 0x04FF:
+        return "cyrillic"
+    if character.isalpha() and unicodedata.name(character, "").startswith("LATIN"):
+        return "latin"
+    return None
+
+class LocalLanguageDetector:
+    """
+    In-process language detector for the languages in SUPPORTED_LANGUAGES.
+
+    Non-Latin scripts are decided by Unicode ranges; Latin-script text is
+    scored against trigram profiles plus function-word hits. Anything whose
+    confidence falls below the cutoff is left for the service.
+
+    Args:
+        confidence (float): Minimum confidence to answer locally, defaults to config
+        languages (list): ISO 639-1 codes to consider, defaults to SUPPORTED_LANGUAGES
+    """
+
+    def __init__(self, confidence=None, languages=SUPPORTED_LANGUAGES):
+        if confidence is None:
+            confidence = get_settings()['LOCAL_DETECTION_CONFIDENCE']
+        self.confidence = confidence
+        self.languages = set(languages)
+        self._profiles = {
+            language: _normalize_profile(_trigrams(text))
+            for language, text in LATIN_SEED_TEXT.items() if language in self.languages
+        }
+        self._stopwords = {
+            language: set(words)
+            for language, words in LATIN_STOPWORDS.items() if language in self.languages
+        }
+
+    def classify(self, text):
+        """
+        Guess the language of a text.
+
+        Returns:
+            tuple: (iso6391_name, confidence), or (None, 0.0) if undecidable
+        """
+        scripts = Counter(script for script in map(_script_of, text) if script)
+        total = sum(scripts.values())
+        if not total:
+            return None, 0.0
+
+        # Japanese mixes kana with Han; kana alone is enough to call it
+        if scripts["kana"] and "ja" in self.languages:
+            return "ja", min(1.0, 0.9 + scripts["kana"] / total)
+
+        script, count = scripts.most_common(1)[0]
+        share = count / total
+        if script == "latin":
+            return self._classify_latin(text, share)
+        if script in SCRIPT_LANGUAGES:
+            language, foreign_letters = SCRIPT_LANGUAGES[script]
+            if language not in self.languages or any(letter in text for letter in foreign_letters):
+                return None, 0.0
+            return language, share
+        # Han without kana may be Chinese (simplified or traditional) or Japanese
+        return None, 0.0
+
+    def _classify_latin(self, text, share):
+        grams = _normalize_profile(_trigrams(text))
+        words = [word.lower() for word in _word.findall(text)]
+        scores = {}
+        for language, profile in self._profiles.items():
+            similarity = sum(weight * profile.get(gram, 0.0) for gram, weight in grams.items())
+            hits = sum(1 for word in words if word in self._stopwords[language])
+            scores[language] = similarity + 0.5 * hits / max(1, len(words))
+        if not scores:
+            return None, 0.0
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        best_language, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if best <= 0:
+            return None, 0.0
+        # Confidence grows with the margin over the runner-up and with text length
+        margin = (best - runner_up) / best
+        evidence = min(1.0, len(words) / 4)
+        return best_language, share * min(1.0, 0.5 + margin * 1.5) * (0.6 + 0.4 * evidence)
+
+    def detect(self, text, document_id="0"):
+        """
+        Detect a text's language locally if confident enough.
+
+        Returns:
+            DetectLanguageResult: Same shape as the service response, or None
+            if the text should be sent to the service
+        """
+        language, confidence = self.classify(text)
+        if language is None or confidence < self.confidence:
+            return None
+        from azure.ai.textanalytics import DetectLanguageResult, DetectedLanguage
+        return DetectLanguageResult(
+            id=document_id,
+            primary_language=DetectedLanguage(
+                name=LANGUAGE_NAMES[language],
+                iso6391_name=language,
+                confidence_score=round(confidence, 2)
+            ),
+            warnings=[],
+            statistics=None,
+            is_error=False
+        )
+
+_default_detector = None
+
+def get_local_detector():
+    """
+    Get the local detector configured in config.py.
+
+    Returns:
+        LocalLanguageDetector: Shared detector, or None if local detection is disabled
+    """
+    global _default_detector
+    if not get_settings()['LOCAL_DETECTION_ENABLED']:
+        return None
+    if _default_detector is None:
+        _default_detector = LocalLanguageDetector()
+    return _default_detector
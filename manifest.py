@@ -0,0 +1,186 @@
+"""
+Incremental analysis manifest for Azure AI Language Service
+Remembers, per operation and document id, the content hash, model version and
+result of the last analysis so nightly runs only dispatch new or changed
+documents, and re-dispatch everything once the service model changes.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from result_cache import ResultCache
+
+# Ids per SELECT ... IN (...) lookup, below SQLite's parameter limit
+LOOKUP_BATCH = 500
+
+def content_hash(operation, text, document, options):
+    """Hash of everything that determines a document's result except the resolved model version."""
+    return ResultCache.key_for(operation, text, document, options)
+
+def current_model_version(operation, send):
+    """
+    Ask the service which model version it resolves for an operation.
+
+    Sends one short document, which is billed as a single text record.
+
+    Args:
+        operation (str): Client operation name
+        send (callable): Sender from batching.operation_sender()
+
+    Returns:
+        str: Model version reported by the service, or None if it does not say
+    """
+    seen = []
+    document = {"id": "0", "text": "Model version probe."}
+    if operation != "detect_language":
+        document["language"] = "en"
+    send(documents=[document], raw_response_hook=lambda response: seen.append(response.model_version))
+    return seen[-1] if seen else None
+
+class IncrementalStats:
+    """Running totals of what the manifest saved."""
+
+    def __init__(self):
+        self.documents = 0
+        self.reused = 0
+        self.new = 0
+        self.changed = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def record(self, documents, reused, new, changed, stale):
+        """Add the counts for one chunk of one operation."""
+        with self._lock:
+            self.documents += documents
+            self.reused += reused
+            self.new += new
+            self.changed += changed
+            self.stale += stale
+
+    @property
+    def dispatched(self):
+        return self.new + self.changed + self.stale
+
+    def as_dict(self):
+        """Counters as a plain dictionary for logging."""
+        return {
+            "documents": self.documents,
+            "reused": self.reused,
+            "dispatched": self.dispatched,
+            "new": self.new,
+            "changed": self.changed,
+            "stale_model_version": self.stale
+        }
+
+class AnalysisManifest:
+    """
+    SQLite manifest of document id -> content hash -> model version and result.
+
+    Results are stored as the JSON-serializable structures written by the
+    corpus pipeline. Failed documents are never stored, so they are retried
+    on the next run.
+
+    Args:
+        path (str): SQLite file, created if missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents "
+            "(operation TEXT, id TEXT, hash TEXT, model_version TEXT, result TEXT, updated_at REAL, "
+            "PRIMARY KEY (operation, id))"
+        )
+        self._db.commit()
+
+    def lookup(self, operation, ids):
+        """
+        Get the stored entries for document ids.
+
+        Returns:
+            dict: id -> (hash, model_version, result) for the ids that have an entry
+        """
+        ids = list(ids)
+        entries = {}
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_BATCH):
+                batch = ids[start:start + LOOKUP_BATCH]
+                rows = self._db.execute(
+                    f"SELECT id, hash, model_version, result FROM documents "
+                    f"WHERE operation = ? AND id IN ({', '.join('?' * len(batch))})",
+                    [operation, *batch]
+                )
+                for document_id, digest, model_version, result in rows:
+                    entries[document_id] = (digest, model_version, json.loads(result))
+        return entries
+
+    def update(self, operation, entries):
+        """
+        Store fresh results.
+
+        Args:
+            operation (str): Client operation name
+            entries (list): (id, hash, model_version, result) tuples
+        """
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO documents (operation, id, hash, model_version, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(operation, document_id, digest, model_version, json.dumps(result, ensure_ascii=False), now)
+                 for document_id, digest, model_version, result in entries]
+            )
+            self._db.commit()
+
+    def invalidate(self, operation=None, keep_model_version=None):
+        """
+        Drop stored results so the next run re-analyzes them.
+
+        Args:
+            operation (str): Only this operation, defaults to all
+            keep_model_version (str): Keep results produced by this model version
+
+        Returns:
+            int: Number of entries dropped
+        """
+        clauses, parameters = [], []
+        if operation is not None:
+            clauses.append("operation = ?")
+            parameters.append(operation)
+        if keep_model_version is not None:
+            clauses.append("model_version IS NOT ?")
+            parameters.append(keep_model_version)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            dropped = self._db.execute(f"DELETE FROM documents{where}", parameters).rowcount
+            self._db.commit()
+        return dropped
+
+    def model_versions(self, operation):
+        """Stored entry counts per model version for an operation."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT model_version, COUNT(*) FROM documents WHERE operation = ? GROUP BY model_version",
+                (operation,)
+            )
+            return dict(rows.fetchall())
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
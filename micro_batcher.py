@@ -0,0 +1,239 @@
+"""
+Request coalescing for online Azure AI Language Service traffic
+Collects concurrent single-document calls for a few milliseconds, sends them
+as one batch and resolves each caller's future with its own result.
+"""
+
+import copy
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from batching import analyze_batched
+from config import MAX_DOCUMENTS_PER_REQUEST, get_settings
+from result_cache import relabel_result
+
+_STOP = object()
+
+def _nearest_rank(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else None
+
+def _caller_id(document):
+    """The id the caller gave a document, or "0" for plain strings and id-less dicts."""
+    if isinstance(document, str):
+        return "0"
+    if isinstance(document, dict):
+        return str(document.get("id", "0"))
+    return getattr(document, "id", None) or "0"
+
+def _with_id(document, document_id):
+    """Copy a document under a batch-local id; caller ids may collide within a batch."""
+    if isinstance(document, str):
+        return {"id": document_id, "text": document}
+    if isinstance(document, dict):
+        return dict(document, id=document_id)
+    document = copy.copy(document)
+    document.id = document_id
+    return document
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-document calls into batched requests.
+
+    A batch is sent when it reaches max_batch documents or when its first
+    document has waited max_wait seconds, whichever comes first, so no call
+    waits more than max_wait for company. Batches go through analyze_batched,
+    with its cache, deduplication, rate limiting and retries.
+
+        batcher = MicroBatcher("analyze_sentiment")
+
+        @app.post("/sentiment")
+        async def sentiment(body):
+            result = await batcher.analyze_async(body["text"])
+
+    Args:
+        operation (str): Client method name, e.g. "analyze_sentiment"
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        scheduler (RequestScheduler): Rate limiter and retries for an explicit client
+        max_wait (float): Seconds the first call of a batch may wait, defaults to config
+        max_batch (int): Documents per batch, defaults to config or the operation's limit
+        max_in_flight (int): Batches sent concurrently, defaults to config
+        **options: Passed through to analyze_batched and the client operation
+
+    Raises:
+        ValueError: If the operation is not supported
+    """
+
+    def __init__(self, operation, client=None, scheduler=None, max_wait=None, max_batch=None,
+                 max_in_flight=None, **options):
+        if operation not in MAX_DOCUMENTS_PER_REQUEST:
+            raise ValueError(f"Unsupported operation: {operation}")
+        limit = MAX_DOCUMENTS_PER_REQUEST[operation]
+        settings = get_settings()
+        max_in_flight = max_in_flight or settings['MAX_CONCURRENT_REQUESTS']
+        self.operation = operation
+        self.client = client
+        self.scheduler = scheduler
+        self.max_wait = settings['MICRO_BATCH_MAX_WAIT_MS'] / 1000 if max_wait is None else max_wait
+        self.max_batch = min(max_batch or settings['MICRO_BATCH_MAX_SIZE'] or limit, limit)
+        self.options = options
+        self.requests = 0
+        self.documents = 0
+        self.batch_sizes = Counter()
+        self.total_wait = 0.0
+        self.max_observed_wait = 0.0
+        self._queue = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._lock = threading.Lock()
+        # Serializes submit() with close(), so nothing is queued after _STOP
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True,
+                                           name=f"micro-batcher-{operation}")
+        self._collector.start()
+
+    def submit(self, document):
+        """
+        Queue one document.
+
+        Returns:
+            concurrent.futures.Future: Resolves to its Result or DocumentError
+
+        Raises:
+            RuntimeError: If the batcher is closed
+        """
+        future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((document, future, time.monotonic()))
+        return future
+
+    def analyze(self, document, timeout=None):
+        """Analyze one document, blocking until its batch returns."""
+        return self.submit(document).result(timeout)
+
+    async def analyze_async(self, document):
+        """Analyze one document from a coroutine."""
+        import asyncio
+        return await asyncio.wrap_future(self.submit(document))
+
+    def _collect(self):
+        while True:
+            # Wait for a free request slot first, so the batch keeps filling meanwhile
+            self._slots.acquire()
+            item = self._queue.get()
+            if item is _STOP:
+                self._slots.release()
+                return
+            # Callers may have cancelled while queued, e.g. on a timeout
+            while not item[1].set_running_or_notify_cancel():
+                item = self._queue.get()
+                if item is _STOP:
+                    self._slots.release()
+                    return
+            batch = [item]
+            deadline = item[2] + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch:
+                # Past the deadline, still take whatever is already queued
+                remaining = max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if item[1].set_running_or_notify_cancel():
+                    batch.append(item)
+            self._executor.submit(self._send, batch)
+            if stop:
+                return
+
+    def _send(self, batch):
+        sent = time.monotonic()
+        try:
+            documents = [_with_id(document, str(position)) for position, (document, _, _) in enumerate(batch)]
+            results = analyze_batched(self.operation, documents, client=self.client,
+                                      scheduler=self.scheduler, max_documents=self.max_batch,
+                                      **self.options)
+        except Exception as error:
+            for _, future, _ in batch:
+                future.set_exception(error)
+            return
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.requests += 1
+                self.documents += len(batch)
+                self.batch_sizes[len(batch)] += 1
+                for _, _, queued in batch:
+                    self.total_wait += sent - queued
+                    self.max_observed_wait = max(self.max_observed_wait, sent - queued)
+        for (document, future, _), result in zip(batch, results):
+            try:
+                future.set_result(relabel_result(result, _caller_id(document)))
+            except Exception as error:
+                future.set_exception(error)
+
+    @property
+    def stats(self):
+        """
+        Batches sent and how full they were.
+
+        Returns:
+            dict: requests, documents, mean batch size, p50/p95 batch size,
+            mean and max seconds a call waited before its batch was sent, and
+            the batch-size distribution as {size: batches}
+        """
+        with self._lock:
+            sizes = sorted(self.batch_sizes.elements())
+            return {
+                "requests": self.requests,
+                "documents": self.documents,
+                "mean_batch_size": self.documents / self.requests if self.requests else None,
+                "p50_batch_size": _nearest_rank(sizes, 50),
+                "p95_batch_size": _nearest_rank(sizes, 95),
+                "mean_wait": self.total_wait / self.documents if self.documents else None,
+                "max_wait": self.max_observed_wait,
+                "batch_sizes": dict(sorted(self.batch_sizes.items()))
+            }
+
+    def close(self):
+        """Send whatever is queued, wait for every batch and stop the collector."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._collector.join()
+        self._executor.shutdown(wait=True)
+        # Nothing should be left, but never leave a caller waiting forever
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("MicroBatcher is closed"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_default_batchers = {}
+_default_batchers_lock = threading.Lock()
+
+def get_micro_batcher(operation):
+    """Get the process-wide MicroBatcher for an operation, configured in config.py."""
+    with _default_batchers_lock:
+        batcher = _default_batchers.get(operation)
+        if batcher is None:
+            batcher = _default_batchers[operation] = MicroBatcher(operation)
+    return batcher
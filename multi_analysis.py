@@ -0,0 +1,217 @@
+"""
+Multi-feature analysis for Azure AI Language Service
+Runs several analysis features over the same documents in a single
+multi-action job and merges the results into one object per document.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from batching import (
+    analyze_batched,
+    document_id,
+    document_text,
+    iter_batches,
+    operation_sender,
+    prepare_document
+)
+from config import MAX_DOCUMENTS_PER_ACTIONS_JOB, MAX_REQUEST_CHARACTERS
+from dedup import get_dedup_policy
+from result_cache import document_language, get_result_cache, relabel_result
+
+# Feature name -> synchronous client operation
+FEATURE_OPERATIONS = {
+    "sentiment": "analyze_sentiment",
+    "key_phrases": "extract_key_phrases",
+    "entities": "recognize_entities",
+    "pii": "recognize_pii_entities",
+    "language": "detect_language"
+}
+
+DEFAULT_FEATURES = ("sentiment", "key_phrases", "entities", "language")
+
+# Job submission statuses meaning multi-action jobs are not offered here
+ACTIONS_UNSUPPORTED_STATUS_CODES = (400, 404)
+
+def _build_action(feature):
+    """Create the begin_analyze_actions action for a feature, if it has one."""
+    from azure.ai.textanalytics import (
+        AnalyzeSentimentAction,
+        ExtractKeyPhrasesAction,
+        RecognizeEntitiesAction,
+        RecognizePiiEntitiesAction
+    )
+    actions = {
+        "sentiment": AnalyzeSentimentAction,
+        "key_phrases": ExtractKeyPhrasesAction,
+        "entities": RecognizeEntitiesAction,
+        "pii": RecognizePiiEntitiesAction
+    }
+    action = actions.get(feature)
+    return action() if action else None
+
+class DocumentAnalysis:
+    """
+    Merged per-document result of a multi-feature analysis.
+    
+    Each requested feature is available as an attribute holding the SDK
+    result for that feature (e.g. `analysis.sentiment.confidence_scores`).
+    Features that failed for this document are recorded in `errors` and
+    their attribute is None.
+    """
+
+    def __init__(self, index, features):
+        self.index = index
+        self.features = tuple(features)
+        self.errors = {}
+        for feature in FEATURE_OPERATIONS:
+            setattr(self, feature, None)
+
+    @property
+    def is_error(self):
+        """True if every requested feature failed for this document."""
+        return len(self.errors) == len(self.features)
+
+    def add(self, feature, result):
+        """Record the SDK result (or DocumentError) for a feature."""
+        if result.is_error:
+            self.errors[feature] = result.error
+        else:
+            setattr(self, feature, result)
+
+    def __repr__(self):
+        return f"DocumentAnalysis(index={self.index}, features={self.features}, errors={self.errors})"
+
+def _run_features_in_parallel(documents, features, client, scheduler, cache, dedup):
+    """Fallback: one batched call per feature, all features in parallel."""
+    with ThreadPoolExecutor(max_workers=max(1, len(features))) as executor:
+        futures = {
+            feature: executor.submit(
+                analyze_batched, FEATURE_OPERATIONS[feature], documents,
+                client=client, scheduler=scheduler, cache=cache, dedup=dedup
+            )
+            for feature in features
+        }
+        return {feature: future.result() for feature, future in futures.items()}
+
+def _run_actions(documents, features, client, scheduler, cache, dedup, polling_interval):
+    """Submit the action-capable features as multi-action jobs."""
+    results = {feature: [None] * len(documents) for feature in features}
+    pending = []
+    duplicates = {}
+    first_seen = {}
+    for index, document in enumerate(documents):
+        prepared = prepare_document(index, document)
+        text = document_text(document)
+        for feature in features:
+            if cache is not None:
+                results[feature][index] = cache.lookup(
+                    FEATURE_OPERATIONS[feature], text, document, document_id(prepared), {}
+                )
+        # Only documents missing at least one feature go to the service, once per unique text
+        if all(results[feature][index] is not None for feature in features):
+            continue
+        if dedup is not None:
+            key = dedup.key(text, document_language(document, {}))
+            if key in first_seen:
+                duplicates[first_seen[key]].append((index, document_id(prepared)))
+                continue
+            first_seen[key] = len(pending)
+        duplicates[len(pending)] = []
+        pending.append((index, document, prepared))
+
+    submit = operation_sender("begin_analyze_actions", client, scheduler)
+    for batch in iter_batches((prepared for _, _, prepared in pending),
+                              MAX_DOCUMENTS_PER_ACTIONS_JOB, MAX_REQUEST_CHARACTERS):
+        poller = submit(
+            [prepared for _, prepared in batch],
+            actions=[_build_action(feature) for feature in features],
+            polling_interval=polling_interval
+        )
+        # Each document yields one result per action, in action order
+        for (position, _), document_results in zip(batch, poller.result()):
+            index, document, _ = pending[position]
+            for feature, result in zip(features, document_results):
+                results[feature][index] = result
+                for duplicate_index, duplicate_id in duplicates[position]:
+                    results[feature][duplicate_index] = relabel_result(result, duplicate_id)
+                if cache is not None:
+                    cache.store(FEATURE_OPERATIONS[feature], document_text(document),
+                                document, {}, result)
+    return results
+
+def analyze_documents(documents, features=DEFAULT_FEATURES, client=None, scheduler=None,
+                      use_actions=True, polling_interval=1, cache=None, dedup=None):
+    """
+    Analyze documents with several features at once.
+    
+    Features that the multi-action API supports are submitted together as a
+    single job per batch; language detection (which has no action) runs in
+    parallel with it. If the resource or region does not offer multi-action
+    jobs, every feature falls back to its own batched call, run in parallel.
+    
+    Job submissions go through the scheduler like every other call; the
+    SDK then polls each job's status every polling_interval seconds (or
+    as told by Retry-After) outside the rate limiter. Jobs send the
+    documents as given: the payload minimizer, language router and entity
+    gazetteer only apply to the per-feature calls.
+    
+    Args:
+        documents (iterable): Documents to analyze
+        features (iterable): Feature names from FEATURE_OPERATIONS
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        scheduler (RequestScheduler): Rate limiter and retries for an explicit client
+        use_actions (bool): Try the multi-action job API first
+        polling_interval (int): Seconds between job status polls
+        cache (ResultCache): Result cache, defaults to the shared cache; False disables it
+        dedup (DedupPolicy): Deduplication policy, defaults to config; False disables it
+        
+    Returns:
+        list: DocumentAnalysis objects, in input order
+        
+    Raises:
+        ValueError: If an unknown feature is requested
+    """
+    features = tuple(dict.fromkeys(features))
+    unknown = [feature for feature in features if feature not in FEATURE_OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unsupported features: {', '.join(unknown)}")
+    
+    documents = list(documents)
+    if cache is None:
+        cache = get_result_cache()
+    cache = cache or None
+    if dedup is None:
+        dedup = get_dedup_policy()
+    dedup = dedup or None
+    
+    action_features = tuple(f for f in features if use_actions and _build_action(f) is not None)
+    other_features = tuple(f for f in features if f not in action_features)
+    
+    results = {}
+    if action_features:
+        from azure.core.exceptions import HttpResponseError
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            others = executor.submit(_run_features_in_parallel, documents, other_features,
+                                     client, scheduler, cache, dedup) if other_features else None
+            try:
+                results.update(_run_actions(documents, action_features, client, scheduler, cache,
+                                            dedup, polling_interval))
+            except HttpResponseError as error:
+                # Fall back only when multi-action jobs are not available for this
+                # resource or region; a per-feature re-run would multiply the load
+                # of throttling or server errors
+                if error.status_code not in ACTIONS_UNSUPPORTED_STATUS_CODES:
+                    raise
+                results.update(_run_features_in_parallel(documents, action_features, client,
+                                                         scheduler, cache, dedup))
+            if others is not None:
+                results.update(others.result())
+    else:
+        results.update(_run_features_in_parallel(documents, other_features, client, scheduler,
+                                                 cache, dedup))
+    
+    analyses = [DocumentAnalysis(index, features) for index in range(len(documents))]
+    for feature in features:
+        for analysis, result in zip(analyses, results[feature]):
+            analysis.add(feature, result)
+    return analyses
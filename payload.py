@@ -0,0 +1,265 @@
+"""
+Payload minimization for Azure AI Language Service
+Collapses whitespace (and optionally strips email boilerplate) before texts
+are sent, keeps an offset map so result offsets point back into the raw
+text, and counts the billable text records saved.
+"""
+
+import copy
+import re
+import threading
+from bisect import bisect_right
+
+from config import get_settings
+from instrumentation import billable_units
+
+# Line-level boilerplate that carries no meaning for analysis; each pattern
+# is matched with re.MULTILINE against the raw text
+BOILERPLATE_PATTERNS = (
+    # Quoted replies and their "On ... wrote:" header
+    r"^[ \t]*>.*$",
+    r"^[ \t]*On .{1,200}wrote:[ \t]*$",
+    # Mobile signatures
+    r"^[ \t]*Sent from my [\w ]{1,40}$",
+    # Everything after the conventional "-- " signature delimiter
+    r"^--[ \t]*$[\s\S]*\Z",
+    # Legal disclaimers, up to the next blank line
+    r"^[ \t]*(?i:confidentiality notice|this (?:e-?mail|message)(?: and any attachments)? "
+    r"(?:is|are|may be|contains?) (?:confidential|privileged|intended)).*(?:\n(?![ \t]*\n).*)*",
+    # Mailing-list footers
+    r"^.*\b(?i:unsubscribe|manage your (?:email )?preferences)\b.*$",
+)
+
+# Operations where boilerplate may hold exactly what is being looked for
+KEEP_BOILERPLATE_OPERATIONS = ("recognize_pii_entities",)
+
+# Attributes of SDK results holding objects with offsets and lengths
+_NESTED = ("entities", "matches", "sentences", "mined_opinions", "target", "assessments")
+
+_whitespace_run = re.compile(r"\s+")
+
+class OffsetMap:
+    """
+    Maps positions in minimized text back to positions in the raw text.
+
+    Stored as the starts of the minimized text's pieces: runs copied from
+    the raw text, and the single separators that replaced whitespace or
+    boilerplate, which map to the start of what they replaced.
+    """
+
+    def __init__(self, minimized_starts, raw_starts):
+        self._minimized = minimized_starts
+        self._raw = raw_starts
+
+    def to_raw(self, position):
+        """Raw position of a minimized position."""
+        piece = max(0, bisect_right(self._minimized, position) - 1)
+        return self._raw[piece] + position - self._minimized[piece]
+
+    def span(self, offset, length):
+        """
+        Raw (offset, length) of a minimized span.
+
+        The span keeps its first and last characters, so whitespace the
+        minimizer removed inside it is covered, and whitespace around it is not.
+        """
+        start = self.to_raw(offset)
+        if length <= 0:
+            return start, 0
+        return start, self.to_raw(offset + length - 1) + 1 - start
+
+class PayloadStats:
+    """Running totals of what minimization saved."""
+
+    def __init__(self):
+        self.documents = 0
+        self.characters_before = 0
+        self.characters_after = 0
+        self.records_before = 0
+        self.records_after = 0
+        self.bytes_before = 0
+        self.bytes_after = 0
+        self._lock = threading.Lock()
+
+    def record(self, raw, minimized):
+        """Add one sent document, before and after minimization."""
+        with self._lock:
+            self.documents += 1
+            self.characters_before += len(raw)
+            self.characters_after += len(minimized)
+            self.records_before += billable_units([len(raw)])
+            self.records_after += billable_units([len(minimized)])
+            self.bytes_before += len(raw.encode("utf-8"))
+            self.bytes_after += len(minimized.encode("utf-8"))
+
+    @property
+    def records_saved(self):
+        return self.records_before - self.records_after
+
+    def as_dict(self):
+        """Counters as a plain dictionary for logging."""
+        return {
+            "documents": self.documents,
+            "characters_before": self.characters_before,
+            "characters_after": self.characters_after,
+            "billable_records_before": self.records_before,
+            "billable_records_after": self.records_after,
+            "billable_records_saved": self.records_saved,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after
+        }
+
+def _restored(item, offset_map):
+    item = copy.copy(item)
+    if getattr(item, "offset", None) is not None and getattr(item, "length", None) is not None:
+        item.offset, item.length = offset_map.span(item.offset, item.length)
+    for name in _NESTED:
+        value = getattr(item, name, None)
+        if isinstance(value, list):
+            setattr(item, name, [_restored(nested, offset_map) for nested in value])
+        elif value is not None and hasattr(value, "__dict__"):
+            setattr(item, name, _restored(value, offset_map))
+    return item
+
+def with_text(document, text):
+    """Return a prepared document carrying different text."""
+    if isinstance(document, dict):
+        return dict(document, text=text)
+    document = copy.copy(document)
+    document.text = text
+    return document
+
+def mask_entities(text, entities, character="*"):
+    """
+    Redact entity spans the way the service does, one mask character per character.
+
+    Entities may come in any order and overlap; every character covered by
+    at least one of them is masked once.
+    """
+    pieces = []
+    position = 0
+    for entity in sorted(entities, key=lambda entity: entity.offset):
+        start = max(position, entity.offset)
+        end = min(len(text), entity.offset + entity.length)
+        if end <= start:
+            continue
+        pieces.append(text[position:start])
+        pieces.append(character * (end - start))
+        position = end
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+class PayloadMinimizer:
+    """
+    Shrinks texts before they are sent and maps result offsets back.
+
+    Whitespace runs become one space, or one newline where they hold a
+    blank line, so paragraphs stay apart; leading and trailing whitespace is
+    dropped. With strip_boilerplate, quoted replies, signatures, disclaimers
+    and mailing-list footers are removed too, except for PII recognition.
+
+    Results keep the text the service saw in their text fields, but every
+    offset and length (entities, linked entity matches, sentences, mined
+    opinions, summary sentences) refers to the raw text, and PII redacted
+    text is rebuilt from the raw text.
+
+    Args:
+        strip_boilerplate (bool): Also remove BOILERPLATE_PATTERNS matches, defaults to config
+        boilerplate (iterable): Regular expressions to use instead of BOILERPLATE_PATTERNS
+    """
+
+    def __init__(self, strip_boilerplate=None, boilerplate=BOILERPLATE_PATTERNS):
+        if strip_boilerplate is None:
+            strip_boilerplate = get_settings()['PAYLOAD_STRIP_BOILERPLATE']
+        self._boilerplate = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in boilerplate), re.MULTILINE)
+            if strip_boilerplate and boilerplate else None
+        )
+        self.stats = PayloadStats()
+
+    def minimize(self, text, operation=None):
+        """
+        Minimize one text.
+
+        Args:
+            text (str): Raw document text
+            operation (str): Client operation the text is sent to
+
+        Returns:
+            tuple: (minimized text, OffsetMap), or (text, None) when nothing changed
+        """
+        gaps = [match.span() for match in _whitespace_run.finditer(text)]
+        if self._boilerplate is not None and operation not in KEEP_BOILERPLATE_OPERATIONS:
+            gaps = sorted(gaps + [match.span() for match in self._boilerplate.finditer(text)
+                                  if match.end() > match.start()])
+
+        pieces, minimized_starts, raw_starts = [], [], []
+        size = 0
+
+        def emit(raw_start, piece):
+            nonlocal size
+            # A new map entry only where the shift between raw and minimized changes
+            if not raw_starts or raw_start - size != raw_starts[-1] - minimized_starts[-1]:
+                minimized_starts.append(size)
+                raw_starts.append(raw_start)
+            pieces.append(piece)
+            size += len(piece)
+
+        position = 0
+        index = 0
+        while index < len(gaps):
+            start, end = gaps[index]
+            index += 1
+            # Merge overlapping and touching gaps into one
+            while index < len(gaps) and gaps[index][0] <= end:
+                end = max(end, gaps[index][1])
+                index += 1
+            if start > position:
+                emit(position, text[position:start])
+            if size and end < len(text):
+                emit(start, "\n" if text.count("\n", start, end) >= 2 else " ")
+            position = end
+        if position < len(text):
+            emit(position, text[position:])
+
+        minimized = "".join(pieces)
+        if minimized == text:
+            return text, None
+        return minimized, OffsetMap(minimized_starts, raw_starts)
+
+    def restore(self, result, text, offset_map):
+        """
+        Point a result's offsets back into the raw text.
+
+        Args:
+            result: Result or DocumentError for the minimized text
+            text (str): Raw document text
+            offset_map (OffsetMap): Map returned by minimize(), None for unchanged texts
+
+        Returns:
+            A copy of the result with raw offsets; errors are returned unchanged
+        """
+        if offset_map is None or result.is_error:
+            return result
+        result = _restored(result, offset_map)
+        if getattr(result, "redacted_text", None) is not None:
+            result.redacted_text = mask_entities(text, result.entities)
+        return result
+
+_default_minimizer = None
+_default_minimizer_lock = threading.Lock()
+
+def get_payload_minimizer():
+    """
+    Get the minimizer configured in config.py.
+
+    Returns:
+        PayloadMinimizer: Shared minimizer, or None if minimization is disabled
+    """
+    global _default_minimizer
+    if not get_settings()['PAYLOAD_MINIMIZE']:
+        return None
+    with _default_minimizer_lock:
+        if _default_minimizer is None:
+            _default_minimizer = PayloadMinimizer()
+    return _default_minimizer
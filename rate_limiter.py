@@ -0,0 +1,308 @@
+"""
+Adaptive rate limiting and retries for Azure AI Language Service
+A token bucket sized to the pricing tier's transactions per second, adjusted
+with AIMD on throttling, plus jittered exponential retries that honor
+Retry-After.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+from config import (
+    MAX_RETRY_ATTEMPTS,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    get_settings
+)
+from instrumentation import get_instrumentation
+
+THROTTLE_STATUS_CODES = (429, 503)
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+def retry_after_seconds(error):
+    """
+    Read the server's requested delay from a throttling error.
+
+    Returns:
+        float: Seconds to wait, or None if the response does not say
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    for name, scale in (("retry-after-ms", 0.001), ("x-ms-retry-after-ms", 0.001), ("Retry-After", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                # HTTP-date form; fall back to exponential backoff
+                return None
+    return None
+
+def is_retryable(error):
+    """True for throttling, transient server errors and connection failures."""
+    # azure.core is only needed once something has failed; keep it off the import path
+    from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    return isinstance(error, HttpResponseError) and error.status_code in RETRYABLE_STATUS_CODES
+
+def is_throttle(error):
+    """True if the service is asking us to slow down."""
+    from azure.core.exceptions import HttpResponseError
+    return isinstance(error, HttpResponseError) and error.status_code in THROTTLE_STATUS_CODES
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate follows AIMD (additive increase, multiplicative decrease).
+
+    The rate grows by `increase` transactions per second after each success
+    and is multiplied by `decrease` on throttling, at most once per
+    `cooldown` seconds, never leaving [min_rate, max_rate]. A rate of 0 means
+    unlimited until the service first throttles, at which point the limiter
+    starts from the observed rate.
+
+    Args:
+        rate (float): Initial transactions per second, 0 for unlimited, defaults to config
+        max_rate (float): Upper bound for additive increase, defaults to rate
+        min_rate (float): Lower bound for multiplicative decrease
+        increase (float): Transactions per second added per success
+        decrease (float): Factor applied to the rate on throttling
+        cooldown (float): Minimum seconds between two decreases
+        burst (float): Seconds of traffic the bucket may release at once
+    """
+
+    def __init__(self, rate=None, max_rate=None, min_rate=0.5,
+                 increase=0.5, decrease=0.5, cooldown=1.0, burst=0.25):
+        if rate is None:
+            rate = get_settings()['RATE_LIMIT_TPS']
+        self.rate = float(rate) or None
+        self.max_rate = max_rate or self.rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.burst = burst
+        self._tokens = self._capacity()
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._recent = deque(maxlen=64)
+        self._lock = threading.Lock()
+
+    def _capacity(self):
+        return max(1.0, (self.rate or 0.0) * self.burst)
+
+    def try_acquire(self):
+        """
+        Take one token if available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one may be
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate is not None:
+                self._tokens = min(self._capacity(), self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1.0:
+                    return (1.0 - self._tokens) / self.rate
+                self._tokens -= 1.0
+            self._recent.append(now)
+            return 0.0
+
+    def on_success(self):
+        """Additively increase the rate after a successful call."""
+        with self._lock:
+            if self.rate is not None and (self.max_rate is None or self.rate < self.max_rate):
+                self.rate += self.increase
+                if self.max_rate is not None:
+                    self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self, retry_after=None):
+        """Multiplicatively decrease the rate and pause everyone for Retry-After."""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            # Throttles from requests already in flight belong to the same congestion event
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            if self.rate is None:
+                self.rate = self._observed_rate(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = 0.0
+            self._updated = now
+
+    def _observed_rate(self, now):
+        if len(self._recent) < 2 or now <= self._recent[0]:
+            return self.min_rate * 2
+        return len(self._recent) / (now - self._recent[0])
+
+class RequestScheduler:
+    """
+    Runs service calls through the rate limiter with jittered exponential retries.
+
+    Args:
+        limiter (AdaptiveRateLimiter): Shared limiter
+        max_retries (int): Retries after the first attempt, defaults to MAX_RETRY_ATTEMPTS - 1
+        backoff_base (float): Backoff for the first retry, in seconds
+        backoff_max (float): Upper bound for a single backoff
+        label (str): Resource name attached to instrumentation records
+        instrumentation (Instrumentation): Receives a record per call, defaults to the shared one
+    """
+
+    # Upper bound on a single wait so waiters notice rate increases promptly
+    _poll_interval = 0.05
+
+    def __init__(self, limiter=None, max_retries=MAX_RETRY_ATTEMPTS - 1,
+                 backoff_base=RETRY_BACKOFF_BASE, backoff_max=RETRY_BACKOFF_MAX,
+                 label=None, instrumentation=None):
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.label = label
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = 0
+        self.retries = 0
+        self.throttle_events = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt, error):
+        """Jittered exponential delay before retry number attempt + 1, at least Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        retry_after = retry_after_seconds(error)
+        return max(delay, retry_after or 0.0)
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def _leave_queue(self):
+        with self._lock:
+            self.queue_depth -= 1
+            self.requests += 1
+
+    def _on_error(self, attempt, error):
+        """Record a failed attempt; return the delay before retrying or re-raise."""
+        if is_throttle(error):
+            with self._lock:
+                self.throttle_events += 1
+            self.limiter.on_throttle(retry_after_seconds(error))
+        if not is_retryable(error) or attempt >= self.max_retries:
+            raise error
+        with self._lock:
+            self.retries += 1
+        return self.backoff_delay(attempt, error)
+
+    def _emit(self, func, started_at, started, queue_wait, attempt, args, kwargs, error=None):
+        """Hand a finished call to the instrumentation sinks, if any."""
+        if self.instrumentation.sinks:
+            self.instrumentation.emit(
+                getattr(func, "__name__", repr(func)), self.label, started_at,
+                time.perf_counter() - started, queue_wait, attempt,
+                kwargs.get("documents", args[0] if args else ()),
+                type(error).__name__ if error is not None else None
+            )
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call func under the rate limiter, retrying transient failures.
+
+        Raises:
+            The last error once retries are exhausted or for non-retryable errors
+        """
+        started_at, started = time.time(), time.perf_counter()
+        queue_wait = 0.0
+        attempt = 0
+        while True:
+            self._enter_queue()
+            waiting = time.perf_counter()
+            try:
+                delay = self.limiter.try_acquire()
+                while delay:
+                    time.sleep(min(delay, self._poll_interval))
+                    delay = self.limiter.try_acquire()
+            finally:
+                self._leave_queue()
+            queue_wait += time.perf_counter() - waiting
+            try:
+                result = func(*args, **kwargs)
+            except Exception as error:
+                try:
+                    delay = self._on_error(attempt, error)
+                except Exception:
+                    self._emit(func, started_at, started, queue_wait, attempt, args, kwargs, error)
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.on_success()
+            self._emit(func, started_at, started, queue_wait, attempt, args, kwargs)
+            return result
+
+    async def call_async(self, func, *args, **kwargs):
+        """Async version of call() for coroutine functions."""
+        import asyncio
+        started_at, started = time.time(), time.perf_counter()
+        queue_wait = 0.0
+        attempt = 0
+        while True:
+            self._enter_queue()
+            waiting = time.perf_counter()
+            try:
+                delay = self.limiter.try_acquire()
+                while delay:
+                    await asyncio.sleep(min(delay, self._poll_interval))
+                    delay = self.limiter.try_acquire()
+            finally:
+                self._leave_queue()
+            queue_wait += time.perf_counter() - waiting
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as error:
+                try:
+                    delay = self._on_error(attempt, error)
+                except Exception:
+                    self._emit(func, started_at, started, queue_wait, attempt, args, kwargs, error)
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.limiter.on_success()
+            self._emit(func, started_at, started, queue_wait, attempt, args, kwargs)
+            return result
+
+    @property
+    def metrics(self):
+        """Queue depth, throttle and retry counters plus the current rate."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttle_events": self.throttle_events,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "current_rate": self.limiter.rate
+            }
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def get_request_scheduler():
+    """Get the process-wide request scheduler configured in config.py."""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+    return _default_scheduler
@@ -0,0 +1,359 @@
+"""
+Bulk PII redaction for Azure AI Language Service
+Streams documents through PII recognition and writes redacted text using
+mask, hash or category-placeholder strategies. A local regex pre-pass
+catches obvious patterns so documents without other PII are never sent.
+
+Usage:
+    python redaction.py tickets.jsonl --output redacted.jsonl --strategy placeholder
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+from collections import namedtuple
+from itertools import islice
+
+from batching import DISPATCH_WINDOW
+from chunking import analyze_chunked
+from config import get_settings
+from local_language import LATIN_STOPWORDS
+
+STRATEGIES = ("mask", "hash", "placeholder")
+
+# Categories use the service's names so local and remote spans look the same downstream
+LOCAL_PATTERNS = (
+    ("USSocialSecurityNumber", re.compile(r"\b\d{3}-\d{2}-\d{4}\b")),
+    ("CreditCardNumber", re.compile(r"\b\d(?:[ -]?\d){12,18}\b")),
+    ("Email", re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")),
+    ("PhoneNumber", re.compile(r"(?:\+1[ .-]?)?(?:\(\d{3}\)|\b\d{3})[ .-]?\d{3}[ .-]\d{4}\b"))
+)
+
+# What the service could still flag once local matches are removed: digits,
+# "@", or a capitalized word in mid-sentence (names, places, organizations)
+_residual_pii = re.compile(r"\d|@|(?<=[^\s.!?:;\"'(\[]\s)[A-Z](?=\w)")
+_capitalized = re.compile(r"\b[A-Z]\w+")
+
+# Sentence-initial words that are not names; any other capitalized word is sent
+COMMON_WORDS = {word for words in LATIN_STOPWORDS.values() for word in words} | set(
+    "a an i we he she my our your their his her its there here these those then when "
+    "if but so also please thanks thank hi hello dear yes no all some".split()
+)
+
+PiiSpan = namedtuple("PiiSpan", "offset length category confidence_score source")
+
+def luhn_valid(number):
+    """True if the digits of number pass the Luhn checksum used by card numbers."""
+    digits = [int(character) for character in number if character.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        if position % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+def scan_local(text):
+    """
+    Find obvious PII with regular expressions.
+
+    Args:
+        text (str): Document text
+
+    Returns:
+        list: Non-overlapping PiiSpan objects ordered by offset
+    """
+    spans = []
+    taken = []
+    for category, pattern in LOCAL_PATTERNS:
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if category == "CreditCardNumber" and not luhn_valid(match.group()):
+                continue
+            # Earlier, more specific patterns win overlapping text
+            if any(start < other_end and other_start < end for other_start, other_end in taken):
+                continue
+            taken.append((start, end))
+            spans.append(PiiSpan(start, end - start, category, 1.0, "local"))
+    return sorted(spans)
+
+def needs_service(text, local_spans):
+    """
+    Decide whether a document may hold PII the local pre-pass cannot find.
+
+    Args:
+        text (str): Document text
+        local_spans (list): Spans already found by scan_local()
+
+    Returns:
+        bool: False if the document can be redacted without calling the service
+    """
+    position = 0
+    for start, end in [(span.offset, span.offset + span.length) for span in local_spans] + [(len(text), None)]:
+        if _residual_pii.search(text, position, start):
+            return True
+        if any(word.lower() not in COMMON_WORDS for word in _capitalized.findall(text, position, start)):
+            return True
+        position = end
+    # Scripts without letter case hide names from the capitalization check
+    return any(character.isalpha() and character.lower() == character.upper() for character in text)
+
+def merge_spans(spans):
+    """
+    Merge overlapping spans so each character is redacted once.
+
+    Returns:
+        list: Non-overlapping spans ordered by offset; a merged span keeps the
+        category of its longest member
+    """
+    merged = []
+    for span in sorted(spans, key=lambda span: (span.offset, -span.length)):
+        if merged and span.offset < merged[-1].offset + merged[-1].length:
+            previous = merged[-1]
+            end = max(previous.offset + previous.length, span.offset + span.length)
+            category = previous.category if previous.length >= span.length else span.category
+            merged[-1] = previous._replace(length=end - previous.offset, category=category,
+                                           source=previous.source if previous.source == span.source else "both")
+        else:
+            merged.append(span)
+    return merged
+
+class RedactedDocument:
+    """
+    Redaction output for one document.
+
+    `text` is the redacted text, or None if the service failed for the
+    document; spans never carry the original PII text.
+    """
+
+    def __init__(self, id, text, spans, sent, error=None):
+        self.id = id
+        self.text = text
+        self.spans = spans
+        self.sent = sent
+        self.error = error
+
+    @property
+    def is_error(self):
+        return self.error is not None
+
+    def to_dict(self):
+        """JSON-serializable form for output files."""
+        if self.is_error:
+            return {"id": self.id, "error": self.error}
+        return {
+            "id": self.id,
+            "text": self.text,
+            "entities": [
+                {"category": span.category, "offset": span.offset,
+                 "length": span.length, "source": span.source}
+                for span in self.spans
+            ]
+        }
+
+    def __repr__(self):
+        return f"RedactedDocument(id={self.id!r}, spans={len(self.spans)}, sent={self.sent})"
+
+class PiiRedactor:
+    """
+    Redacts PII found by the local pre-pass and the service.
+
+    Args:
+        strategy (str): "mask" (one mask character per character), "hash"
+            (salted SHA-256 prefix, stable across documents) or
+            "placeholder" (the category in brackets), defaults to config
+        prepass (bool): Run the regex pre-pass and skip the service for
+            documents with nothing else worth sending
+        local_only (bool): Never call the service; redact regex matches only
+        min_confidence (float): Ignore service entities below this score
+        salt (str): Secret salt for the hash strategy; unsalted hashes of
+            card or social security numbers can be reversed by brute force,
+            defaults to config
+        mask_character (str): Character used by the mask strategy
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+
+    Raises:
+        ValueError: If the strategy is not supported, or is "hash" without a salt
+    """
+
+    def __init__(self, strategy=None, prepass=True, local_only=False,
+                 min_confidence=0.0, salt=None, mask_character="*", client=None):
+        settings = get_settings()
+        strategy = strategy or settings['REDACTION_STRATEGY']
+        if salt is None:
+            salt = settings['REDACTION_SALT']
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported redaction strategy: {strategy}")
+        if strategy == "hash" and not salt:
+            raise ValueError("The hash strategy needs a secret salt: set AZURE_LANGUAGE_REDACTION_SALT")
+        self.strategy = strategy
+        self.prepass = prepass or local_only
+        self.local_only = local_only
+        self.min_confidence = min_confidence
+        self.salt = salt.encode("utf-8")
+        self.mask_character = mask_character
+        self.client = client
+        self.documents = 0
+        self.sent_documents = 0
+
+    def replacement(self, original, category):
+        """Text that replaces one PII span."""
+        if self.strategy == "mask":
+            return self.mask_character * len(original)
+        if self.strategy == "placeholder":
+            return f"[{category}]"
+        digest = hashlib.sha256(self.salt + original.encode("utf-8")).hexdigest()
+        return f"[{category}:{digest[:16]}]"
+
+    def apply(self, text, spans):
+        """
+        Redact non-overlapping spans in a single pass over the text.
+
+        Args:
+            text (str): Original text
+            spans (list): Spans from merge_spans(), ordered by offset
+
+        Returns:
+            str: Redacted text
+        """
+        pieces = []
+        position = 0
+        for span in spans:
+            end = span.offset + span.length
+            pieces.append(text[position:span.offset])
+            pieces.append(self.replacement(text[span.offset:end], span.category))
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def _redact_window(self, window, options):
+        local = []
+        remote = []
+        for index, document in window:
+            text = document["text"]
+            spans = scan_local(text) if self.prepass else []
+            local.append(spans)
+            if not self.local_only and (not self.prepass or needs_service(text, spans)):
+                remote.append(index)
+
+        found = {}
+        if remote:
+            documents = [window[index][1] for index in remote]
+            # Never let raw PII and its entities reach the (possibly on-disk) result cache
+            results = analyze_chunked("recognize_pii_entities", documents, client=self.client,
+                                      **dict(options, cache=False))
+            found = dict(zip(remote, results))
+
+        redacted = []
+        for (index, document), spans in zip(window, local):
+            result = found.get(index)
+            if result is not None and result.is_error:
+                # Fail closed: never emit text the service could not check
+                redacted.append(RedactedDocument(document["id"], None, [], True, result.error.message))
+                continue
+            if result is not None:
+                spans = spans + [
+                    PiiSpan(entity.offset, entity.length, entity.category, entity.confidence_score, "service")
+                    for entity in result.entities if entity.confidence_score >= self.min_confidence
+                ]
+            spans = merge_spans(spans)
+            redacted.append(RedactedDocument(document["id"], self.apply(document["text"], spans),
+                                             spans, result is not None))
+        self.documents += len(window)
+        self.sent_documents += len(remote)
+        return redacted
+
+    def iter_redact(self, documents, **kwargs):
+        """
+        Redact a stream of documents a window at a time.
+
+        Args:
+            documents (iterable): Strings or dicts with "id", "text" and an optional "language"
+            **kwargs: Passed through to recognize_pii_entities
+
+        Yields:
+            RedactedDocument: In input order
+        """
+        indexed = (
+            {"id": str(index), "text": document} if isinstance(document, str) else document
+            for index, document in enumerate(documents)
+        )
+        while True:
+            window = list(enumerate(islice(indexed, DISPATCH_WINDOW)))
+            if not window:
+                break
+            yield from self._redact_window(window, kwargs)
+
+    def redact(self, documents, **kwargs):
+        """
+        Redact documents.
+
+        Returns:
+            list: RedactedDocument objects in input order
+        """
+        return list(self.iter_redact(documents, **kwargs))
+
+def main(argv=None):
+    from corpus_pipeline import READERS, JsonlSink, detect_format, load_checkpoint, save_checkpoint
+
+    parser = argparse.ArgumentParser(description="Redact PII from a corpus with Azure AI Language Service")
+    parser.add_argument("input", help="Input file (.jsonl, .csv or plain text)")
+    parser.add_argument("--output", required=True, help="Output .jsonl file")
+    parser.add_argument("--strategy", choices=STRATEGIES, help="Defaults to AZURE_LANGUAGE_REDACTION_STRATEGY")
+    parser.add_argument("--input-format", choices=sorted(READERS))
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--language-field", default="language")
+    parser.add_argument("--min-confidence", type=float, default=0.0)
+    parser.add_argument("--local-only", action="store_true", help="Only redact regex matches; never call the service")
+    parser.add_argument("--no-prepass", action="store_true", help="Send every document to the service")
+    parser.add_argument("--checkpoint", help="Checkpoint file for resuming interrupted runs")
+    parser.add_argument("--resume", action="store_true", help="Resume from --checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+
+    try:
+        redactor = PiiRedactor(strategy=args.strategy, prepass=not args.no_prepass,
+                               local_only=args.local_only, min_confidence=args.min_confidence)
+    except ValueError as e:
+        parser.error(str(e))
+    checkpoint = load_checkpoint(args.checkpoint) if args.resume else None
+    done = checkpoint["records"] if checkpoint else 0
+    sink = JsonlSink(args.output, checkpoint["sink_state"] if checkpoint else None)
+    records = READERS[args.input_format or detect_format(args.input)](
+        args.input, text_field=args.text_field, id_field=args.id_field,
+        language_field=args.language_field, skip=done
+    )
+    documents = (
+        {"id": record["id"], "text": record["text"], **({"language": record["language"]} if record["language"] else {})}
+        for record in records
+    )
+
+    try:
+        for count, document in enumerate(redactor.iter_redact(documents), 1):
+            sink.write([document.to_dict()])
+            if args.checkpoint and count % DISPATCH_WINDOW == 0:
+                save_checkpoint(args.checkpoint, done + count, sink.flush())
+    except Exception as e:
+        print(f"❌ Redaction failed: {str(e)}")
+        if args.checkpoint:
+            print("💡 Re-run with --resume to continue from the last checkpoint")
+        return 1
+    finally:
+        state = sink.close()
+    if args.checkpoint:
+        save_checkpoint(args.checkpoint, done + redactor.documents, state)
+
+    print(f"✅ Redacted {redactor.documents} documents to {args.output}")
+    print(f"📊 Sent {redactor.sent_documents} to the service, "
+          f"{redactor.documents - redactor.sent_documents} handled locally")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Content-addressed result cache for Azure AI Language Service
+Serves repeated analyses of identical text from an in-memory LRU tier and an
+optional SQLite tier that survives restarts, without touching the network.
+"""
+
+import copy
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import get_settings
+
+def document_language(document, options):
+    """Get the language (or country) hint that applies to a document."""
+    if isinstance(document, dict):
+        hint = document.get("language") or document.get("country_hint")
+    else:
+        hint = getattr(document, "language", None) or getattr(document, "country_hint", None)
+    return hint or options.get("language") or options.get("country_hint")
+
+def relabel_result(result, document_id):
+    """Return a shallow copy of an SDK result carrying a different document id."""
+    result = copy.copy(result)
+    result.id = document_id
+    return result
+
+def cache_key(text, operation, language=None, model_version=None, options=None):
+    """
+    Build the content-addressed key for an analysis result.
+    
+    Args:
+        text (str): Document text
+        operation (str): Client operation name
+        language (str): Language or country hint sent with the document
+        model_version (str): Requested model version, defaults to "latest"
+        options (dict): Other operation options that change the result
+        
+    Returns:
+        str: SHA-256 hex digest
+    """
+    material = json.dumps(
+        [operation, language, model_version or "latest", options or {}, text],
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    Two-tier result cache with LRU/TTL eviction and hit/miss counters.
+    
+    Args:
+        max_entries (int): Maximum number of results held in memory, defaults to config
+        ttl (float): Seconds a result stays valid, 0 for no expiry, defaults to config
+        path (str): SQLite file for the persistent tier, None for memory only
+    """
+
+    def __init__(self, max_entries=None, ttl=None, path=None):
+        settings = get_settings()
+        if max_entries is None:
+            max_entries = settings['RESULT_CACHE_SIZE']
+        if ttl is None:
+            ttl = settings['RESULT_CACHE_TTL']
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, expires_at REAL, value BLOB)"
+            )
+            self._db.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    expires_at, blob = row
+                    if expires_at is None or expires_at > now:
+                        value = pickle.loads(blob)
+                        self._remember(key, expires_at, value)
+                        self.hits += 1
+                        return value
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.evictions += 1
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store a value in the memory tier and, if configured, on disk."""
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                )
+                self._db.commit()
+
+    def _remember(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, operation, text, document, document_id, options):
+        """
+        Get a cached SDK result for a document, re-labelled with its id.
+        
+        Returns:
+            Result object or None on a miss
+        """
+        key = self.key_for(operation, text, document, options)
+        result = self.get(key)
+        if result is None:
+            return None
+        return relabel_result(result, document_id)
+
+    def store(self, operation, text, document, options, result):
+        """Cache a successful SDK result for a document; errors are not cached."""
+        if not result.is_error:
+            self.set(self.key_for(operation, text, document, options), result)
+
+    @staticmethod
+    def key_for(operation, text, document, options):
+        """Build the cache key for a document and its operation options."""
+        options = dict(options)
+        model_version = options.pop("model_version", None)
+        language = document_language(document, options)
+        options.pop("language", None)
+        options.pop("country_hint", None)
+        return cache_key(text, operation, language, model_version, options)
+
+    @property
+    def stats(self):
+        """Hit, miss and eviction counters plus the current memory size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries)
+            }
+
+    def clear(self):
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self):
+        """Close the persistent tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """
+    Get the process-wide result cache configured in config.py.
+    
+    Returns:
+        ResultCache: Shared cache, or None if caching is disabled
+    """
+    global _default_cache
+    settings = get_settings()
+    if not settings['RESULT_CACHE_ENABLED']:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(path=settings['RESULT_CACHE_PATH'])
+    return _default_cache
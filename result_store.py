@@ -0,0 +1,331 @@
+"""
+Compact columnar result store for Azure AI Language Service
+Materializes SDK result objects into NumPy columns with dictionary-encoded
+labels, categories and languages, exportable to Arrow and Parquet.
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+SENTIMENT_LABELS = ("positive", "neutral", "negative", "mixed")
+
+# Table -> column -> dtype, or the name of the string dictionary that encodes it
+SCHEMAS = {
+    "sentiment": {
+        "doc": np.int64, "label": "label",
+        "positive": np.float32, "neutral": np.float32, "negative": np.float32
+    },
+    "sentences": {
+        "doc": np.int64, "label": "label",
+        "positive": np.float32, "neutral": np.float32, "negative": np.float32,
+        "offset": np.int32, "length": np.int32
+    },
+    "languages": {
+        "doc": np.int64, "language": "language", "confidence": np.float32
+    },
+    "entities": {
+        "doc": np.int64, "category": "category", "subcategory": "category",
+        "offset": np.int32, "length": np.int32, "confidence": np.float32
+    },
+    "pii_entities": {
+        "doc": np.int64, "category": "category", "subcategory": "category",
+        "offset": np.int32, "length": np.int32, "confidence": np.float32
+    },
+    "key_phrases": {
+        "doc": np.int64, "phrase": "phrase"
+    },
+    "errors": {
+        "doc": np.int64, "operation": "operation", "code": "error"
+    }
+}
+
+# Client operation -> tables it fills
+OPERATION_TABLES = {
+    "analyze_sentiment": "sentiment",
+    "detect_language": "languages",
+    "recognize_entities": "entities",
+    "recognize_pii_entities": "pii_entities",
+    "extract_key_phrases": "key_phrases"
+}
+
+class StringDictionary:
+    """Interns strings as dense int32 codes; None is encoded as -1."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values=()):
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes):
+        """Map an array of codes back to strings (None for -1)."""
+        lookup = np.array(self.values + [None], dtype=object)
+        return lookup[np.asarray(codes)]
+
+    def __len__(self):
+        return len(self.values)
+
+class Column:
+    """Growable NumPy array; views taken earlier stay valid after it grows."""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        count = len(values)
+        needed = self.size + count
+        if needed > len(self.data):
+            grown = np.empty(max(needed, len(self.data) * 2), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:needed] = values
+        self.size = needed
+
+    def view(self):
+        return self.data[:self.size]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+class ColumnTable:
+    """
+    Append-only table of equally long columns.
+
+    Rows are returned as namedtuples, which carry no per-instance __dict__.
+    """
+
+    def __init__(self, name, schema, dictionaries):
+        self.name = name
+        self.encodings = {
+            column: dictionaries[kind] for column, kind in schema.items() if isinstance(kind, str)
+        }
+        self.columns = {
+            column: Column(np.int32 if isinstance(kind, str) else kind)
+            for column, kind in schema.items()
+        }
+        self.Row = namedtuple(f"{name.title().replace('_', '')}Row", list(schema))
+
+    def extend(self, rows):
+        """Append rows given as tuples in schema order; strings are encoded here."""
+        if not rows:
+            return
+        for column, values in zip(self.columns, zip(*rows)):
+            encoding = self.encodings.get(column)
+            if encoding is not None:
+                values = [encoding.code(value) for value in values]
+            self.columns[column].extend(values)
+
+    def __len__(self):
+        return next(iter(self.columns.values())).size
+
+    def column(self, name, decode=False):
+        """
+        Get a column as a NumPy array.
+
+        Args:
+            name (str): Column name
+            decode (bool): Return strings instead of dictionary codes
+
+        Returns:
+            numpy.ndarray: Zero-copy view of the stored data, or decoded strings
+        """
+        values = self.columns[name].view()
+        if decode and name in self.encodings:
+            return self.encodings[name].decode(values)
+        return values
+
+    def row(self, index):
+        """Get one decoded row."""
+        values = []
+        for name, column in self.columns.items():
+            value = column.data[index]
+            encoding = self.encodings.get(name)
+            if encoding is not None:
+                value = encoding.values[value] if value >= 0 else None
+            values.append(value.item() if hasattr(value, "item") else value)
+        return self.Row(*values)
+
+    def __iter__(self):
+        return (self.row(index) for index in range(len(self)))
+
+    def to_arrow(self):
+        """
+        Export to a pyarrow Table.
+
+        Numeric columns are wrapped without copying; encoded columns become
+        Arrow dictionary arrays over the same codes.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("Arrow export requires pyarrow: pip install pyarrow")
+        arrays = {}
+        for name, column in self.columns.items():
+            values = column.view()
+            encoding = self.encodings.get(name)
+            if encoding is None:
+                arrays[name] = pyarrow.array(values)
+            else:
+                indices = pyarrow.array(values, mask=values < 0)
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                    indices, pyarrow.array(encoding.values, type=pyarrow.string())
+                )
+        return pyarrow.table(arrays)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+class ResultStore:
+    """
+    Columnar store for analysis results across millions of documents.
+
+    Each operation fills its own table keyed by the document's input
+    position ("doc"); failed documents go to the errors table. The SDK
+    objects can be dropped as soon as they have been added.
+
+        store = ResultStore()
+        for batch in batches:
+            store.add("analyze_sentiment", analyze_batched("analyze_sentiment", batch))
+        store.write_parquet("results/")
+
+    Args:
+        keep_sentences (bool): Also store per-sentence sentiment
+    """
+
+    def __init__(self, keep_sentences=True):
+        self.keep_sentences = keep_sentences
+        self.dictionaries = {
+            "label": StringDictionary(SENTIMENT_LABELS),
+            "language": StringDictionary(),
+            "category": StringDictionary(),
+            "phrase": StringDictionary(),
+            "operation": StringDictionary(OPERATION_TABLES),
+            "error": StringDictionary()
+        }
+        self.tables = {
+            name: ColumnTable(name, schema, self.dictionaries) for name, schema in SCHEMAS.items()
+        }
+        self._next_doc = {}
+
+    def __getitem__(self, table):
+        return self.tables[table]
+
+    def add(self, operation, results, first_doc=None):
+        """
+        Materialize one batch of SDK results.
+
+        Args:
+            operation (str): Client operation that produced the results
+            results (list): Result or DocumentError objects in input order
+            first_doc (int): Input position of the first result, defaults to
+                continuing after the previous batch of this operation
+
+        Raises:
+            ValueError: If the operation is not supported
+        """
+        if operation not in OPERATION_TABLES:
+            raise ValueError(f"Unsupported operation: {operation}")
+        if first_doc is None:
+            first_doc = self._next_doc.get(operation, 0)
+        self._next_doc[operation] = first_doc + len(results)
+
+        rows = []
+        sentences = []
+        errors = []
+        for doc, result in enumerate(results, start=first_doc):
+            if result.is_error:
+                errors.append((doc, operation, result.error.code))
+            elif operation == "analyze_sentiment":
+                scores = result.confidence_scores
+                rows.append((doc, result.sentiment, scores.positive, scores.neutral, scores.negative))
+                if self.keep_sentences:
+                    for sentence in result.sentences:
+                        scores = sentence.confidence_scores
+                        sentences.append((doc, sentence.sentiment, scores.positive, scores.neutral,
+                                          scores.negative, sentence.offset or 0, sentence.length or 0))
+            elif operation == "detect_language":
+                language = result.primary_language
+                rows.append((doc, language.iso6391_name, language.confidence_score))
+            elif operation == "extract_key_phrases":
+                rows.extend((doc, phrase) for phrase in result.key_phrases)
+            else:
+                rows.extend(
+                    (doc, entity.category, entity.subcategory, entity.offset,
+                     entity.length, entity.confidence_score)
+                    for entity in result.entities
+                )
+        self.tables[OPERATION_TABLES[operation]].extend(rows)
+        self.tables["sentences"].extend(sentences)
+        self.tables["errors"].extend(errors)
+
+    def add_analyses(self, analyses, first_doc=None):
+        """Materialize DocumentAnalysis objects from multi_analysis.analyze_documents()."""
+        from multi_analysis import FEATURE_OPERATIONS
+        analyses = list(analyses)
+        for feature, operation in FEATURE_OPERATIONS.items():
+            if not any(feature in analysis.features for analysis in analyses):
+                continue
+            start = first_doc if first_doc is not None else self._next_doc.get(operation, 0)
+            for offset, analysis in enumerate(analyses):
+                result = getattr(analysis, feature)
+                if result is not None:
+                    self.add(operation, [result], start + offset)
+                elif feature in analysis.errors:
+                    self.tables["errors"].extend(
+                        [(start + offset, operation, analysis.errors[feature].code)]
+                    )
+            self._next_doc[operation] = start + len(analyses)
+
+    def to_arrow(self, table):
+        """Export one table to a pyarrow Table."""
+        return self.tables[table].to_arrow()
+
+    def write_parquet(self, directory):
+        """
+        Write every non-empty table to <directory>/<table>.parquet.
+
+        Returns:
+            list: Paths written
+        """
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, table in self.tables.items():
+            if len(table):
+                path = os.path.join(directory, f"{name}.parquet")
+                pyarrow.parquet.write_table(table.to_arrow(), path)
+                paths.append(path)
+        return paths
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by columns and string dictionaries."""
+        strings = sum(
+            sum(len(value) for value in dictionary.values) for dictionary in self.dictionaries.values()
+        )
+        return sum(table.nbytes for table in self.tables.values()) + strings
+
+    def __repr__(self):
+        sizes = ", ".join(f"{name}={len(table)}" for name, table in self.tables.items() if len(table))
+        return f"ResultStore({sizes})"
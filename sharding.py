@@ -0,0 +1,211 @@
+"""
+Multi-resource sharding for Azure AI Language Service
+Spreads requests across several endpoint/key pairs with least-outstanding or
+weighted round-robin selection, per-resource rate limits and circuit breaking.
+"""
+
+import threading
+import time
+
+from config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    MAX_RETRY_ATTEMPTS,
+    get_language_resources,
+    get_text_analytics_client
+)
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler, is_retryable
+
+STRATEGIES = ("least_outstanding", "weighted_round_robin")
+
+class Resource:
+    """One endpoint/key pair with its client, rate limiter and health state."""
+
+    def __init__(self, endpoint, client, weight=1.0):
+        self.endpoint = endpoint
+        self.client = client
+        self.weight = weight
+        # Each resource has its own quota; retries are handled by the dispatcher
+        self.scheduler = RequestScheduler(AdaptiveRateLimiter(), max_retries=0, label=endpoint)
+        self.outstanding = 0
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.current_weight = 0.0
+
+    def is_available(self, now):
+        """False while the circuit breaker is open."""
+        return now >= self.open_until
+
+    @property
+    def health(self):
+        """Counters describing this resource."""
+        return {
+            "endpoint": self.endpoint,
+            "outstanding": self.outstanding,
+            "successes": self.successes,
+            "failures": self.failures,
+            "circuit_open": time.monotonic() < self.open_until,
+            "rate": self.scheduler.limiter.rate,
+            "throttle_events": self.scheduler.throttle_events
+        }
+
+class ShardedDispatcher:
+    """
+    Dispatches client operations across several Language Service resources.
+    
+    A resource whose calls fail `failure_threshold` times in a row has its
+    circuit opened for `reset_timeout` seconds, during which it receives no
+    traffic; afterwards a single success closes it again. Failed calls are
+    retried on the next selected resource. Only throttling, server and
+    connection failures count: client errors such as an invalid batch say
+    nothing about the resource's health and are raised without penalty.
+    
+    Args:
+        resources (list): (endpoint, client, weight) tuples; weights must be positive
+        strategy (str): "least_outstanding" or "weighted_round_robin"
+        failure_threshold (int): Consecutive failures that open a circuit
+        reset_timeout (float): Seconds a circuit stays open
+        max_retries (int): Retries after the first attempt, across resources,
+            defaults to MAX_RETRY_ATTEMPTS - 1
+    """
+
+    def __init__(self, resources, strategy="least_outstanding",
+                 failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout=CIRCUIT_RESET_TIMEOUT, max_retries=MAX_RETRY_ATTEMPTS - 1):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported strategy: {strategy}")
+        if not resources:
+            raise ValueError("At least one resource is required")
+        if any(weight <= 0 for _, _, weight in resources):
+            raise ValueError("Resource weights must be positive")
+        self.resources = [Resource(endpoint, client, weight) for endpoint, client, weight in resources]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_retries = max_retries
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def select(self):
+        """Pick a resource for the next call and count it as outstanding."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [resource for resource in self.resources if resource.is_available(now)]
+            if not candidates:
+                # Every circuit is open: probe the one that will close first
+                candidates = [min(self.resources, key=lambda resource: resource.open_until)]
+
+            if self.strategy == "least_outstanding":
+                # Rotate the starting point so ties are spread evenly
+                self._next = (self._next + 1) % len(candidates)
+                rotated = candidates[self._next:] + candidates[:self._next]
+                resource = min(rotated, key=lambda r: (r.outstanding + 1) / r.weight)
+            else:
+                # Smooth weighted round-robin
+                total = sum(resource.weight for resource in candidates)
+                for candidate in candidates:
+                    candidate.current_weight += candidate.weight
+                resource = max(candidates, key=lambda r: r.current_weight)
+                resource.current_weight -= total
+
+            resource.outstanding += 1
+            return resource
+
+    def _release(self, resource, error=None):
+        with self._lock:
+            resource.outstanding -= 1
+            if error is not None and not is_retryable(error):
+                # The request was at fault, not the resource
+                return
+            if error is None:
+                resource.successes += 1
+                resource.consecutive_failures = 0
+                resource.open_until = 0.0
+                return
+            resource.failures += 1
+            resource.consecutive_failures += 1
+            if resource.consecutive_failures >= self.failure_threshold:
+                resource.open_until = time.monotonic() + self.reset_timeout
+
+    def _should_retry(self, attempt, error):
+        return is_retryable(error) and attempt < self.max_retries
+
+    def _retry_delay(self, attempt, resource, error):
+        """Fail over immediately while another resource is healthy, else back off."""
+        now = time.monotonic()
+        if any(other is not resource and other.is_available(now) for other in self.resources):
+            return 0.0
+        return resource.scheduler.backoff_delay(attempt, error)
+
+    def call(self, operation, *args, **kwargs):
+        """
+        Call a client operation on the selected resource, failing over on errors.
+        
+        Args:
+            operation (str): Client method name, e.g. "analyze_sentiment"
+            *args, **kwargs: Passed through to the client method
+        """
+        attempt = 0
+        while True:
+            resource = self.select()
+            try:
+                result = resource.scheduler.call(getattr(resource.client, operation), *args, **kwargs)
+            except Exception as error:
+                self._release(resource, error)
+                if not self._should_retry(attempt, error):
+                    raise
+                time.sleep(self._retry_delay(attempt, resource, error))
+                attempt += 1
+                continue
+            self._release(resource)
+            return result
+
+    async def call_async(self, operation, *args, **kwargs):
+        """Async version of call() for aio clients."""
+        import asyncio
+        attempt = 0
+        while True:
+            resource = self.select()
+            try:
+                result = await resource.scheduler.call_async(
+                    getattr(resource.client, operation), *args, **kwargs
+                )
+            except Exception as error:
+                self._release(resource, error)
+                if not self._should_retry(attempt, error):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, resource, error))
+                attempt += 1
+                continue
+            self._release(resource)
+            return result
+
+    @property
+    def health(self):
+        """Per-resource health and load."""
+        with self._lock:
+            return [resource.health for resource in self.resources]
+
+_default_dispatcher = None
+_default_dispatcher_lock = threading.Lock()
+
+def get_dispatcher():
+    """
+    Get the process-wide dispatcher over the shared clients of every resource.
+    
+    Returns:
+        ShardedDispatcher: Shared dispatcher, or None if only one resource is configured
+    """
+    global _default_dispatcher
+    resources = get_language_resources()
+    if len(resources) < 2:
+        return None
+    with _default_dispatcher_lock:
+        if _default_dispatcher is None:
+            _default_dispatcher = ShardedDispatcher([
+                (endpoint, get_text_analytics_client(endpoint, key), weight)
+                for endpoint, key, weight in resources
+            ])
+    return _default_dispatcher
@@ -5,9 +5,8 @@ This script tests the connection to Azure Language Service and verifies credenti
 
 import os
 import sys
-from config import get_language_credentials
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
+from batching import analyze_batched
+from config import get_language_credentials, get_text_analytics_client
 
 def test_language_connection():
     """Test connection to Azure Language Service"""
@@ -25,17 +24,14 @@ def test_language_connection():
         
         # Create client
         print("\n🔗 Creating Language Service client...")
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
+        client = get_text_analytics_client(endpoint, key)
         
         # Test with a simple text analysis
         print("\n🧪 Testing connection with sample text...")
         sample_text = "Hello, this is a test of Azure Language Service!"
         
-        # Detect language
-        response = client.detect_language(documents=[sample_text])
+        # Detect language (bypass the result cache so the service is really called)
+        response = analyze_batched("detect_language", [sample_text], client=client, cache=False)
         
         if response:
             print("✅ Connection successful!")
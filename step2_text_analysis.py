@@ -5,9 +5,8 @@ key phrase extraction, and entity recognition.
 """
 
 import os
-from config import get_language_credentials
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
+from batching import analyze_batched
+from streaming import stream_sentiment
 
 def analyze_text_sentiment():
     """Analyze sentiment of sample texts"""
@@ -16,13 +15,6 @@ def analyze_text_sentiment():
         print("🧠 AZURE LANGUAGE SERVICE - SENTIMENT ANALYSIS")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Sample texts for analysis
         sample_texts = [
             "I love using Azure AI services! They make development so much easier.",
@@ -37,13 +29,13 @@ def analyze_text_sentiment():
         
         print("\n🔍 Analyzing sentiment...")
         
-        # Analyze sentiment
-        response = client.analyze_sentiment(documents=sample_texts)
-        
         print("\n📊 SENTIMENT ANALYSIS RESULTS:")
         print("-" * 40)
         
-        for idx, doc in enumerate(response):
+        # Stream results: each document is printed as soon as its sub-batch returns
+        response = [None] * len(sample_texts)
+        for idx, doc in stream_sentiment(sample_texts, max_documents=2):
+            response[idx] = doc
             if not doc.is_error:
                 print(f"\n📄 Text {idx + 1}:")
                 print(f"   Sentiment: {doc.sentiment.upper()}")
@@ -57,9 +49,19 @@ def analyze_text_sentiment():
                     print(f"   Sentence-level sentiment:")
                     for sentence in doc.sentences:
                         print(f"     - '{sentence.text[:50]}...' → {sentence.sentiment}")
+                        for opinion in sentence.mined_opinions or []:
+                            assessments = ", ".join(a.text for a in opinion.assessments)
+                            print(f"       💬 {opinion.target.text}: {assessments} ({opinion.target.sentiment})")
             else:
                 print(f"❌ Error analyzing text {idx + 1}: {doc.error}")
         
+        # Corpus-level view of the same results (NumPy is only loaded here)
+        from analytics import aggregate, print_report
+        from result_store import ResultStore
+        store = ResultStore()
+        store.add("analyze_sentiment", response)
+        print_report(aggregate(store).report())
+        
         return True
         
     except Exception as e:
@@ -73,13 +75,6 @@ def extract_key_phrases():
         print("🔑 KEY PHRASE EXTRACTION")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Sample text for key phrase extraction
         sample_text = """
         Azure AI Language Service is a cloud-based service that provides 
@@ -93,7 +88,7 @@ def extract_key_phrases():
         print("\n🔍 Extracting key phrases...")
         
         # Extract key phrases
-        response = client.extract_key_phrases(documents=[sample_text])
+        response = analyze_batched("extract_key_phrases", [sample_text])
         
         if response and not response[0].is_error:
             print("\n🔑 EXTRACTED KEY PHRASES:")
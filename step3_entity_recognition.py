@@ -4,9 +4,8 @@ This script demonstrates named entity recognition and language detection capabil
 """
 
 import os
-from config import get_language_credentials
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
+from batching import analyze_batched
+from chunking import analyze_chunked
 
 def recognize_entities():
     """Recognize named entities in text"""
@@ -15,13 +14,6 @@ def recognize_entities():
         print("🏷️ AZURE LANGUAGE SERVICE - ENTITY RECOGNITION")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Sample text with various entities
         sample_text = """
         Microsoft Corporation was founded by Bill Gates and Paul Allen on April 4, 1975.
@@ -35,24 +27,21 @@ def recognize_entities():
         print("\n🔍 Recognizing named entities...")
         
         # Recognize entities
-        response = client.recognize_entities(documents=[sample_text])
+        response = analyze_chunked("recognize_entities", [sample_text])
         
         if response and not response[0].is_error:
             print("\n🏷️ RECOGNIZED ENTITIES:")
             print("-" * 40)
             
             # Group entities by category
-            entities_by_category = {}
-            for entity in response[0].entities:
-                category = entity.category
-                if category not in entities_by_category:
-                    entities_by_category[category] = []
-                entities_by_category[category].append(entity)
+            from analytics import group_indices
+            entities = response[0].entities
+            entities_by_category = group_indices([entity.category for entity in entities])
             
             # Display entities by category
-            for category, entities in entities_by_category.items():
+            for category, positions in entities_by_category.items():
                 print(f"\n📂 {category.upper()}:")
-                for entity in entities:
+                for entity in (entities[position] for position in positions):
                     print(f"   • {entity.text} (confidence: {entity.confidence_score:.2f})")
                     if entity.subcategory:
                         print(f"     └─ Subcategory: {entity.subcategory}")
@@ -72,13 +61,6 @@ def detect_language():
         print("🌍 LANGUAGE DETECTION")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Sample texts in different languages
         sample_texts = [
             "Hello, how are you today?",
@@ -97,7 +79,7 @@ def detect_language():
         print("\n🔍 Detecting languages...")
         
         # Detect languages
-        response = client.detect_language(documents=sample_texts)
+        response = analyze_batched("detect_language", sample_texts)
         
         print("\n🌍 LANGUAGE DETECTION RESULTS:")
         print("-" * 40)
@@ -125,13 +107,6 @@ def recognize_pii_entities():
         print("🔒 PII ENTITY RECOGNITION")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Sample text with PII information
         sample_text = """
         John Smith lives at 123 Main Street, Seattle, WA 98101.
@@ -144,7 +119,7 @@ def recognize_pii_entities():
         print("\n🔍 Recognizing PII entities...")
         
         # Recognize PII entities
-        response = client.recognize_pii_entities(documents=[sample_text])
+        response = analyze_chunked("recognize_pii_entities", [sample_text])
         
         if response and not response[0].is_error:
             print("\n🔒 RECOGNIZED PII ENTITIES:")
@@ -4,9 +4,8 @@ This script demonstrates question answering and text summarization capabilities.
 """
 
 import os
-from config import get_language_credentials
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
+from multi_analysis import analyze_documents
+from summarization import summarize
 
 def summarize_text():
     """Demonstrate text summarization"""
@@ -15,13 +14,6 @@ def summarize_text():
         print("📝 AZURE LANGUAGE SERVICE - TEXT SUMMARIZATION")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Long text for summarization
         long_text = """
         Azure AI Language Service is a cloud-based service that provides Natural Language Processing (NLP) 
@@ -55,28 +47,25 @@ def summarize_text():
         
         print("\n🔍 Generating summary...")
         
-        # Note: Text summarization requires specific API version and might not be available in all regions
-        # This is a demonstration of the concept
+        # The service's extractive summarization is not offered in every region;
+        # summarize() falls back to a local ranker seeded with the key phrases
         try:
-            # Extract key phrases as a form of summarization
-            response = client.extract_key_phrases(documents=[long_text])
+            summary = summarize([long_text], max_sentences=3)[0]
             
-            if response and not response[0].is_error:
-                print("\n📋 KEY CONCEPTS SUMMARY:")
+            if not summary.is_error:
+                print("\n📋 SUMMARY:")
                 print("-" * 30)
-                key_phrases = response[0].key_phrases
-                
-                # Display key phrases as summary points
-                for phrase in key_phrases[:10]:  # Show top 10 key phrases
-                    print(f"   • {phrase}")
+                for sentence in summary.sentences:
+                    print(f"   • {sentence.text} ({sentence.rank_score:.2f})")
                 
-                print(f"\n📊 Extracted {len(key_phrases)} key concepts from the text")
+                if summary.source == "local":
+                    print("\n💡 Service summarization unavailable; ranked sentences locally using key phrases")
+                print(f"\n📊 Kept {len(summary.sentences)} sentences from the text")
             else:
                 print("❌ Error generating summary")
                 
         except Exception as e:
             print(f"⚠️ Summarization not available: {str(e)}")
-            print("💡 Using key phrase extraction as alternative summarization method")
             
         return True
         
@@ -91,13 +80,6 @@ def analyze_custom_text():
         print("🔬 COMPREHENSIVE TEXT ANALYSIS")
         print("=" * 60)
         
-        # Get credentials and create client
-        endpoint, key = get_language_credentials()
-        client = TextAnalyticsClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key)
-        )
-        
         # Custom text for comprehensive analysis
         custom_text = """
         Microsoft Azure continues to lead the cloud computing market with innovative AI services.
@@ -111,33 +93,35 @@ def analyze_custom_text():
         
         print("\n🔍 Performing comprehensive analysis...")
         
+        # Run all features in a single multi-action request
+        analysis = analyze_documents(
+            [custom_text],
+            features=("sentiment", "key_phrases", "entities", "language")
+        )[0]
+        
         # Sentiment Analysis
         print("\n1️⃣ SENTIMENT ANALYSIS:")
-        sentiment_response = client.analyze_sentiment(documents=[custom_text])
-        if sentiment_response and not sentiment_response[0].is_error:
-            doc = sentiment_response[0]
+        if analysis.sentiment:
+            doc = analysis.sentiment
             print(f"   Overall Sentiment: {doc.sentiment.upper()}")
             print(f"   Confidence: {doc.confidence_scores.positive:.2f} (pos), {doc.confidence_scores.negative:.2f} (neg)")
         
         # Key Phrase Extraction
         print("\n2️⃣ KEY PHRASES:")
-        phrases_response = client.extract_key_phrases(documents=[custom_text])
-        if phrases_response and not phrases_response[0].is_error:
-            for phrase in phrases_response[0].key_phrases:
+        if analysis.key_phrases:
+            for phrase in analysis.key_phrases.key_phrases:
                 print(f"   • {phrase}")
         
         # Entity Recognition
         print("\n3️⃣ NAMED ENTITIES:")
-        entities_response = client.recognize_entities(documents=[custom_text])
-        if entities_response and not entities_response[0].is_error:
-            for entity in entities_response[0].entities:
+        if analysis.entities:
+            for entity in analysis.entities.entities:
                 print(f"   • {entity.text} ({entity.category})")
         
         # Language Detection
         print("\n4️⃣ LANGUAGE DETECTION:")
-        language_response = client.detect_language(documents=[custom_text])
-        if language_response and not language_response[0].is_error:
-            lang = language_response[0].primary_language
+        if analysis.language:
+            lang = analysis.language.primary_language
             print(f"   Language: {lang.name} ({lang.iso6391_name})")
             print(f"   Confidence: {lang.confidence_score:.2f}")
         
@@ -0,0 +1,124 @@
+"""
+Streaming analysis for Azure AI Language Service
+Yields per-document results, sentence-level sentiment and mined opinions
+included, as soon as the sub-batch holding them completes instead of after
+the whole input, with bounded buffering for slow consumers.
+"""
+
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from batching import DISPATCH_WINDOW, WindowPlan, operation_sender
+from config import MAX_DOCUMENTS_PER_REQUEST, MAX_REQUEST_CHARACTERS, get_settings
+from dedup import get_dedup_policy
+from gazetteer import get_entity_gazetteer
+from language_routing import get_language_router
+from local_language import get_local_detector
+from payload import get_payload_minimizer
+from result_cache import get_result_cache
+
+# One streamed document: its input position and its Result or DocumentError
+StreamedResult = namedtuple("StreamedResult", ["index", "result"])
+
+def _resolved(plan, start, slots):
+    return [StreamedResult(start + slot, plan.results[slot]) for slot in slots]
+
+def iter_streamed(operation, documents, client=None, concurrency=None,
+                  max_documents=None, max_characters=MAX_REQUEST_CHARACTERS, window=DISPATCH_WINDOW,
+                  cache=None, dedup=None, scheduler=None, local_detector=None, router=None,
+                  gazetteer=None, minimizer=None, **kwargs):
+    """
+    Run a client operation and yield each document's result as soon as it is known.
+
+    Cache hits come out first, then every sub-batch's documents as that
+    request completes, so results arrive in completion order rather than
+    input order. Backpressure is built in: nothing new is planned or sent
+    while the consumer is not pulling, so at most `concurrency` sub-batches
+    of results are ever buffered.
+
+        for item in iter_streamed("analyze_sentiment", feed, max_documents=2,
+                                  show_opinion_mining=True):
+            dashboard.update(item.index, item.result)
+
+    Args:
+        operation (str): TextAnalyticsClient method name, e.g. "analyze_sentiment"
+        documents (iterable): Documents to analyze, read lazily
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        concurrency (int): Maximum number of sub-batches in flight, defaults to config
+        max_documents (int): Documents per sub-batch; smaller means earlier first results
+        max_characters (int): Maximum total characters per request
+        window (int): Documents read and planned together; smaller starts sending
+            sooner when the input itself is slow
+        cache, dedup, scheduler, local_detector, router, gazetteer, minimizer: As for
+            batching.iter_analyzed
+        **kwargs: Passed through to the client operation
+
+    Yields:
+        StreamedResult: (index, result) pairs, each input position exactly once
+
+    Raises:
+        ValueError: If the operation is not supported
+    """
+    if operation not in MAX_DOCUMENTS_PER_REQUEST:
+        raise ValueError(f"Unsupported operation: {operation}")
+    if concurrency is None:
+        concurrency = get_settings()['MAX_CONCURRENT_REQUESTS']
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    if cache is None:
+        cache = get_result_cache()
+    if dedup is None:
+        dedup = get_dedup_policy()
+    if local_detector is None:
+        local_detector = get_local_detector()
+    if router is None:
+        router = get_language_router()
+    if gazetteer is None:
+        gazetteer = get_entity_gazetteer()
+    if minimizer is None:
+        minimizer = get_payload_minimizer()
+    send = operation_sender(operation, client, scheduler)
+    limit = max_documents or MAX_DOCUMENTS_PER_REQUEST[operation]
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    in_flight = {}
+
+    def drain():
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            plan, start, batch = in_flight.pop(future)
+            yield from _resolved(plan, start, plan.complete(batch, future.result()))
+
+    try:
+        indexed = enumerate(documents)
+        while True:
+            batch_window = list(islice(indexed, window))
+            if not batch_window:
+                break
+            start = batch_window[0][0]
+            plan = WindowPlan(operation, batch_window, cache or None, dedup or None, kwargs,
+                              local_detector or None, router or None, gazetteer or None,
+                              minimizer or None)
+            yield from _resolved(plan, start, [slot for slot, result in enumerate(plan.results)
+                                               if result is not None])
+            for batch in plan.batches(limit, max_characters):
+                while len(in_flight) >= concurrency:
+                    yield from drain()
+                future = executor.submit(send, documents=[prepared for _, prepared in batch], **kwargs)
+                in_flight[future] = (plan, start, batch)
+        while in_flight:
+            yield from drain()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def stream_sentiment(documents, show_opinion_mining=True, **kwargs):
+    """
+    Stream sentiment results with sentence-level scores and mined opinions.
+
+    Yields:
+        StreamedResult: (index, AnalyzeSentimentResult or DocumentError) pairs
+    """
+    return iter_streamed("analyze_sentiment", documents,
+                         show_opinion_mining=show_opinion_mining, **kwargs)
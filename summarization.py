@@ -0,0 +1,197 @@
+"""
+Extractive summarization for Azure AI Language Service
+Uses the service's extractive summarization job where it is available and a
+local vectorized TF-IDF sentence ranker, seeded with the service's key
+phrases, where it is not. Both return ExtractiveSummaryResult objects.
+"""
+
+import re
+
+import numpy as np
+
+from batching import document_id, document_text, iter_batches, operation_sender, prepare_document
+from chunking import analyze_chunked, sentence_spans
+from config import MAX_DOCUMENTS_PER_ACTIONS_JOB, MAX_REQUEST_CHARACTERS, get_settings
+from local_language import LATIN_STOPWORDS
+from multi_analysis import ACTIONS_UNSUPPORTED_STATUS_CODES
+
+MODES = ("auto", "service", "local")
+
+# Terms from the document's key phrases weigh this much more in sentence scores
+KEY_PHRASE_BOOST = 1.0
+
+# Sentences with fewer content words are scored proportionally lower
+MIN_SENTENCE_WORDS = 6
+
+STOPWORDS = sorted({word for words in LATIN_STOPWORDS.values() for word in words})
+
+_word = re.compile(r"\w+")
+
+def _tokens(text):
+    """Lowercased words and their character offsets as NumPy arrays."""
+    matches = list(_word.finditer(text.lower()))
+    return (np.array([match.group() for match in matches], dtype=str),
+            np.fromiter((match.start() for match in matches), dtype=np.int64, count=len(matches)))
+
+def rank_sentences(text, key_phrases=()):
+    """
+    Score every sentence of a document by TF-IDF similarity to the whole document.
+
+    Each sentence is a sublinear TF-IDF vector over its content words, with
+    IDF taken across the document's sentences; its score is the cosine with
+    the document centroid, with key-phrase terms boosted. Everything is a
+    handful of bincounts over the token stream, so the cost grows with the
+    number of words (plus one sort of the vocabulary), not with the square
+    of the number of sentences.
+
+    Args:
+        text (str): Document text
+        key_phrases (iterable): Phrases whose words should weigh more
+
+    Returns:
+        list: (offset, length, score) per non-empty sentence, in text order,
+        with scores scaled so the best sentence has 1.0
+    """
+    spans = []
+    for start, end in sentence_spans(text):
+        sentence = text[start:end]
+        stripped = sentence.strip()
+        if stripped:
+            offset = start + sentence.index(stripped)
+            spans.append((offset, len(stripped)))
+    if not spans:
+        return []
+
+    words, positions = _tokens(text)
+    starts = np.array([offset for offset, _ in spans], dtype=np.int64)
+    sentence_of = np.searchsorted(starts, positions, side="right") - 1
+    keep = (sentence_of >= 0) & ~np.isin(words, STOPWORDS)
+    words, sentence_of = words[keep], sentence_of[keep]
+    count = len(spans)
+    if not len(words):
+        return [(offset, length, 0.0) for offset, length in spans]
+
+    vocabulary, terms = np.unique(words, return_inverse=True)
+    size = len(vocabulary)
+    pairs, frequencies = np.unique(sentence_of * size + terms, return_counts=True)
+    sentences, terms = pairs // size, pairs % size
+
+    document_frequency = np.bincount(terms, minlength=size)
+    idf = np.log((count + 1) / (document_frequency + 1)) + 1
+    weights = (1 + np.log(frequencies)) * idf[terms]
+    phrase_words = [word for phrase in key_phrases for word in _word.findall(phrase.lower())]
+    if phrase_words:
+        weights = weights * np.where(np.isin(vocabulary, phrase_words)[terms], 1 + KEY_PHRASE_BOOST, 1.0)
+
+    centroid = np.bincount(terms, weights=weights, minlength=size)
+    dots = np.bincount(sentences, weights=weights * centroid[terms], minlength=count)
+    norms = np.sqrt(np.bincount(sentences, weights=weights ** 2, minlength=count))
+    scores = np.divide(dots, norms * np.linalg.norm(centroid), out=np.zeros(count), where=norms > 0)
+    scores *= np.minimum(1.0, np.bincount(sentences, minlength=count) / MIN_SENTENCE_WORDS)
+    if scores.max() > 0:
+        scores /= scores.max()
+    return [(offset, length, float(score)) for (offset, length), score in zip(spans, scores)]
+
+def summarize_local(document_id, text, max_sentences=3, key_phrases=(), order_by="Offset"):
+    """
+    Build an ExtractiveSummaryResult with the local ranker.
+
+    Args:
+        document_id (str): Id for the result
+        text (str): Document text
+        max_sentences (int): Sentences to keep
+        key_phrases (iterable): Phrases that seed the ranking
+        order_by (str): "Offset" (text order) or "Rank" (best first)
+    """
+    from azure.ai.textanalytics import ExtractiveSummaryResult, SummarySentence
+
+    ranked = sorted(rank_sentences(text, key_phrases), key=lambda sentence: -sentence[2])[:max_sentences]
+    if order_by == "Offset":
+        ranked.sort()
+    return ExtractiveSummaryResult(
+        id=document_id,
+        sentences=[
+            SummarySentence(text=text[offset:offset + length], rank_score=round(score, 2),
+                            offset=offset, length=length)
+            for offset, length, score in ranked
+        ],
+        warnings=[]
+    )
+
+def _summarize_service(prepared, max_sentences, order_by, client, polling_interval):
+    """Run extractive summarization jobs; returns one result or DocumentError per document."""
+    submit = operation_sender("begin_extract_summary", client)
+    results = [None] * len(prepared)
+    for batch in iter_batches(prepared, MAX_DOCUMENTS_PER_ACTIONS_JOB, MAX_REQUEST_CHARACTERS):
+        poller = submit([document for _, document in batch], max_sentence_count=max_sentences,
+                        order_by=order_by, polling_interval=polling_interval)
+        for (index, _), result in zip(batch, poller.result()):
+            results[index] = result
+    return results
+
+def summarize(documents, max_sentences=3, mode=None, key_phrases=None, order_by="Offset",
+              client=None, polling_interval=1):
+    """
+    Extractive summaries for any number of documents.
+
+    In "auto" mode the service's summarization job is tried first; if the
+    resource or region does not offer it, or a document is rejected (for
+    example for length), the local ranker fills in. "service" never falls
+    back and "local" never submits a summarization job. Any other service
+    error is raised in every mode.
+
+    Args:
+        documents (iterable): Documents to summarize
+        max_sentences (int): Sentences per summary
+        mode (str): "auto", "service" or "local", defaults to config
+        key_phrases (list): Phrase lists per document to seed the local ranker;
+            None fetches them from the service unless mode is "local", False
+            ranks without them
+        order_by (str): "Offset" (text order) or "Rank" (best first)
+        client: TextAnalyticsClient or ShardedDispatcher, defaults to the configured resources
+        polling_interval (int): Seconds between job status polls
+
+    Returns:
+        list: ExtractiveSummaryResult (or DocumentError in "service" mode) per
+        document, in input order; each has source set to "service" or "local"
+
+    Raises:
+        ValueError: If the mode is not supported
+        HttpResponseError: If the service fails for a reason other than the
+            feature being unavailable
+    """
+    mode = mode or get_settings()['SUMMARIZATION_MODE']
+    if mode not in MODES:
+        raise ValueError(f"Unsupported summarization mode: {mode}")
+    documents = list(documents)
+    prepared = [prepare_document(index, document) for index, document in enumerate(documents)]
+
+    results = [None] * len(documents)
+    if mode != "local":
+        from azure.core.exceptions import HttpResponseError
+        try:
+            results = _summarize_service(prepared, max_sentences, order_by, client, polling_interval)
+        except HttpResponseError as error:
+            # Authentication, throttling and server errors would hit the local
+            # ranker's key phrase calls too, so only a missing feature falls back
+            if mode == "service" or error.status_code not in ACTIONS_UNSUPPORTED_STATUS_CODES:
+                raise
+        for result in results:
+            if result is not None:
+                result.source = "service"
+        if mode == "service":
+            return results
+
+    missing = [index for index, result in enumerate(results) if result is None or result.is_error]
+    if not missing:
+        return results
+    if key_phrases is None and mode == "auto":
+        phrases = analyze_chunked("extract_key_phrases", [documents[index] for index in missing], client=client)
+        key_phrases = {index: [] if result.is_error else result.key_phrases
+                       for index, result in zip(missing, phrases)}
+    for index in missing:
+        seeds = key_phrases[index] if key_phrases else ()
+        results[index] = summarize_local(document_id(prepared[index]), document_text(documents[index]),
+                                         max_sentences, seeds, order_by)
+        results[index].source = "local"
+    return results
@@ -0,0 +1,59 @@
+"""
+Tests for long-document chunking against the mock Language server
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("AZURE_LANGUAGE_ENDPOINT", "http://127.0.0.1")
+os.environ.setdefault("AZURE_LANGUAGE_KEY", "test-key")
+
+from benchmarks.mock_server import MockLanguageServer
+from chunking import analyze_chunked, split_document
+from config import get_text_analytics_client
+from dedup import DedupPolicy
+from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+
+class CountingClient:
+    """Forwards recognize_entities and records the size of every request."""
+
+    def __init__(self, client):
+        self.client = client
+        self.sizes = []
+
+    def recognize_entities(self, documents, **kwargs):
+        self.sizes.append(len(documents))
+        return self.client.recognize_entities(documents, **kwargs)
+
+def run(documents, **kwargs):
+    with MockLanguageServer() as server:
+        client = CountingClient(get_text_analytics_client(server.endpoint, "test-key"))
+        results = analyze_chunked("recognize_entities", documents, client=client,
+                                  scheduler=RequestScheduler(AdaptiveRateLimiter(rate=0)),
+                                  cache=False, dedup=DedupPolicy("exact"), local_detector=False,
+                                  router=False, gazetteer=False, minimizer=False, **kwargs)
+    return results, client.sizes
+
+def test_repeated_documents_are_sent_once():
+    texts = ["Satya Nadella visited Seattle.", "Jane Doe works for Contoso in Redmond."]
+    documents = [texts[index % 2] for index in range(20)]
+
+    results, sizes = run(documents)
+
+    assert sizes == [2]
+    assert [result.id for result in results] == [str(index) for index in range(20)]
+    assert all(not result.is_error and result.entities for result in results)
+
+def test_repeated_chunks_are_sent_once():
+    text = "Satya Nadella met Jane Doe in Seattle. " * 120
+    chunks = split_document(text, 1000, 0)
+
+    results, sizes = run([text, text], max_characters=1000, overlap=0)
+
+    # Both documents, and the identical chunks inside each, share one request slot
+    assert len(chunks) > len({chunk for _, chunk in chunks}) > 1
+    assert sum(sizes) == len({chunk for _, chunk in chunks})
+    assert results[0].entities == results[1].entities
+    for entity in results[0].entities:
+        assert text[entity.offset:entity.offset + entity.length] == entity.text
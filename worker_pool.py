@@ -0,0 +1,134 @@
+"""
+Multiprocess worker pool for Azure AI Language Service
+Shards a corpus across worker processes so CPU-side work (normalization,
+chunking, redaction, result serialization) is not limited to one core. Each
+worker owns its own pooled client and results come back in input order.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from config import get_settings
+
+# Documents per task handed to a worker
+DEFAULT_SHARD_SIZE = 250
+
+# Per-process state set up by _initialize_worker: keyword arguments for every task
+_worker_kwargs = {}
+
+def _initialize_worker(endpoint, key, rate):
+    """Create this worker's own client and rate limiter."""
+    from config import get_text_analytics_client
+    from rate_limiter import AdaptiveRateLimiter, RequestScheduler
+    from sharding import get_dispatcher
+
+    if endpoint:
+        client = get_text_analytics_client(endpoint, key)
+    else:
+        client = get_dispatcher() or get_text_analytics_client()
+    _worker_kwargs["client"] = client
+    _worker_kwargs["scheduler"] = RequestScheduler(AdaptiveRateLimiter(rate=rate), label=f"worker-{os.getpid()}")
+
+def _run_task(function, shard):
+    return function(shard, **_worker_kwargs)
+
+def iter_shards(items, shard_size=DEFAULT_SHARD_SIZE):
+    """Split any iterable into lists of at most shard_size items."""
+    items = iter(items)
+    while True:
+        shard = list(islice(items, shard_size))
+        if not shard:
+            return
+        yield shard
+
+class WorkerPool:
+    """
+    Process pool whose workers each hold a pooled client and scheduler.
+
+    Task functions must be picklable (module-level functions or partials of
+    them) and are called as function(shard, client=..., scheduler=...), which
+    matches analyze_batched and friends:
+
+        with WorkerPool(workers=8) as pool:
+            for results in pool.imap(partial(analyze_batched, "analyze_sentiment"), shards):
+                ...
+
+    Workers use the "spawn" start method by default, so no client, lock or
+    connection is inherited from the parent; with the lazy config import
+    a worker starts in well under a second. The tier's RATE_LIMIT_TPS is
+    split evenly between the workers.
+
+    Args:
+        workers (int): Worker processes, defaults to config (one per CPU)
+        prefetch (int): Shards queued per worker beyond the one it is working on
+        endpoint (str): Service endpoint, defaults to the configured resources
+        key (str): Service key for endpoint
+        start_method (str): multiprocessing start method
+    """
+
+    def __init__(self, workers=None, prefetch=None, endpoint=None, key=None, start_method="spawn"):
+        settings = get_settings()
+        self.workers = workers or settings['WORKER_PROCESSES'] or os.cpu_count() or 1
+        self.prefetch = settings['WORKER_PREFETCH'] if prefetch is None else prefetch
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_initialize_worker,
+            initargs=(endpoint, key, settings['RATE_LIMIT_TPS'] / self.workers)
+        )
+
+    def imap(self, function, shards):
+        """
+        Run function over every shard in the pool.
+
+        At most workers * (1 + prefetch) shards are in flight, so a slow
+        consumer or an unbounded input never piles up results in memory.
+
+        Yields:
+            The function's return value for each shard, in input order
+
+        Raises:
+            The first exception raised by a task, once its shard is reached
+        """
+        pending = deque()
+        limit = self.workers * (1 + self.prefetch)
+        try:
+            for shard in shards:
+                pending.append(self._executor.submit(_run_task, function, shard))
+                if len(pending) >= limit:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def iter_parallel(function, items, shard_size=DEFAULT_SHARD_SIZE, workers=None, prefetch=None,
+                  endpoint=None, key=None):
+    """
+    Run a list-to-list function over items in a temporary worker pool.
+
+    Args:
+        function (callable): Picklable function(shard, client=..., scheduler=...)
+            returning one output per input item
+        items (iterable): Inputs, e.g. documents or corpus records
+        shard_size (int): Items per task
+
+    Yields:
+        Outputs, one per item, in input order
+    """
+    with WorkerPool(workers, prefetch, endpoint, key) as pool:
+        for outputs in pool.imap(function, iter_shards(items, shard_size)):
+            yield from outputs